@@ -10,6 +10,7 @@ from __future__ import annotations
 import argparse
 import datetime as dt
 import io
+import json
 import os
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Tuple
@@ -64,6 +65,13 @@ MODEL_CHOICES = [
 ]
 RUN_DIR = BASE_DIR / "training_runs"
 RUN_DIR.mkdir(parents=True, exist_ok=True)
+# Binary columnar formats written by the data handler's columnarStore module, besides CSV.
+COLUMNAR_EXTENSIONS = (".feather", ".parquet", ".npz")
+DATASET_FILETYPES = [
+    ("Dataset files", "*.csv *.feather *.parquet *.npz"),
+    ("CSV files", "*.csv"),
+    ("All files", "*.*"),
+]
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -74,7 +82,7 @@ def build_arg_parser() -> argparse.ArgumentParser:
         "--data",
         type=Path,
         required=True,
-        help="Path to the input CSV dataset.",
+        help="Path to the input dataset (CSV, Feather, Parquet or .npz).",
     )
     parser.add_argument(
         "--target",
@@ -102,10 +110,50 @@ def build_arg_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def _read_npz_table(data_path: Path) -> pd.DataFrame:
+    """Read the .npz table format (one array per column plus a JSON schema)."""
+    with np.load(data_path, allow_pickle=False) as npz:
+        schema = json.loads(str(npz["__schema__"]))
+        data = {}
+        for entry in schema["columns"]:
+            values = npz[entry["key"]]
+            if "missing" in entry:
+                values = pd.Series(values.astype(object))
+                values[npz[entry["missing"]]] = np.nan
+            data[entry["name"]] = values
+    return pd.DataFrame(data)
+
+
+def read_table(data_path: Path) -> pd.DataFrame:
+    """Read a CSV, Feather, Parquet or .npz table, detecting the format from the extension.
+
+    Feather and Parquet files are memory-mapped through pyarrow, which must be installed.
+    """
+    suffix = Path(data_path).suffix.lower()
+    if suffix in (".feather", ".parquet"):
+        try:
+            import pyarrow.feather as feather
+            import pyarrow.parquet as parquet
+        except ImportError as exc:
+            raise RuntimeError(f"pyarrow is required to read {suffix} files. Install it via pip.") from exc
+        reader = feather.read_table if suffix == ".feather" else parquet.read_table
+        return reader(data_path, memory_map=True).to_pandas()
+    if suffix == ".npz":
+        return _read_npz_table(Path(data_path))
+    return pd.read_csv(data_path)
+
+
+def read_columns(data_path: Path) -> List[str]:
+    """Return the column names of a dataset without loading CSV rows."""
+    if Path(data_path).suffix.lower() in COLUMNAR_EXTENSIONS:
+        return read_table(data_path).columns.tolist()
+    return pd.read_csv(data_path, nrows=0).columns.tolist()
+
+
 def load_dataset(csv_path: Path, target_col: str) -> Tuple[pd.DataFrame, pd.Series]:
-    df = pd.read_csv(csv_path)
+    df = read_table(csv_path)
     if target_col not in df.columns:
-        raise ValueError(f"Target column '{target_col}' not found in {csv_path.name}.")
+        raise ValueError(f"Target column '{target_col}' not found in {Path(csv_path).name}.")
     if df[target_col].isna().any():
         raise ValueError("Target column contains missing values. Clean the data first.")
     features = df.drop(columns=[target_col])
@@ -10,9 +10,16 @@ import tkinter as tk
 from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
 
-import pandas as pd
-
-from ml_trainer import MODEL_CHOICES, RUN_DIR, generate_pdf_report, load_dataset, save_model, train_and_evaluate
+from ml_trainer import (
+    DATASET_FILETYPES,
+    MODEL_CHOICES,
+    RUN_DIR,
+    generate_pdf_report,
+    load_dataset,
+    read_columns,
+    save_model,
+    train_and_evaluate,
+)
 
 
 class TrainerGUI:
@@ -116,7 +123,7 @@ class TrainerGUI:
     def _select_dataset(self) -> None:
         filepath = filedialog.askopenfilename(
             title="Select dataset CSV",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            filetypes=DATASET_FILETYPES,
         )
         if filepath:
             self.data_path_var.set(filepath)
@@ -128,11 +135,10 @@ class TrainerGUI:
             messagebox.showwarning("Select dataset", "Please choose a dataset CSV first.")
             return
         try:
-            header_df = pd.read_csv(dataset, nrows=0)
+            columns = read_columns(dataset)
         except Exception as exc:
-            messagebox.showerror("Error reading CSV", str(exc))
+            messagebox.showerror("Error reading dataset", str(exc))
             return
-        columns = header_df.columns.tolist()
         if not columns:
             messagebox.showerror("Missing columns", "No columns detected in the CSV file.")
             return
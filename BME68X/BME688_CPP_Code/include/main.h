@@ -29,10 +29,18 @@
 #define CMD_MS_PREFIX "MS_"
 #define CMD_GETHEAT "GETHEAT"
 #define CMD_GETDUTY "GETDUTY"
+#define CMD_FORMAT_BINARY "FORMAT_BINARY"
+#define CMD_FORMAT_CSV "FORMAT_CSV"
 #define MAX_HEATER_PROFILE_LENGTH 10
 #define NUM_DUTY_CYCLE_PROFILES 1
 #define MEAS_DUR 140  // Measurement duration in milliseconds
 
+// Binary sample frames (sent instead of CSV lines after FORMAT_BINARY)
+#define FRAME_SYNC_0 0xA5
+#define FRAME_SYNC_1 0x5A
+#define FRAME_VERSION 1
+#define FRAME_SIZE 126
+
 // SD Card Definitions
 #define SD_PIN_CS 33               // Chip Select pin for SD card
 #define CONFIG_FILE_NAME "/config.json"
@@ -69,6 +77,31 @@ struct SensorConfig {
   String dutyCycleProfile;    // Must match one of the DutyCycleProfile IDs.
 };
 
+// Readings of one sensor in a binary sample frame (little-endian, packed).
+struct __attribute__((packed)) SensorFrameData {
+  int16_t temperature;            // 0.01 deg C
+  uint16_t humidity;              // 0.01 %
+  uint32_t pressure;              // 0.01 Pa
+  float gasResistance;            // Ohm
+  uint8_t resHeat;                // Heater resistance (the CSV "Status" field)
+  uint8_t gasIndex;               // Heater profile step
+};
+
+// One sample in binary form: the fields of a CSV data line in 126 bytes instead of ~400.
+// The CRC (CRC-16/CCITT-FALSE) covers all bytes after the sync word up to the CRC itself.
+struct __attribute__((packed)) SampleFrame {
+  uint8_t sync[2];                // FRAME_SYNC_0, FRAME_SYNC_1
+  uint8_t length;                 // FRAME_SIZE
+  uint8_t version;                // FRAME_VERSION
+  uint8_t validMask;              // Bit i set if sensor i has data (CSV "N/A" otherwise)
+  uint8_t heaterProfileId;
+  int16_t labelTag;
+  uint32_t timestampMs;
+  SensorFrameData sensors[NUM_SENSORS];
+  uint16_t crc;
+};
+static_assert(sizeof(SampleFrame) == FRAME_SIZE, "SampleFrame must be FRAME_SIZE bytes");
+
 // =========================
 // External Variable Declarations
 // =========================
@@ -101,6 +134,7 @@ extern bool dataCollectionStarted;
 extern unsigned long lastDataSendTime;
 extern bool firstDataSent;
 extern unsigned long dataInterval;
+extern bool binaryOutput;
 
 // =========================
 // Function Prototypes
@@ -123,6 +157,7 @@ void assignDynamicSensorConfigs();
 void assignHardcodedSensorConfigs();
 void sendSensorStatusReport();
 void getDutyCycleProfiles();
+uint16_t crc16Ccitt(const uint8_t *data, size_t length);
 
 #endif // MAIN_H
 
@@ -44,6 +44,7 @@ bool dataCollectionStarted = false;
 unsigned long lastDataSendTime = 0;
 bool firstDataSent = false;
 unsigned long dataInterval = 3000; // Default data interval (ms)
+bool binaryOutput = false; // Send binary sample frames instead of CSV lines
 
 // Hardcoded mapping fallback for heater profiles (if dynamic config unavailable)
 static const uint8_t hardcodedHeaterMapping[NUM_SENSORS] = {0, 0, 1, 1, 2, 2, 3, 3};
@@ -620,9 +621,17 @@ void handleSerialCommands() {
     else if (command.equalsIgnoreCase("STATUS_REPORT")) {
       sendSensorStatusReport();
     }
+    else if (command.equalsIgnoreCase(CMD_FORMAT_BINARY)) {
+      binaryOutput = true;
+      Serial.println("Output format set to binary frames (" + String(FRAME_SIZE) + " bytes).");
+    }
+    else if (command.equalsIgnoreCase(CMD_FORMAT_CSV)) {
+      binaryOutput = false;
+      Serial.println("Output format set to CSV.");
+    }
     else {
       Serial.println("WARNING: Unknown command received - " + command);
-      Serial.println("Available commands: START, STOP, MS_num (e.g., MS_5000), GETHEAT, GETDUTY, START_CONFIG_UPLOAD, STATUS_REPORT");
+      Serial.println("Available commands: START, STOP, MS_num (e.g., MS_5000), GETHEAT, GETDUTY, START_CONFIG_UPLOAD, STATUS_REPORT, FORMAT_BINARY, FORMAT_CSV");
     }
   }
 }
@@ -670,42 +679,86 @@ void handleButtonPresses() {
   prevBothPressed = bothPressedNow;
 }
 
-// Collects sensor data and outputs it in CSV format.
+// Computes the CRC-16/CCITT-FALSE (polynomial 0x1021, initial value 0xFFFF) of a buffer.
+uint16_t crc16Ccitt(const uint8_t *data, size_t length) {
+  uint16_t crc = 0xFFFF;
+  for (size_t i = 0; i < length; i++) {
+    crc ^= (uint16_t)data[i] << 8;
+    for (uint8_t bit = 0; bit < 8; bit++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+// Scales a reading to an integer field of a binary frame, clamped to the field's range.
+static long scaleReading(float value, float scale, long minimum, long maximum) {
+  return constrain(lroundf(value * scale), minimum, maximum);
+}
+
+// Collects sensor data and outputs it in CSV format, or as a binary frame after FORMAT_BINARY.
 void collectAndOutputData() {
   updateDutyCycleStates();
   
   uint8_t nFieldsLeft = 0;
   bool newLogdata = false;
   String line = "";
+  SampleFrame frame = {};
   
   if ((millis() - lastLogged) >= MEAS_DUR) {
     lastLogged = millis();
-    // CSV header: TimeStamp(ms), Label_Tag, HeaterProfile_ID
-    line += String(lastLogged) + "," + String(buttonOneValue) + "," + String(currentHeaterProfileIndex);
+    if (binaryOutput) {
+      frame.sync[0] = FRAME_SYNC_0;
+      frame.sync[1] = FRAME_SYNC_1;
+      frame.length = FRAME_SIZE;
+      frame.version = FRAME_VERSION;
+      frame.heaterProfileId = currentHeaterProfileIndex;
+      frame.labelTag = (int16_t)constrain(buttonOneValue, INT16_MIN, INT16_MAX);
+      frame.timestampMs = lastLogged;
+    } else {
+      // CSV header: TimeStamp(ms), Label_Tag, HeaterProfile_ID
+      line += String(lastLogged) + "," + String(buttonOneValue) + "," + String(currentHeaterProfileIndex);
+    }
     
     for (uint8_t i = 0; i < NUM_SENSORS; i++) {
       if (dutyCycleStates[i].isScanning) {
         if (sensors[i].fetchData()) {
           nFieldsLeft = sensors[i].getData(sensorData[i]);
           if (sensorData[i].status & BME68X_NEW_DATA_MSK) {
-            line += "," + String(sensorData[i].temperature, 2);
-            line += "," + String(sensorData[i].pressure, 2);
-            line += "," + String(sensorData[i].humidity, 2);
-            line += "," + String(sensorData[i].gas_resistance, 2);
-            line += "," + String(sensorData[i].res_heat, 2);
-            line += "," + String(sensorData[i].gas_index);
+            if (binaryOutput) {
+              SensorFrameData &out = frame.sensors[i];
+              out.temperature = scaleReading(sensorData[i].temperature, 100.0f, INT16_MIN, INT16_MAX);
+              out.humidity = scaleReading(sensorData[i].humidity, 100.0f, 0, UINT16_MAX);
+              out.pressure = (uint32_t)constrain(lround(sensorData[i].pressure * 100.0), 0L, (long)INT32_MAX);
+              out.gasResistance = sensorData[i].gas_resistance;
+              out.resHeat = sensorData[i].res_heat;
+              out.gasIndex = sensorData[i].gas_index;
+              frame.validMask |= (1 << i);
+            } else {
+              line += "," + String(sensorData[i].temperature, 2);
+              line += "," + String(sensorData[i].pressure, 2);
+              line += "," + String(sensorData[i].humidity, 2);
+              line += "," + String(sensorData[i].gas_resistance, 2);
+              line += "," + String(sensorData[i].res_heat, 2);
+              line += "," + String(sensorData[i].gas_index);
+            }
             newLogdata = true;
           }
         }
         sensors[i].setOpMode(BME68X_SEQUENTIAL_MODE);
-      } else {
+      } else if (!binaryOutput) {
         line += ",N/A,N/A,N/A,N/A,N/A,N/A";
       }
     }
     
-    line += "\r\n";
     if (newLogdata) {
-      Serial.print(line);
+      if (binaryOutput) {
+        frame.crc = crc16Ccitt(((const uint8_t *)&frame) + 2, FRAME_SIZE - 4);
+        Serial.write((const uint8_t *)&frame, sizeof(frame));
+      } else {
+        line += "\r\n";
+        Serial.print(line);
+      }
     }
   }
 }
@@ -0,0 +1,196 @@
+# Import necessary libraries for binary columnar storage of sensor tables
+import json
+import os
+import struct
+import sys
+import zipfile
+import numpy as np
+import pandas as pd
+
+# pyarrow is optional: it provides the Feather and Parquet formats. Without it, tables are
+# stored in the NumPy .npz fallback format.
+try:
+    import pyarrow.feather as feather
+    import pyarrow.parquet as parquet
+except ImportError:
+    feather = None
+    parquet = None
+
+# File extensions of the supported binary columnar formats.
+FEATHER_EXTENSION = ".feather"
+PARQUET_EXTENSION = ".parquet"
+NPZ_EXTENSION = ".npz"
+COLUMNAR_EXTENSIONS = (FEATHER_EXTENSION, PARQUET_EXTENSION, NPZ_EXTENSION)
+
+# Name of the member holding the column schema in the .npz fallback format.
+NPZ_SCHEMA_KEY = "__schema__"
+NPZ_SCHEMA_VERSION = 1
+
+# File dialog entries for the table formats, CSV first.
+TABLE_FILETYPES = (
+    ("CSV Files", "*.csv"),
+    ("Feather Files", "*" + FEATHER_EXTENSION),
+    ("Parquet Files", "*" + PARQUET_EXTENSION),
+    ("NumPy Archives", "*" + NPZ_EXTENSION),
+    ("All Files", "*.*"),
+)
+
+def is_columnar_file(path):
+    """
+    Returns True if the path has the extension of one of the binary columnar formats.
+    """
+    return os.path.splitext(str(path))[1].lower() in COLUMNAR_EXTENSIONS
+
+def default_columnar_extension():
+    """
+    Returns the preferred binary format: Feather when pyarrow is installed, else .npz.
+    """
+    return FEATHER_EXTENSION if feather is not None else NPZ_EXTENSION
+
+def require_pyarrow(path):
+    """
+    Raises an ImportError naming the file if pyarrow is needed for it but not installed.
+    """
+    if feather is None:
+        raise ImportError(f"pyarrow is required for {os.path.basename(str(path))}; install it or use the {NPZ_EXTENSION} format.")
+
+def write_table(df, path):
+    """
+    Writes a DataFrame in the format given by the file extension: Feather, Parquet or .npz for
+    the binary columnar formats, CSV otherwise. The file is written under a temporary name and
+    then renamed, so a DataFrame memory-mapped from the same path stays valid while it is
+    written back.
+
+    Parameters:
+      df: The DataFrame to write. Its index is not stored.
+      path: Destination file path.
+    """
+    extension = os.path.splitext(str(path))[1].lower()
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        if extension == FEATHER_EXTENSION:
+            require_pyarrow(path)
+            df.reset_index(drop=True).to_feather(temp_path)
+        elif extension == PARQUET_EXTENSION:
+            require_pyarrow(path)
+            df.to_parquet(temp_path, index=False)
+        elif extension == NPZ_EXTENSION:
+            write_npz(df, temp_path)
+        else:
+            df.to_csv(temp_path, index=False)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def read_table(path, memory_map=True):
+    """
+    Reads a table written by write_table, detecting the format from the file extension.
+    Files with any other extension are read as CSV.
+
+    Parameters:
+      path: Path of the file to read.
+      memory_map: Whether the binary formats are memory-mapped instead of read into memory.
+
+    Returns:
+      A DataFrame.
+    """
+    extension = os.path.splitext(str(path))[1].lower()
+    if extension == FEATHER_EXTENSION:
+        require_pyarrow(path)
+        return feather.read_table(path, memory_map=memory_map).to_pandas()
+    if extension == PARQUET_EXTENSION:
+        require_pyarrow(path)
+        return parquet.read_table(path, memory_map=memory_map).to_pandas()
+    if extension == NPZ_EXTENSION:
+        return read_npz(path, memory_map=memory_map)
+    return pd.read_csv(path)
+
+def write_npz(df, path):
+    """
+    Writes a DataFrame to an uncompressed .npz archive with one array per column and a JSON
+    schema holding the column names and dtypes. Numeric, boolean and datetime columns keep
+    their dtype; other columns are stored as strings with a mask of missing values.
+    """
+    arrays = {}
+    columns = []
+    for index, name in enumerate(df.columns):
+        column = df[name]
+        key = f"c{index}"
+        entry = {"name": str(name), "key": key, "dtype": str(column.dtype)}
+        if isinstance(column.dtype, np.dtype) and column.dtype.kind in "biufcmM":
+            arrays[key] = column.to_numpy()
+        else:
+            missing = column.isna().to_numpy()
+            arrays[key] = np.where(missing, "", column.astype(str).to_numpy()).astype(str)
+            arrays[key + "_missing"] = missing
+            entry["missing"] = key + "_missing"
+        columns.append(entry)
+    schema = {"version": NPZ_SCHEMA_VERSION, "columns": columns}
+    arrays[NPZ_SCHEMA_KEY] = np.array(json.dumps(schema))
+    # np.savez appends ".npz" to paths without it, so write through an open file.
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+
+def npz_member_memmap(path, archive, key):
+    """
+    Memory-maps one array of an uncompressed .npz archive directly from the file, returning
+    None if the member is compressed or holds Python objects.
+    """
+    info = archive.getinfo(key + ".npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(path, 'rb') as f:
+        # The member data follows its 30-byte local header, file name and extra field.
+        f.seek(info.header_offset + 26)
+        name_length, extra_length = struct.unpack("<HH", f.read(4))
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    if dtype.hasobject:
+        return None
+    if 0 in shape:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape, order='F' if fortran_order else 'C')
+
+def read_npz(path, memory_map=True):
+    """
+    Reads a DataFrame written by write_npz. With memory_map, numeric columns are backed by
+    memory maps of the file, so only the pages that are accessed are read from disk.
+    """
+    with np.load(path, allow_pickle=False) as npz, zipfile.ZipFile(path) as archive:
+        schema = json.loads(str(npz[NPZ_SCHEMA_KEY]))
+
+        def load(key):
+            array = npz_member_memmap(path, archive, key) if memory_map else None
+            return array if array is not None else npz[key]
+
+        data = {}
+        for entry in schema["columns"]:
+            values = load(entry["key"])
+            if "missing" in entry:
+                values = pd.Series(values.astype(object))
+                values[npz[entry["missing"]]] = np.nan
+                try:
+                    values = values.astype(entry["dtype"])
+                except (TypeError, ValueError):
+                    pass
+            data[entry["name"]] = values
+    return pd.DataFrame(data, copy=False)
+
+def convert_file(source, destination):
+    """
+    Converts a table between formats, e.g. a raw CSV log to Feather.
+    """
+    write_table(read_table(source, memory_map=False), destination)
+    print(f"Converted {source} to {destination}")
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(f"Usage: python {os.path.basename(__file__)} <source> <destination>")
+        sys.exit(1)
+    convert_file(sys.argv[1], sys.argv[2])
@@ -2,6 +2,7 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk, simpledialog
 import os
+import sys
 import pandas as pd
 import json
 from joblib import dump, load
@@ -12,20 +13,38 @@ import serial
 import serial.tools.list_ports
 import threading
 import time
-import csv
-from io import StringIO
+from queue import Queue, Empty
 import numpy as np
-from statistics import mode
 from sklearn.utils.class_weight import compute_class_weight
 
-# Import custom data processing class
+# Import custom data processing class and the on-disk cache of extracted features
 from dataProcessor import DataProcessor
+from featureCache import FeatureCache, FEATURE_CACHE_MAX_BYTES
+# Table readers/writers that detect the binary columnar formats (Feather, Parquet, .npz)
+from columnarStore import read_table, write_table, TABLE_FILETYPES
+# Real-time prediction path (per-sample window features, classification and vote)
+from livePredictor import LivePredictor
+# Shared device I/O modules live in the parent BME688_Data_Handler directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from serialReader import SerialLineReader
+from pipelineMetrics import PipelineMetrics, format_snapshot, write_metrics
 
 # Define constants for metrics file and data processing window parameters
 METRICS_FILE = "model_metrics.json"
 WINDOW_SIZE = 10
 STRIDE = 1
 MAX_WINDOW = 10
+# Shortest sampling interval (in seconds) the real-time window buffer is sized for.
+RT_MIN_SAMPLE_INTERVAL = 0.01
+# Milliseconds between the drains of the real-time display queue on the Tk thread.
+RT_QUEUE_INTERVAL_MS = 100
+# Milliseconds between refreshes of the real-time pipeline statistics panel.
+RT_STATS_REFRESH_MS = 1000
+# Seconds between the snapshots of the pipeline statistics appended to RT_METRICS_FILE.
+RT_METRICS_WRITE_INTERVAL = 10
+# File (next to this script) that receives the pipeline statistics of real-time predictions;
+# CSV rows per stage, or JSON Lines for other extensions.
+RT_METRICS_FILE = "rt_pipeline_metrics.csv"
 
 class ModelTrainerGUI:
     """
@@ -38,7 +57,7 @@ class ModelTrainerGUI:
         """
         self.master = master
         self.master.title("Data Classification GUI")
-        self.master.geometry("1000x700")
+        self.master.geometry("1000x850")
         self.master.columnconfigure(0, weight=1)
         self.master.rowconfigure(0, weight=1)
 
@@ -51,16 +70,28 @@ class ModelTrainerGUI:
         self.model_path = "data_classifier_model.joblib"
         self.model_metrics = None
         self.df_for_training = None
+        # Extracted features are cached per raw file and window settings, so repeated runs
+        # on the same data skip extraction.
+        self.feature_cache = FeatureCache(max_bytes=FEATURE_CACHE_MAX_BYTES)
 
         # Variables for real-time serial communication and prediction control
         self.rt_serial_port = None
         self.rt_connected = False
         self.rt_logging = False
         self.rt_stop_event = threading.Event()
-        self.rt_data_buffer = []
+        self.rt_predictor = None
+        self.rt_serial_reader = None
+        # Lines, votes and countdowns handed from the serial reader thread to the Tk thread
+        self.rt_queue = Queue()
+        self.rt_queue_job = None
         self.batch_length_var = tk.StringVar(value="12")
         self.time_left_var = tk.StringVar(value="0")
         self.current_prediction = tk.StringVar(value="N/A")
+        # Durations of the stages of the real-time path, shown in the statistics panel
+        self.rt_metrics = PipelineMetrics()
+        self.rt_stats_var = tk.StringVar(value="No measurements yet.")
+        self.rt_stats_job = None
+        self.rt_metrics_last_write = 0.0
         
         # Variables for windowing parameters used during feature extraction
         self.window_length_var = tk.StringVar(value=str(WINDOW_SIZE))
@@ -179,16 +210,17 @@ class ModelTrainerGUI:
         self.rt_disconnect_button = tk.Button(rt_frame, text="Disconnect", command=self.rt_disconnect_serial, state=tk.DISABLED, width=10)
         self.rt_disconnect_button.grid(row=0, column=4, padx=5, pady=5)
         
-        # Batch length input for real-time prediction and start/stop buttons
-        tk.Label(rt_frame, text="Batch Length (sec):").grid(row=1, column=0, padx=5, pady=5, sticky="e")
+        # Vote length input (predictions of the windows completed within this many seconds are
+        # combined by majority vote) and start/stop buttons for real-time prediction
+        tk.Label(rt_frame, text="Vote Length (sec):").grid(row=1, column=0, padx=5, pady=5, sticky="e")
         tk.Entry(rt_frame, textvariable=self.batch_length_var, width=10).grid(row=1, column=1, padx=5, pady=5, sticky="w")
         self.rt_start_button = tk.Button(rt_frame, text="Start Predictions", command=self.rt_start_predictions, state=tk.DISABLED, width=15)
         self.rt_start_button.grid(row=1, column=2, padx=5, pady=5)
         self.rt_stop_button = tk.Button(rt_frame, text="Stop Predictions", command=self.rt_stop_predictions, state=tk.DISABLED, width=15)
         self.rt_stop_button.grid(row=1, column=3, padx=5, pady=5)
         
-        # Display remaining seconds in the current batch
-        tk.Label(rt_frame, text="Seconds left in batch:").grid(row=2, column=0, padx=5, pady=5, sticky="e")
+        # Display remaining seconds until the current window is complete
+        tk.Label(rt_frame, text="Seconds to next window:").grid(row=2, column=0, padx=5, pady=5, sticky="e")
         tk.Label(rt_frame, textvariable=self.time_left_var, fg="blue").grid(row=2, column=1, padx=5, pady=5, sticky="w")
         
         # Frame to display incoming sensor data from the serial port
@@ -203,6 +235,11 @@ class ModelTrainerGUI:
         pred_frame.grid(row=4, column=0, columnspan=5, sticky="ew", padx=5, pady=5)
         tk.Label(pred_frame, textvariable=self.current_prediction, fg="blue", font=("Helvetica", 12, "bold")).pack()
 
+        # Frame to show where the time of the real-time path goes (see pipelineMetrics.py)
+        stats_frame = tk.LabelFrame(rt_frame, text="Pipeline Statistics", padx=10, pady=5)
+        stats_frame.grid(row=5, column=0, columnspan=5, sticky="ew", padx=5, pady=5)
+        tk.Label(stats_frame, textvariable=self.rt_stats_var, font=("Courier", 9), justify=tk.LEFT, anchor="w").pack(fill="x")
+
         # --------------------------- TERMINAL UPDATES FRAME --------------------------
         # Frame for displaying status updates and messages from the application
         status_frame = tk.LabelFrame(main_frame, text="4. Terminal Updates", padx=10, pady=10)
@@ -257,7 +294,7 @@ class ModelTrainerGUI:
         """
         filename = filedialog.askopenfilename(
             title="Select Raw Data File for Training",
-            filetypes=(("CSV Files", "*.csv"), ("All Files", "*.*"))
+            filetypes=TABLE_FILETYPES
         )
         if filename:
             if filename != self.raw_data_file.get():
@@ -271,7 +308,7 @@ class ModelTrainerGUI:
         """
         filename = filedialog.askopenfilename(
             title="Select Processed Features File",
-            filetypes=(("CSV Files", "*.csv"), ("All Files", "*.*"))
+            filetypes=TABLE_FILETYPES
         )
         if filename:
             self.processed_features_file.set(filename)
@@ -283,7 +320,7 @@ class ModelTrainerGUI:
         """
         filename = filedialog.askopenfilename(
             title="Select Processed Features File for Prediction",
-            filetypes=(("CSV Files", "*.csv"), ("All Files", "*.*"))
+            filetypes=TABLE_FILETYPES
         )
         if filename:
             self.processed_file_predict.set(filename)
@@ -295,7 +332,7 @@ class ModelTrainerGUI:
         """
         filename = filedialog.askopenfilename(
             title="Select Input File for Prediction",
-            filetypes=(("CSV Files", "*.csv"), ("All Files", "*.*"))
+            filetypes=TABLE_FILETYPES
         )
         if filename:
             if filename != self.prediction_file.get():
@@ -314,7 +351,7 @@ class ModelTrainerGUI:
         save_path = filedialog.asksaveasfilename(
             title="Save Extracted Features",
             defaultextension=".csv",
-            filetypes=(("CSV Files", "*.csv"), ("All Files", "*.*"))
+            filetypes=TABLE_FILETYPES
         )
         if not save_path:
             messagebox.showinfo("Cancelled", "Save operation cancelled.")
@@ -334,7 +371,7 @@ class ModelTrainerGUI:
         save_path = filedialog.asksaveasfilename(
             title="Save Extracted Features",
             defaultextension=".csv",
-            filetypes=(("CSV Files", "*.csv"), ("All Files", "*.*"))
+            filetypes=TABLE_FILETYPES
         )
         if not save_path:
             messagebox.showinfo("Cancelled", "Save operation cancelled.")
@@ -363,7 +400,7 @@ class ModelTrainerGUI:
         if raw_path and proc_path:
             self.update_status("Using existing processed file. Skipping re-processing...")
             try:
-                df_for_training = pd.read_csv(proc_path)
+                df_for_training = read_table(proc_path)
             except Exception as e:
                 messagebox.showerror("Error reading processed file", str(e))
                 self.update_status("Idle")
@@ -378,7 +415,7 @@ class ModelTrainerGUI:
         if proc_path and not raw_path:
             self.update_status("No raw file selected. Training on existing processed file...")
             try:
-                df_for_training = pd.read_csv(proc_path)
+                df_for_training = read_table(proc_path)
             except Exception as e:
                 messagebox.showerror("Error reading processed file", str(e))
                 self.update_status("Idle")
@@ -393,7 +430,7 @@ class ModelTrainerGUI:
             save_path = filedialog.asksaveasfilename(
                 title="Save Processed Features for Training",
                 defaultextension=".csv",
-                filetypes=(("CSV Files", "*.csv"), ("All Files", "*.*"))
+                filetypes=TABLE_FILETYPES
             )
             if not save_path:
                 messagebox.showinfo("Cancelled", "Operation cancelled. No processed file was created.")
@@ -402,9 +439,6 @@ class ModelTrainerGUI:
 
             # Process the raw file, save to the chosen path, then train
             try:
-                processor = DataProcessor()
-                df_raw = processor.read_csv(raw_path)
-                selected_features = list(processor.features.keys())
                 try:
                     window_length = int(self.window_length_var.get())
                 except ValueError:
@@ -415,18 +449,12 @@ class ModelTrainerGUI:
                     stride = STRIDE
 
                 self.update_status("Processing raw file for training...")
-                processed_data = processor.process_data(
-                    df_raw,
-                    window_size=window_length,
-                    stride=stride,
-                    selected_features=selected_features
-                )
-                processed_df = pd.DataFrame(processed_data)
+                processed_df = self.extract_raw_features(raw_path, window_length, stride)
                 if processed_df.empty:
                     messagebox.showwarning("No Data", "No data available to train on after processing.")
                     self.update_status("Idle")
                     return
-                processed_df.to_csv(save_path, index=False)
+                write_table(processed_df, save_path)
                 self.update_status(f"Features saved to {save_path}. Starting training...")
             except Exception as e:
                 messagebox.showerror("Error", f"Error processing raw file: {e}")
@@ -437,6 +465,36 @@ class ModelTrainerGUI:
             thread = threading.Thread(target=self.run_training_bg, args=(processed_df,))
             thread.daemon = True
             thread.start()
+
+    def extract_raw_features(self, raw_file, window_length, stride, progress_callback=None, allow_processed=False):
+        """
+        Extract features from a raw data file with all default features, reusing the feature
+        cache when the same file was already processed with the same settings.
+        If allow_processed is set, a file without raw sensor columns is returned unchanged.
+        """
+        processor = DataProcessor()
+        selected_features = list(processor.features.keys())
+        cache_key = self.feature_cache.make_key(raw_file, processor, window_length, stride, selected_features)
+        cached_df = self.feature_cache.load(cache_key)
+        if cached_df is not None:
+            self.master.after(0, lambda: self.update_status("Loaded extracted features from cache."))
+            return cached_df
+        df = processor.read_csv(raw_file)
+        lower_cols = [col.lower() for col in df.columns]
+        if allow_processed and not (('timestamp_ms' in lower_cols) and ('sensor1_temperature_deg_c' in lower_cols)):
+            return df.copy()
+        processed_data = processor.process_data(
+            df,
+            window_size=window_length,
+            stride=stride,
+            selected_features=selected_features,
+            progress_callback=progress_callback
+        )
+        processed_df = pd.DataFrame(processed_data)
+        if not processed_df.empty:
+            self.feature_cache.store(cache_key, processed_df)
+        return processed_df
+
     def run_extraction_bg_predict(self, raw_file, save_path):
         """
         Background thread function for extracting features from a raw file for prediction.
@@ -445,9 +503,6 @@ class ModelTrainerGUI:
         try:
             self.master.after(0, lambda: self.predict_progress_bar.configure(value=0))
             self.master.after(0, lambda: self.update_status("Extracting features for prediction..."))
-            processor = DataProcessor()
-            df = processor.read_csv(raw_file)
-            selected_features = list(processor.features.keys())
             try:
                 window_length = int(self.window_length_var.get())
             except ValueError:
@@ -456,23 +511,16 @@ class ModelTrainerGUI:
                 stride = int(self.prediction_stride_length.get())
             except ValueError:
                 stride = STRIDE
-            lower_cols = [col.lower() for col in df.columns]
-            if ('timestamp_ms' in lower_cols) and ('sensor1_temperature_deg_c' in lower_cols):
-                processed_data = processor.process_data(
-                    df,
-                    window_size=window_length,
-                    stride=stride,
-                    selected_features=selected_features,
-                    progress_callback=self.predict_window_progress_callback
-                )
-                processed_df = pd.DataFrame(processed_data)
-            else:
-                processed_df = df.copy()
+            processed_df = self.extract_raw_features(
+                raw_file, window_length, stride,
+                progress_callback=self.predict_window_progress_callback,
+                allow_processed=True
+            )
             if processed_df.empty:
                 self.master.after(0, lambda: messagebox.showwarning("No Data", "No data available after processing."))
                 self.master.after(0, lambda: self.update_status("Idle"))
                 return
-            processed_df.to_csv(save_path, index=False)
+            write_table(processed_df, save_path)
             self.master.after(0, lambda: messagebox.showinfo("Success", f"Extracted features saved to {save_path}"))
             self.processed_file_predict.set(save_path)
             self.master.after(0, lambda: self.predict_progress_bar.configure(value=100))
@@ -489,9 +537,6 @@ class ModelTrainerGUI:
         try:
             self.master.after(0, lambda: self.train_progress_bar.configure(value=0))
             self.master.after(0, lambda: self.update_status("Extracting features..."))
-            processor = DataProcessor()
-            df = processor.read_csv(raw_file)
-            selected_features = list(processor.features.keys())
             try:
                 window_length = int(self.window_length_var.get())
             except ValueError:
@@ -500,23 +545,16 @@ class ModelTrainerGUI:
                 stride = int(self.stride_length_var.get())
             except ValueError:
                 stride = STRIDE
-            lower_cols = [col.lower() for col in df.columns]
-            if ('timestamp_ms' in lower_cols) and ('sensor1_temperature_deg_c' in lower_cols):
-                processed_data = processor.process_data(
-                    df,
-                    window_size=window_length,
-                    stride=stride,
-                    selected_features=selected_features,
-                    progress_callback=self.train_window_progress_callback
-                )
-                processed_df = pd.DataFrame(processed_data)
-            else:
-                processed_df = df.copy()
+            processed_df = self.extract_raw_features(
+                raw_file, window_length, stride,
+                progress_callback=self.train_window_progress_callback,
+                allow_processed=True
+            )
             if processed_df.empty:
                 self.master.after(0, lambda: messagebox.showwarning("No Data", "No data available after processing."))
                 self.master.after(0, lambda: self.update_status("Idle"))
                 return
-            processed_df.to_csv(save_path, index=False)
+            write_table(processed_df, save_path)
             self.master.after(0, lambda: messagebox.showinfo("Success", f"Extracted features saved to {save_path}"))
             self.processed_features_file.set(save_path)
             self.master.after(0, lambda: self.train_progress_bar.configure(value=100))
@@ -601,7 +639,7 @@ class ModelTrainerGUI:
         if raw_pred_path and proc_pred_path:
             self.update_status("Using existing processed file for prediction. Skipping re-processing...")
             try:
-                processed_df = pd.read_csv(proc_pred_path)
+                processed_df = read_table(proc_pred_path, memory_map=False)
             except Exception as e:
                 messagebox.showerror("Error", f"Error reading processed features file: {e}")
                 self.update_status("Idle")
@@ -615,7 +653,7 @@ class ModelTrainerGUI:
         if proc_pred_path and not raw_pred_path:
             self.update_status("No raw file selected. Predicting on existing processed file...")
             try:
-                processed_df = pd.read_csv(proc_pred_path)
+                processed_df = read_table(proc_pred_path, memory_map=False)
             except Exception as e:
                 messagebox.showerror("Error", f"Error reading processed features file: {e}")
                 self.update_status("Idle")
@@ -630,7 +668,7 @@ class ModelTrainerGUI:
             save_path = filedialog.asksaveasfilename(
                 title="Save Processed Features for Prediction",
                 defaultextension=".csv",
-                filetypes=(("CSV Files", "*.csv"), ("All Files", "*.*"))
+                filetypes=TABLE_FILETYPES
             )
             if not save_path:
                 messagebox.showinfo("Cancelled", "Operation cancelled. No processed file was created.")
@@ -639,9 +677,6 @@ class ModelTrainerGUI:
 
             # Process the raw file, save to the chosen path, then predict
             try:
-                processor = DataProcessor()
-                df_raw = processor.read_csv(raw_pred_path)
-                selected_features = list(processor.features.keys())
                 try:
                     window_length = int(self.window_length_var.get())
                 except ValueError:
@@ -652,22 +687,18 @@ class ModelTrainerGUI:
                     stride = STRIDE
 
                 self.update_status("Processing raw file for prediction...")
-                processed_data = processor.process_data(
-                    df_raw,
-                    window_size=window_length,
-                    stride=stride,
-                    selected_features=selected_features,
+                processed_df = self.extract_raw_features(
+                    raw_pred_path, window_length, stride,
                     progress_callback=self.predict_window_progress_callback
                 )
                 self.master.after(0, lambda: self.predict_progress_bar.configure(value=80))
 
-                processed_df = pd.DataFrame(processed_data)
                 if processed_df.empty:
                     messagebox.showwarning("No Data", "No data available for prediction after processing.")
                     self.update_status("Idle")
                     return
 
-                processed_df.to_csv(save_path, index=False)
+                write_table(processed_df, save_path)
                 self.update_status(f"Features saved to {save_path}. Starting prediction...")
             except Exception as e:
                 messagebox.showerror("Error", f"Error processing raw prediction file: {e}")
@@ -765,7 +796,7 @@ class ModelTrainerGUI:
             save_path = self.processed_file_predict.get()
             if not save_path:
                 raise ValueError("No processed file path available to save predictions.")
-            processed_df.to_csv(save_path, index=False)
+            write_table(processed_df, save_path)
             self.master.after(0, lambda: messagebox.showinfo("Success", f"Predictions automatically saved to {save_path}"))
 
             self.master.after(0, lambda: self.predict_progress_bar.configure(value=100))
@@ -904,6 +935,7 @@ class ModelTrainerGUI:
             if self.rt_logging:
                 self.rt_stop_predictions()
             self.rt_stop_event.set()
+            self.rt_stop_serial_reader()
             self.rt_serial_port.close()
             self.rt_connected = False
             self.update_status("RT serial port disconnected.")
@@ -929,10 +961,18 @@ class ModelTrainerGUI:
         self.rt_stop_button.config(state=tk.NORMAL)
         self.rt_start_button.config(state=tk.DISABLED)
         self.update_status("Real-time predictions started.")
-        self.rt_data_buffer.clear()
         self.rt_data_display.config(state='normal')
         self.rt_data_display.delete('1.0', tk.END)
         self.rt_data_display.config(state='disabled')
+        self.rt_metrics.reset()
+        self.rt_metrics_last_write = time.monotonic()
+        if self.rt_stats_job is not None:
+            self.master.after_cancel(self.rt_stats_job)
+        self.rt_stats_job = self.master.after(RT_STATS_REFRESH_MS, self.rt_refresh_stats)
+        # The reader of the previous run has stopped, so anything left in the queue is stale.
+        self.rt_queue = Queue()
+        if self.rt_queue_job is None:
+            self.rt_queue_job = self.master.after(RT_QUEUE_INTERVAL_MS, self.rt_process_queue)
         self.rt_read_thread = threading.Thread(target=self.rt_read_serial_data, daemon=True)
         self.rt_read_thread.start()
 
@@ -942,6 +982,7 @@ class ModelTrainerGUI:
         """
         self.rt_logging = False
         self.rt_stop_event.set()
+        self.rt_stop_serial_reader()
         self.rt_stop_button.config(state=tk.DISABLED)
         self.rt_start_button.config(state=tk.NORMAL)
         self.update_status("Real-time predictions stopped.")
@@ -961,157 +1002,129 @@ class ModelTrainerGUI:
 
     def rt_read_serial_data(self):
         """
-        Continuously read serial data from the connected device.
-        Buffer and process data in batches, perform predictions on the data,
-        and update the UI with sensor output and current prediction.
+        Prepare real-time predictions and start reading serial data from the connected device.
+        Lines are read by a SerialLineReader, which blocks while no data arrives, and are passed
+        to rt_handle_line. The results are shown by rt_process_queue on the Tk thread.
         """
-        buffer = ""
-        start_time = None
         try:
-            batch_length = float(self.batch_length_var.get())
+            vote_length = float(self.batch_length_var.get())
         except ValueError:
-            batch_length = 5
-        processor = DataProcessor()
-        selected_features = list(processor.features.keys())
-        columns = [
-            "Real_Time",
-            "Timestamp_ms",
-            "Label_Tag",
-            "HeaterProfile_ID",
-            "Sensor1_Temperature_deg_C",
-            "Sensor1_Pressure_Pa",
-            "Sensor1_Humidity_%",
-            "Sensor1_GasResistance_ohm",
-            "Sensor1_Status",
-            "Sensor1_GasIndex",
-            "Sensor2_Temperature_deg_C",
-            "Sensor2_Pressure_Pa",
-            "Sensor2_Humidity_%",
-            "Sensor2_GasResistance_ohm",
-            "Sensor2_Status",
-            "Sensor2_GasIndex",
-            "Sensor3_Temperature_deg_C",
-            "Sensor3_Pressure_Pa",
-            "Sensor3_Humidity_%",
-            "Sensor3_GasResistance_ohm",
-            "Sensor3_Status",
-            "Sensor3_GasIndex",
-            "Sensor4_Temperature_deg_C",
-            "Sensor4_Pressure_Pa",
-            "Sensor4_Humidity_%",
-            "Sensor4_GasResistance_ohm",
-            "Sensor4_Status",
-            "Sensor4_GasIndex",
-            "Sensor5_Temperature_deg_C",
-            "Sensor5_Pressure_Pa",
-            "Sensor5_Humidity_%",
-            "Sensor5_GasResistance_ohm",
-            "Sensor5_Status",
-            "Sensor5_GasIndex",
-            "Sensor6_Temperature_deg_C",
-            "Sensor6_Pressure_Pa",
-            "Sensor6_Humidity_%",
-            "Sensor6_GasResistance_ohm",
-            "Sensor6_Status",
-            "Sensor6_GasIndex",
-            "Sensor7_Temperature_deg_C",
-            "Sensor7_Pressure_Pa",
-            "Sensor7_Humidity_%",
-            "Sensor7_GasResistance_ohm",
-            "Sensor7_Status",
-            "Sensor7_GasIndex",
-            "Sensor8_Temperature_deg_C",
-            "Sensor8_Pressure_Pa",
-            "Sensor8_Humidity_%",
-            "Sensor8_GasResistance_ohm",
-            "Sensor8_Status",
-            "Sensor8_GasIndex"
-        ]
-        expected_col_count = len(columns)
-        non_numeric_cols = ["Real_Time", "Label_Tag", "HeaterProfile_ID"]
-        for sn in range(1, 9):
-            non_numeric_cols.append(f"Sensor{sn}_Status")
-        numeric_cols = [c for c in columns if c not in non_numeric_cols]
+            vote_length = 5
         try:
-            clf, le = load(self.model_path)
+            window_length = int(self.window_length_var.get())
+        except ValueError:
+            window_length = WINDOW_SIZE
+        try:
+            stride = int(self.stride_length_var.get())
+        except ValueError:
+            stride = STRIDE
+        try:
+            model, label_encoder = load(self.model_path)
         except:
             self.update_status("No model file found for real-time predictions.")
             return
-        while not self.rt_stop_event.is_set():
-            if self.rt_serial_port and self.rt_serial_port.in_waiting > 0:
-                try:
-                    byte_data = self.rt_serial_port.read(self.rt_serial_port.in_waiting)
-                    buffer += byte_data.decode(errors='ignore')
-                    while '\n' in buffer:
-                        line, buffer = buffer.split('\n', 1)
-                        line = line.strip()
-                        if not line:
-                            continue
-                        self.rt_data_display.config(state='normal')
-                        self.rt_data_display.insert(tk.END, line + "\n")
-                        self.rt_data_display.yview(tk.END)
-                        self.rt_data_display.config(state='disabled')
-                        csv_reader = csv.reader(StringIO(line))
-                        parsed = next(csv_reader, None)
-                        if not parsed:
-                            continue
-                        if len(parsed) == expected_col_count - 1:
-                            real_time_str = pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
-                            parsed = [real_time_str] + parsed
-                        elif len(parsed) != expected_col_count:
-                            continue
-                        try:
-                            row_df = pd.DataFrame([parsed], columns=columns)
-                            for col in numeric_cols:
-                                row_df[col] = pd.to_numeric(row_df[col], errors='coerce')
-                        except:
-                            continue
-                        self.rt_data_buffer.append(row_df)
-                        if start_time is None:
-                            start_time = time.time()
-                        elapsed = time.time() - start_time
-                        remain = max(0, round(batch_length - elapsed))
-                        self.time_left_var.set(str(remain))
-                        if elapsed >= batch_length:
-                            batch_df = pd.concat(self.rt_data_buffer, ignore_index=True)
-                            self.rt_data_buffer.clear()
-                            start_time = time.time()
-                            self.time_left_var.set(str(int(batch_length)))
-                            try:
-                                try:
-                                    window_length = int(self.window_length_var.get())
-                                except ValueError:
-                                    window_length = WINDOW_SIZE
-                                try:
-                                    stride = int(self.stride_length_var.get())
-                                except ValueError:
-                                    stride = STRIDE
-                                features_df = processor.process_batch(
-                                    batch_df,
-                                    window_size=window_length,
-                                    stride=stride,
-                                    selected_features=selected_features
-                                )
-                                if not features_df.empty:
-                                    feature_cols_batch = [c for c in features_df.columns if c not in ['Label_Tag', 'Real_Time']]
-                                    preds_numeric = clf.predict(features_df[feature_cols_batch])
-                                    final_pred_list = le.inverse_transform(preds_numeric)
-                                    try:
-                                        final_pred = mode(final_pred_list)
-                                    except:
-                                        values, counts = np.unique(final_pred_list, return_counts=True)
-                                        final_pred = values[np.argmax(counts)]
-                                    self.current_prediction.set(str(final_pred))
-                                else:
-                                    self.current_prediction.set("No features extracted")
-                            except Exception as ex:
-                                import traceback
-                                traceback.print_exc()
-                                self.update_status(f"Batch processing error: {ex}")
-                except serial.SerialException:
-                    self.update_status("Serial Communication Error: Connection lost.")
-                    messagebox.showerror("Communication Error", "Serial Communication Error: Connection lost.")
-                    break
+        try:
+            self.rt_predictor = LivePredictor.from_settings(
+                DataProcessor(), model, label_encoder, window_length, stride, vote_length,
+                min_sample_interval=RT_MIN_SAMPLE_INTERVAL, metrics=self.rt_metrics
+            )
+        except ValueError as e:
+            self.update_status(f"Real-time prediction error: {e}")
+            return
+        if self.rt_stop_event.is_set() or not (self.rt_serial_port and self.rt_serial_port.is_open):
+            return
+        self.rt_serial_reader = SerialLineReader(self.rt_serial_port, on_error=self.rt_handle_serial_error, metrics=self.rt_metrics)
+        self.rt_serial_reader.subscribe(self.rt_handle_line)
+        self.rt_serial_reader.start()
+
+    def rt_handle_line(self, line):
+        """
+        Handle one line received during real-time predictions (called on the serial reader thread).
+        Window features are updated with the sample and every completed window is classified
+        right away. The line, the majority vote of the window predictions made during the last
+        vote length seconds and the seconds to the next window are queued for rt_process_queue,
+        since Tk widgets may only be updated on the Tk thread.
+        """
+        vote = remain = error = None
+        try:
+            if self.rt_predictor.handle_line(line):
+                vote = str(self.rt_predictor.vote())
+            remain = self.rt_predictor.feature_stream.seconds_to_next_window()
+        except Exception as ex:
+            import traceback
+            traceback.print_exc()
+            error = f"Feature processing error: {ex}"
+        self.rt_queue.put((line, vote, remain, error))
+
+    def rt_process_queue(self):
+        """
+        Show everything queued by rt_handle_line: the received lines are added to the sensor
+        data output with one insert, and the newest vote and countdown are shown. The time
+        these widget updates take is recorded as the ui_update stage. Runs every
+        RT_QUEUE_INTERVAL_MS while predictions run, and once more after they stop.
+        """
+        self.rt_queue_job = None
+        lines = []
+        vote = remain = error = None
+        try:
+            while True:
+                line, line_vote, line_remain, line_error = self.rt_queue.get_nowait()
+                lines.append(line)
+                vote = line_vote if line_vote is not None else vote
+                remain = line_remain if line_remain is not None else remain
+                error = line_error or error
+        except Empty:
+            pass
+        start = time.perf_counter()
+        if lines:
+            self.rt_data_display.config(state='normal')
+            self.rt_data_display.insert(tk.END, "\n".join(lines) + "\n")
+            self.rt_data_display.yview(tk.END)
+            self.rt_data_display.config(state='disabled')
+        if vote is not None:
+            self.current_prediction.set(vote)
+        if remain is not None:
+            self.time_left_var.set(str(int(np.ceil(remain))))
+        if error:
+            self.update_status(error)
+        if lines:
+            self.rt_metrics.record("ui_update", time.perf_counter() - start)
+        if self.rt_logging:
+            self.rt_queue_job = self.master.after(RT_QUEUE_INTERVAL_MS, self.rt_process_queue)
+
+    def rt_refresh_stats(self):
+        """
+        Show the pipeline statistics in the statistics panel, and append them to RT_METRICS_FILE
+        every RT_METRICS_WRITE_INTERVAL seconds and once more after predictions stop.
+        """
+        self.rt_stats_job = None
+        snapshot = self.rt_metrics.snapshot()
+        self.rt_stats_var.set(format_snapshot(snapshot))
+        now = time.monotonic()
+        if not self.rt_logging or now - self.rt_metrics_last_write >= RT_METRICS_WRITE_INTERVAL:
+            self.rt_metrics_last_write = now
+            try:
+                write_metrics(os.path.join(os.path.dirname(os.path.abspath(__file__)), RT_METRICS_FILE), snapshot)
+            except OSError as e:
+                self.update_status(f"Could not write pipeline metrics: {e}")
+        if self.rt_logging:
+            self.rt_stats_job = self.master.after(RT_STATS_REFRESH_MS, self.rt_refresh_stats)
+
+    def rt_handle_serial_error(self, error):
+        """
+        Report a lost serial connection during real-time predictions (called on the serial reader
+        thread, which stops).
+        """
+        self.master.after(0, lambda: self.update_status("Serial Communication Error: Connection lost."))
+        self.master.after(0, lambda: messagebox.showerror("Communication Error", "Serial Communication Error: Connection lost."))
+
+    def rt_stop_serial_reader(self):
+        """
+        Stop the serial reader of real-time predictions, if one is running.
+        """
+        if self.rt_serial_reader:
+            self.rt_serial_reader.stop()
+            self.rt_serial_reader = None
 
     def update_status(self, message):
         """
@@ -2,8 +2,13 @@
 import numpy as np
 import pandas as pd
 import os
+import io
+import json
 import tkinter as tk
 from tkinter import simpledialog
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from columnarStore import is_columnar_file, read_table, write_table
 
 # Define the file path for the label encoder CSV that maps raw labels to class names.
 LABEL_ENCODER_PATH = os.path.join(
@@ -11,6 +16,43 @@ LABEL_ENCODER_PATH = os.path.join(
     "Label_Encoder.csv"
 )
 
+# Version of the feature extraction output. Bump it whenever a change alters the extracted
+# features, so that feature matrices cached by featureCache.FeatureCache are recomputed.
+PROCESSOR_VERSION = 1
+
+# Statistics the vectorized window engine can compute in one batched pass, keyed by the
+# NumPy reduction used when building the feature function.
+VECTORIZED_STATS = {np.mean: "Mean", np.std: "StdDev", np.min: "Min", np.max: "Max"}
+
+# Upper bound on the number of gathered values (windows x columns x rows) held in memory
+# at once by the vectorized engine; larger workloads are processed in chunks of windows.
+MAX_BATCH_ELEMENTS = 4_000_000
+
+# Window statistics engines selectable through DataProcessor(engine=...). "batched" reproduces
+# the per-window NumPy/pandas results exactly; "rolling" uses prefix sums and a sparse table so
+# that each window costs O(1) regardless of its length, matching within float tolerance.
+ENGINES = ("batched", "rolling")
+
+# Column suffixes of the per-sensor measurements in the logged CSV files, in the order used
+# for the measurement axis of the sensor matrix built by DataProcessor.build_sensor_matrix.
+SENSOR_MEASUREMENTS = ("Temperature_deg_C", "Pressure_Pa", "Humidity_%", "GasResistance_ohm", "Status", "GasIndex")
+
+# Number of progress_callback updates issued per extraction, however many windows there are.
+PROGRESS_UPDATES = 100
+
+# Format of the Real_Time column written by the Data Logger GUI.
+REAL_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Number of rows per chunk read by DataProcessor.read_csv_chunks.
+CSV_CHUNK_ROWS = 50_000
+
+# Suffix of the state file written next to a features CSV by DataProcessor.process_file_incremental.
+INCREMENTAL_STATE_SUFFIX = ".state.json"
+
+# With DataProcessor(n_workers > 1), the windows are split into this many contiguous chunks per
+# worker process, so that a slow chunk does not leave the other workers idle at the end.
+CHUNKS_PER_WORKER = 4
+
 def make_feature_func(column, func):
     """
     Creates and returns a function that computes a statistic on a specific DataFrame column.
@@ -25,6 +67,9 @@ def make_feature_func(column, func):
             return result
         except Exception:
             return np.nan
+    # Keep the column and statistic so the vectorized engine can batch this feature.
+    feature_func.column = column
+    feature_func.func = func
     return feature_func
 
 def get_feature_functions(data_interval=3, sensor_count=8):
@@ -59,12 +104,304 @@ def get_feature_functions(data_interval=3, sensor_count=8):
                 features[feature_name] = make_feature_func(col_name, func)
     return features
 
+def pairwise_sum(values):
+    """
+    Sums a stack of arrays along the first axis using the same pairwise scheme as NumPy's
+    one-dimensional float reduction. Each column therefore gets exactly the sum that
+    `np.sum` (and pandas) would return for it on its own, bit for bit.
+
+    Parameters:
+      values: An array of shape (n, ...) to be summed over its first axis.
+
+    Returns:
+      An array with the shape of values[0].
+    """
+    n = len(values)
+    if n < 8:
+        result = np.full(values.shape[1:], -0.0)
+        for row in values:
+            result = result + row
+        return result
+    if n <= 128:
+        partial = values[:8].copy()
+        i = 8
+        while i < n - n % 8:
+            partial += values[i:i + 8]
+            i += 8
+        result = ((partial[0] + partial[1]) + (partial[2] + partial[3])) + ((partial[4] + partial[5]) + (partial[6] + partial[7]))
+        for row in values[i:]:
+            result = result + row
+        return result
+    half = n // 2
+    half -= half % 8
+    return pairwise_sum(values[:half]) + pairwise_sum(values[half:])
+
+def window_statistics(values, lo, hi):
+    """
+    Computes the mean, standard deviation, minimum and maximum of every column of a 2-D array
+    over many row ranges at once. Missing values are skipped and the two-pass variance is
+    used, reproducing pandas' Series reductions exactly; a range with no valid values
+    yields NaN.
+
+    Parameters:
+      values: A (rows, columns) float array; float32 input is accumulated in float64.
+      lo: Array with the first row index of each window.
+      hi: Array with the end row index (exclusive) of each window.
+
+    Returns:
+      A dictionary mapping "Mean", "StdDev", "Min" and "Max" to (windows, columns) arrays.
+    """
+    shape = (len(lo), values.shape[1])
+    stats = {name: np.full(shape, np.nan) for name in ("Mean", "StdDev", "Min", "Max")}
+    counts = hi - lo
+    # Windows with the same number of rows are stacked as (rows, windows, columns) so that
+    # every reduction runs element-wise across the stack.
+    for n_rows in np.unique(counts):
+        if n_rows == 0:
+            continue
+        group = np.flatnonzero(counts == n_rows)
+        gathered = values[lo[group][None, :] + np.arange(n_rows)[:, None]].astype(np.float64, copy=False)
+        missing = np.isnan(gathered)
+        filled = np.where(missing, 0.0, gathered)
+        valid_count = (n_rows - missing.sum(axis=0)).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = pairwise_sum(filled) / valid_count
+            squared = np.where(missing, 0.0, (mean - filled) ** 2)
+            std = np.sqrt(pairwise_sum(squared) / valid_count)
+        minimum = np.where(missing, np.inf, gathered).min(axis=0)
+        maximum = np.where(missing, -np.inf, gathered).max(axis=0)
+        empty = valid_count == 0
+        minimum[empty] = np.nan
+        maximum[empty] = np.nan
+        stats["Mean"][group] = mean
+        stats["StdDev"][group] = std
+        stats["Min"][group] = minimum
+        stats["Max"][group] = maximum
+    return stats
+
+def rolling_window_statistics(values, lo, hi):
+    """
+    Computes the same statistics as window_statistics in O(1) per window. Cumulative sums of
+    the values, their squares and the valid-value counts give each window's mean and
+    (population) standard deviation from two lookups, and a sparse table of running minima
+    and maxima answers each min/max query from two overlapping power-of-two blocks.
+    Columns are centred on their overall mean before accumulation to limit cancellation in
+    the sum of squares, so results agree with window_statistics within float tolerance.
+
+    Parameters:
+      values: A (rows, columns) float array.
+      lo: Array with the first row index of each window.
+      hi: Array with the end row index (exclusive) of each window.
+
+    Returns:
+      A dictionary mapping "Mean", "StdDev", "Min" and "Max" to (windows, columns) arrays.
+    """
+    shape = (len(lo), values.shape[1])
+    stats = {name: np.full(shape, np.nan) for name in ("Mean", "StdDev", "Min", "Max")}
+    if len(lo) == 0:
+        return stats
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    valid = ~missing
+    column_count = valid.sum(axis=0)
+    offset = np.where(column_count > 0, np.where(missing, 0.0, values).sum(axis=0) / np.maximum(column_count, 1), 0.0)
+    centred = np.where(missing, 0.0, values - offset)
+
+    # Prefix sums with a leading zero row, so that the window [a, b) is prefix[b] - prefix[a].
+    # They are accumulated in extended precision where the platform provides it, since the
+    # running totals grow with the recording length while the windows stay short.
+    def prefix(array):
+        out = np.zeros((array.shape[0] + 1, array.shape[1]), dtype=np.longdouble)
+        np.cumsum(array, axis=0, out=out[1:])
+        return out
+
+    sums = prefix(centred)
+    squares = prefix(centred * centred)
+    counts = np.zeros((values.shape[0] + 1, values.shape[1]), dtype=np.int64)
+    np.cumsum(valid, axis=0, out=counts[1:])
+    n = counts[hi] - counts[lo]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (sums[hi] - sums[lo]) / n
+        variance = ((squares[hi] - squares[lo]) / n - mean * mean).astype(np.float64)
+        mean = mean.astype(np.float64)
+    np.maximum(variance, 0.0, out=variance)
+
+    # Sparse table: level k holds the minimum/maximum of each run of 2**k rows starting at
+    # that row. Only the levels needed by the longest window are built.
+    lengths = hi - lo
+    max_level = int(np.log2(max(int(lengths.max()), 1)))
+    minima = [np.where(missing, np.inf, values)]
+    maxima = [np.where(missing, -np.inf, values)]
+    for level in range(1, max_level + 1):
+        half = 1 << (level - 1)
+        minima.append(np.minimum(minima[-1][:-half], minima[-1][half:]))
+        maxima.append(np.maximum(maxima[-1][:-half], maxima[-1][half:]))
+    levels = np.zeros(len(lo), dtype=np.int64)
+    nonempty = lengths > 0
+    levels[nonempty] = np.log2(lengths[nonempty]).astype(np.int64)
+    minimum = np.full(shape, np.inf)
+    maximum = np.full(shape, -np.inf)
+    for level in np.unique(levels[nonempty]):
+        group = np.flatnonzero(nonempty & (levels == level))
+        tail = hi[group] - (1 << int(level))
+        minimum[group] = np.minimum(minima[level][lo[group]], minima[level][tail])
+        maximum[group] = np.maximum(maxima[level][lo[group]], maxima[level][tail])
+
+    empty = n == 0
+    mean = mean + offset
+    std = np.sqrt(variance)
+    # A window whose values are all equal has no spread; forcing this case to exactly zero
+    # keeps saturated readings (e.g. constant gas resistance) from showing rounding noise.
+    std[minimum == maximum] = 0.0
+    for array in (mean, std, minimum, maximum):
+        array[empty] = np.nan
+    stats["Mean"], stats["StdDev"], stats["Min"], stats["Max"] = mean, std, minimum, maximum
+    return stats
+
+def engine_window_statistics(values, lo, hi, engine):
+    """
+    Computes the window statistics with the selected engine. The "batched" engine runs
+    window_statistics in chunks of windows bounded by MAX_BATCH_ELEMENTS; the "rolling" engine
+    runs rolling_window_statistics in a single pass.
+
+    Parameters:
+      values: A (rows, columns) float array.
+      lo: Array with the first row index of each window.
+      hi: Array with the end row index (exclusive) of each window.
+      engine: One of ENGINES.
+
+    Returns:
+      A dictionary mapping "Mean", "StdDev", "Min" and "Max" to (windows, columns) arrays.
+    """
+    if engine == "rolling":
+        return rolling_window_statistics(values, lo, hi)
+    stats = {name: np.empty((len(lo), values.shape[1])) for name in VECTORIZED_STATS.values()}
+    width = int((hi - lo).max()) if len(lo) else 0
+    chunk = max(1, MAX_BATCH_ELEMENTS // max(1, width * values.shape[1]))
+    for start in range(0, len(lo), chunk):
+        part = window_statistics(values, lo[start:start + chunk], hi[start:start + chunk])
+        for name, array in part.items():
+            stats[name][start:start + chunk] = array
+    return stats
+
+def shared_window_statistics(buffer_name, shape, dtype, lo, hi, engine):
+    """
+    Worker process entry point for parallel extraction. Attaches to the sensor values that
+    the parent placed in shared memory, so the array is not pickled for every task, and
+    computes the statistics of one contiguous chunk of windows on the rows it spans.
+
+    Parameters:
+      buffer_name: Name of the multiprocessing.shared_memory block holding the values.
+      shape: Shape of the (rows, columns) values array.
+      dtype: NumPy dtype of the values array.
+      lo: Array with the first row index of each window in the chunk.
+      hi: Array with the end row index (exclusive) of each window in the chunk.
+      engine: One of ENGINES.
+
+    Returns:
+      A dictionary mapping "Mean", "StdDev", "Min" and "Max" to (windows, columns) arrays.
+    """
+    buffer = shared_memory.SharedMemory(name=buffer_name)
+    values = None
+    try:
+        values = np.ndarray(shape, dtype=dtype, buffer=buffer.buf)
+        first, last = int(lo.min()), int(hi.max())
+        return engine_window_statistics(values[first:last], lo - first, hi - first, engine)
+    finally:
+        # The view must be released before the shared memory block can be closed.
+        values = None
+        buffer.close()
+
+def normalize_label(value):
+    """
+    Converts a raw Label_Tag value to the key used by the label encoder: numeric labels become
+    integers (so 1, 1.0 and "1" are the same label) and anything else its stripped string.
+    """
+    raw_label = str(value).strip()
+    try:
+        return int(float(raw_label))
+    except ValueError:
+        return raw_label
+
+def resume_row(times, next_start):
+    """
+    Finds the row from which an interrupted extraction must be continued: the last row before
+    the first incomplete window, which tells whether the following rows continue its block or
+    start a new one after a gap.
+
+    Parameters:
+      times: Series of the rows' Real_Time values, in file order.
+      next_start: Start time in nanoseconds of the first incomplete window (None without data).
+
+    Returns:
+      The positional index of that row, or 0 if no row precedes the window.
+    """
+    if next_start is None:
+        return 0
+    earlier = np.flatnonzero((pd.to_datetime(times, errors='coerce') < pd.Timestamp(next_start)).to_numpy())
+    return int(earlier[-1]) if len(earlier) else 0
+
+def single_label_windows(label_codes, lo, hi):
+    """
+    Determines which windows contain exactly one distinct (non-missing) label, which is the
+    vectorized equivalent of checking `window_df['Label_Tag'].nunique() == 1` per window.
+
+    Parameters:
+      label_codes: Integer label codes per row as returned by pd.factorize (-1 marks missing).
+      lo: Array with the first row index of each window.
+      hi: Array with the end row index (exclusive) of each window.
+
+    Returns:
+      A boolean array with one entry per window.
+    """
+    labelled_rows = np.flatnonzero(label_codes >= 0)
+    if len(labelled_rows) == 0:
+        return np.zeros(len(lo), dtype=bool)
+    # Number each run of identical consecutive labels; a window holds a single label exactly
+    # when its first and last labelled rows belong to the same run.
+    labelled_codes = label_codes[labelled_rows]
+    run_ids = np.concatenate(([0], np.cumsum(labelled_codes[1:] != labelled_codes[:-1])))
+    first = np.searchsorted(labelled_rows, lo, side='left')
+    last = np.searchsorted(labelled_rows, hi, side='left') - 1
+    has_label = first <= last
+    first = np.minimum(first, len(labelled_rows) - 1)
+    last = np.maximum(last, 0)
+    return has_label & (run_ids[first] == run_ids[last])
+
+class NewLabelsDialog(simpledialog.Dialog):
+    """
+    A dialog listing every unknown raw label with an entry field for its class name. After the
+    dialog closes, `result` holds a dictionary mapping each raw label to the entered text, or
+    None if the user cancelled.
+    """
+    def __init__(self, parent, raw_labels):
+        self.raw_labels = list(raw_labels)
+        self.entries = []
+        super().__init__(parent, "New Labels Encountered")
+
+    def body(self, master):
+        tk.Label(
+            master,
+            text="New labels were encountered. Please enter a class name for each label, or leave it\n"
+                 "empty (or click Cancel) to keep the numeric/string value.",
+            justify="left"
+        ).grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 5))
+        for row, raw_label in enumerate(self.raw_labels, start=1):
+            tk.Label(master, text=str(raw_label)).grid(row=row, column=0, sticky="e", padx=5)
+            entry = tk.Entry(master)
+            entry.grid(row=row, column=1, sticky="ew", padx=5, pady=2)
+            self.entries.append(entry)
+        return self.entries[0] if self.entries else None
+
+    def apply(self):
+        self.result = {raw_label: entry.get().strip() for raw_label, entry in zip(self.raw_labels, self.entries)}
+
 class DataProcessor:
     """
     A class for processing sensor data, including reading CSV files, validating columns,
     extracting features from sliding time windows, managing label encoding, and saving results.
     """
-    def __init__(self, label_encoder_path=LABEL_ENCODER_PATH, features=None, sensor_count=8, data_interval=3):
+    def __init__(self, label_encoder_path=LABEL_ENCODER_PATH, features=None, sensor_count=8, data_interval=3, engine="batched", sensor_dtype=np.float64, n_workers=1, interactive=True):
         """
         Initializes the DataProcessor with configuration settings, label encoding, and feature functions.
 
@@ -73,8 +410,24 @@ class DataProcessor:
           features: Optional dictionary of feature functions; if not provided, defaults are generated.
           sensor_count: Total number of sensors.
           data_interval: Expected interval (in seconds) between data samples.
+          engine: Window statistics engine, one of ENGINES ("batched" or "rolling").
+          sensor_dtype: Floating point type of the sensor matrix. np.float32 halves its memory
+            footprint, at the cost of float32 precision in the extracted features.
+          n_workers: Number of worker processes for the window statistics. The default of 1
+            computes everything in the calling process.
+          interactive: Whether unknown labels are resolved through a GUI dialog. Set to False for
+            headless runs, in which case they keep their raw value as class name.
         """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}'. Expected one of: {', '.join(ENGINES)}")
+        if n_workers < 1:
+            raise ValueError("n_workers must be at least 1.")
+        self.engine = engine
+        self.n_workers = n_workers
+        self.interactive = interactive
+        self.sensor_dtype = np.dtype(sensor_dtype)
         self.output_data = []
+        self.next_window_start = None
         self.label_encoder_path = label_encoder_path
         self.label_mapping = self.load_label_encoder(self.label_encoder_path)
         self.sensor_count = sensor_count
@@ -110,51 +463,49 @@ class DataProcessor:
             print(f"Could not load label encoder from {path}: {e}")
         return label_dict
 
-    def update_label_encoder(self, raw_label, new_class_name):
+    def update_label_encoder(self, new_labels):
         """
-        Appends a new raw label-to-class name mapping to the label encoder CSV file and updates
-        the in-memory dictionary.
+        Appends new raw label-to-class name mappings to the label encoder CSV file in a single
+        write and updates the in-memory dictionary.
 
         Parameters:
-          raw_label: The raw label encountered in the data.
-          new_class_name: The new class name provided by the user.
+          new_labels: A dictionary mapping each new raw label to the class name provided by the user.
         """
-        self.label_mapping[raw_label] = new_class_name
+        if not new_labels:
+            return
+        self.label_mapping.update(new_labels)
         file_exists = os.path.isfile(self.label_encoder_path)
         mode = 'a' if file_exists else 'w'
         with open(self.label_encoder_path, mode, newline='') as f:
             if not file_exists:
                 f.write("Label_Tag,Class_name\n")
-            f.write(f"{raw_label},{new_class_name}\n")
+            f.writelines(f"{raw_label},{class_name}\n" for raw_label, class_name in new_labels.items())
 
-    def ask_for_new_label_name(self, raw_label):
+    def ask_for_new_label_names(self, raw_labels):
         """
-        Displays a GUI dialog box to prompt the user to assign a new class name for an unknown label.
-        If the user cancels or provides no input, the raw label is used as the class name.
+        Displays one GUI dialog asking the user to assign class names to all unknown labels at
+        once. A label left empty, or all labels when the user cancels, keeps its raw value as
+        the class name. The dialog runs on the Tk main loop when one exists, so this method
+        can be called from a worker thread.
 
         Parameters:
-          raw_label: The raw label that requires a human-readable class name.
+          raw_labels: List of raw labels that require human-readable class names.
 
         Returns:
-          The class name provided by the user or the string representation of the raw label.
+          A dictionary mapping each raw label to its class name.
         """
         import threading
         parent = tk._default_root if tk._default_root is not None else None
         if parent:
             parent.update_idletasks()
-        prompt_text = (
-            f"A new label '{raw_label}' was encountered.\n"
-            "Please enter a class name for this label, or click Cancel to keep the numeric/string value."
-        )
         result = [None]
         event = threading.Event()
 
         def ask_dialog():
             try:
-                user_input = simpledialog.askstring("New Label Encountered", prompt_text, parent=parent)
+                result[0] = NewLabelsDialog(parent, raw_labels).result
             except Exception:
-                user_input = None
-            result[0] = user_input if user_input else str(raw_label)
+                result[0] = None
             event.set()
 
         if parent:
@@ -163,12 +514,57 @@ class DataProcessor:
             ask_dialog()
 
         event.wait()
-        self.update_label_encoder(raw_label, result[0])
-        return result[0]
+        names = result[0] or {}
+        return {raw_label: names.get(raw_label) or str(raw_label) for raw_label in raw_labels}
+
+    def resolve_labels(self, raw_labels):
+        """
+        Maps raw labels to class names, resolving all labels missing from the label encoder in
+        one step before extraction starts. In interactive mode the user is asked once for all of
+        them (ask_for_new_label_names) and the answers are saved to the label encoder; otherwise
+        unknown labels keep their raw value for this run and the encoder file is left unchanged.
+
+        Parameters:
+          raw_labels: Iterable of normalized raw labels (see normalize_label).
+
+        Returns:
+          A list of class names in the order of raw_labels.
+        """
+        raw_labels = list(raw_labels)
+        unknown = [raw_label for raw_label in dict.fromkeys(raw_labels) if raw_label not in self.label_mapping]
+        if unknown:
+            if self.interactive:
+                self.update_label_encoder(self.ask_for_new_label_names(unknown))
+            else:
+                print(f"Unknown labels kept as class names: {unknown}")
+        return [self.label_mapping.get(raw_label, str(raw_label)) for raw_label in raw_labels]
+
+    def raw_column_dtypes(self):
+        """
+        Returns the dtype schema of the raw log columns, so that pandas does not have to infer
+        types from the text. Real_Time is read as text and parsed by parse_real_time, and
+        Label_Tag is left to inference since it may hold numbers or strings. All sensor
+        measurements are read as float64, so missing readings (e.g. "N/A") become NaN.
+        """
+        dtypes = {'Real_Time': str, 'Timestamp_ms': np.float64, 'HeaterProfile_ID': np.float64}
+        for sensor_num in range(1, self.sensor_count + 1):
+            dtypes.update({f'Sensor{sensor_num}_{suffix}': np.float64 for suffix in SENSOR_MEASUREMENTS})
+        return dtypes
+
+    def parse_real_time(self, df):
+        """
+        Converts the Real_Time column of a freshly read DataFrame in place using REAL_TIME_FORMAT.
+        Entries that do not match the format become NaT.
+        """
+        if 'Real_Time' in df.columns:
+            df['Real_Time'] = pd.to_datetime(df['Real_Time'], format=REAL_TIME_FORMAT, errors='coerce')
+        return df
 
     def read_csv(self, input_file):
         """
-        Reads sensor data from a CSV file into a pandas DataFrame.
+        Reads sensor data from a CSV file into a pandas DataFrame, using the raw_column_dtypes
+        schema for the known columns. Files in one of the binary columnar formats of
+        columnarStore (Feather, Parquet, .npz) are detected by extension and memory-mapped.
 
         Parameters:
           input_file: The path to the input CSV file.
@@ -183,12 +579,77 @@ class DataProcessor:
         if not os.path.isfile(input_file):
             raise FileNotFoundError(f"Input CSV not found: {input_file}")
         try:
-            df = pd.read_csv(input_file)
+            if is_columnar_file(input_file):
+                df = self.parse_real_time(read_table(input_file))
+            else:
+                df = self.parse_real_time(pd.read_csv(input_file, dtype=self.raw_column_dtypes()))
             print(f"Read {len(df)} rows from {input_file}")
             return df
         except Exception as e:
             raise Exception(f"Error reading CSV file: {e}")
 
+    def read_csv_chunks(self, input_file, chunk_rows=CSV_CHUNK_ROWS):
+        """
+        Reads sensor data from a CSV file in chunks of at most chunk_rows rows, with the same
+        schema and Real_Time parsing as read_csv.
+
+        Parameters:
+          input_file: The path to the input CSV file.
+          chunk_rows: Maximum number of rows per chunk.
+
+        Yields:
+          A tuple (chunk, bytes_read) for each chunk, where bytes_read is the approximate
+          position reached in the file.
+
+        Raises:
+          FileNotFoundError: If the CSV file does not exist.
+        """
+        if not os.path.isfile(input_file):
+            raise FileNotFoundError(f"Input CSV not found: {input_file}")
+        with open(input_file, 'rb') as f:
+            with pd.read_csv(f, dtype=self.raw_column_dtypes(), chunksize=chunk_rows) as reader:
+                for chunk in reader:
+                    yield self.parse_real_time(chunk), f.tell()
+
+    def process_csv_streaming(self, input_file, window_size, stride, selected_features, data_interval=None, gap_threshold=None, chunk_rows=CSV_CHUNK_ROWS, progress_callback=None):
+        """
+        Processes a CSV file chunk by chunk so that memory use is bounded by the chunk size
+        rather than the file size. The rows from the last one before the first incomplete
+        window onwards are carried over into the next chunk, and the window grid continues from
+        that window's start (see extract_windows' origin), so the windows spanning chunk
+        boundaries are produced exactly as by process_data on the whole file.
+
+        Parameters:
+          input_file: The path to the input CSV file (rows in time order).
+          window_size: The duration (in seconds) of each sliding window.
+          stride: The step (in seconds) by which the window moves.
+          selected_features: A list of feature names to compute.
+          data_interval: Optional expected interval between data points.
+          gap_threshold: Optional maximum gap (in seconds) allowed to consider data continuous.
+          chunk_rows: Maximum number of new rows read per chunk.
+          progress_callback: Optional callback called with (bytes_read, file_size) per chunk.
+
+        Returns:
+          A list of dictionaries, each representing computed features and metadata for a window.
+        """
+        file_size = os.path.getsize(input_file)
+        output_data = []
+        carry = None
+        origin = None
+        for chunk, bytes_read in self.read_csv_chunks(input_file, chunk_rows):
+            buffer = chunk if carry is None else pd.concat([carry, chunk], ignore_index=True)
+            times = buffer['Real_Time']
+            output_data.extend(self.extract_windows(
+                buffer, window_size, stride, selected_features,
+                data_interval=data_interval, gap_threshold=gap_threshold, origin=origin
+            ))
+            origin = self.next_window_start
+            carry = buffer.iloc[resume_row(times, origin):]
+            if progress_callback:
+                progress_callback(bytes_read, file_size)
+        self.output_data = output_data
+        return output_data
+
     def check_required_columns(self, df):
         """
         Verifies that the DataFrame contains all mandatory columns, including general metadata
@@ -204,14 +665,7 @@ class DataProcessor:
             'Real_Time', 'Timestamp_ms', 'Label_Tag', 'HeaterProfile_ID',
         ]
         for sensor_num in range(1, self.sensor_count + 1):
-            required_columns.extend([
-                f'Sensor{sensor_num}_Temperature_deg_C',
-                f'Sensor{sensor_num}_Pressure_Pa',
-                f'Sensor{sensor_num}_Humidity_%',
-                f'Sensor{sensor_num}_GasResistance_ohm',
-                f'Sensor{sensor_num}_Status',
-                f'Sensor{sensor_num}_GasIndex',
-            ])
+            required_columns.extend(f'Sensor{sensor_num}_{suffix}' for suffix in SENSOR_MEASUREMENTS)
         missing_columns = [col for col in required_columns if col not in df.columns]
         if missing_columns:
             raise Exception(f"Missing columns in CSV: {missing_columns}")
@@ -231,6 +685,277 @@ class DataProcessor:
           gap_threshold: Optional maximum gap (in seconds) allowed to consider data continuous.
           progress_callback: Optional callback function for progress updates.
 
+        Returns:
+          A list of dictionaries, each representing computed features and metadata for a window.
+        """
+        output_data = self.extract_windows(
+            df, window_size, stride, selected_features,
+            data_interval=data_interval, gap_threshold=gap_threshold, progress_callback=progress_callback
+        )
+        self.output_data = output_data
+        return output_data
+
+    def process_batch(self, batch_df, window_size, stride, selected_features, data_interval=None, gap_threshold=None):
+        """
+        Processes a batch of sensor data similar to process_data but returns the result as a DataFrame.
+        It divides the data into sliding windows, computes the selected features, and assigns proper labels.
+
+        Parameters:
+          batch_df: The DataFrame containing the sensor data.
+          window_size: Duration (in seconds) of each sliding window.
+          stride: Step (in seconds) by which the window slides.
+          selected_features: List of features to compute.
+          data_interval: Optional expected interval between data points.
+          gap_threshold: Optional maximum gap (in seconds) to treat data as continuous.
+
+        Returns:
+          A DataFrame with computed features and metadata for each valid window.
+        """
+        output_data = self.extract_windows(
+            batch_df, window_size, stride, selected_features,
+            data_interval=data_interval, gap_threshold=gap_threshold
+        )
+        if output_data:
+            df_out = pd.DataFrame(output_data).round(2)
+            if 'Real_Time' in df_out.columns:
+                cols = df_out.columns.tolist()
+                cols.remove('Real_Time')
+                df_out = df_out[['Real_Time'] + cols]
+            return df_out
+        else:
+            return pd.DataFrame()
+
+    def process_file_incremental(self, input_file, output_path, window_size, stride, selected_features, data_interval=None, gap_threshold=None, progress_callback=None):
+        """
+        Extracts features from an append-only log file, processing only what was added since
+        the previous call and appending the new windows to the features CSV at output_path.
+        A state file next to the output (output_path + INCREMENTAL_STATE_SUFFIX) records the
+        byte offset up to which the log was read and the start time of the first window that
+        was not complete yet. A later call re-reads the log from the last row before that
+        window, so the gap detection and window grid continue exactly as in a full run, and
+        the result is the same as processing the whole file at once. A full run is done when
+        there is no matching state, the settings changed, or the log was truncated.
+
+        Parameters:
+          input_file: Path of the raw CSV log.
+          output_path: Path of the features CSV to create or extend.
+          window_size: The duration (in seconds) of each sliding window.
+          stride: The step (in seconds) by which the window moves.
+          selected_features: A list of feature names to compute.
+          data_interval: Optional expected interval between data points.
+          gap_threshold: Optional maximum gap (in seconds) allowed to consider data continuous.
+          progress_callback: Optional callback function for progress updates.
+
+        Returns:
+          A list of dictionaries for the windows added by this call.
+        """
+        state_path = output_path + INCREMENTAL_STATE_SUFFIX
+        settings = {
+            "input_file": os.path.abspath(input_file),
+            "window_size": window_size,
+            "stride": stride,
+            "selected_features": list(selected_features),
+            "data_interval": data_interval if data_interval is not None else self.data_interval,
+            "gap_threshold": gap_threshold,
+            "processor_version": PROCESSOR_VERSION,
+            "engine": self.engine,
+        }
+        state = None
+        if os.path.isfile(state_path) and os.path.isfile(output_path):
+            try:
+                with open(state_path) as f:
+                    state = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable incremental state {state_path}: {e}")
+            if state and (state.get("settings") != settings or os.path.getsize(input_file) < state["end_offset"]):
+                state = None
+
+        with open(input_file, 'rb') as f:
+            if state:
+                header = state["header"].encode()
+                start_offset = state["resume_offset"]
+                f.seek(start_offset)
+            else:
+                header = f.readline()
+                start_offset = len(header)
+            data = f.read()
+        # Only complete lines are processed; a partially written last line is read next time.
+        data = data[:data.rfind(b'\n') + 1]
+        end_offset = start_offset + len(data)
+        if state and end_offset <= state["end_offset"]:
+            self.output_data = []
+            return []
+
+        # Byte offset of every non-blank line, matching the rows pd.read_csv returns.
+        lines = data.split(b'\n')[:-1]
+        line_offsets = start_offset + np.concatenate(([0], np.cumsum([len(line) + 1 for line in lines])[:-1])).astype(np.int64)
+        row_offsets = line_offsets[[i for i, line in enumerate(lines) if line.strip()]]
+        if not len(row_offsets):
+            # No complete data row yet (e.g. a log just created by the Data Logger); the
+            # state is left as it is, so the next call reads the rows once they are written.
+            self.output_data = []
+            return []
+        df = self.parse_real_time(pd.read_csv(io.BytesIO(header + data), dtype=self.raw_column_dtypes()))
+        print(f"Read {len(df)} rows from {input_file} starting at byte {start_offset}")
+        times = df['Real_Time'].copy()
+
+        origin = pd.Timestamp(state["next_window_start"]) if state and state["next_window_start"] is not None else None
+        output_data = self.extract_windows(
+            df, window_size, stride, selected_features,
+            data_interval=data_interval, gap_threshold=gap_threshold,
+            progress_callback=progress_callback, origin=origin
+        )
+        self.output_data = output_data
+        if output_data:
+            self.save_output(output_data, output_path, append=state is not None)
+        elif not state and os.path.isfile(output_path):
+            # A full run without windows leaves no features from an earlier run behind.
+            os.remove(output_path)
+
+        # Resume from the last row before the first incomplete window: it is needed to detect
+        # whether the rows that follow continue its block or start a new one after a gap.
+        next_start = self.next_window_start
+        resume_offset = int(row_offsets[resume_row(times, next_start)]) if len(row_offsets) else start_offset
+        with open(state_path, 'w') as f:
+            json.dump({
+                "settings": settings,
+                "header": header.decode(),
+                "end_offset": int(end_offset),
+                "resume_offset": resume_offset,
+                "next_window_start": next_start,
+            }, f, indent=2)
+        return output_data
+
+    def build_sensor_matrix(self, df):
+        """
+        Copies the per-sensor measurement columns once into a contiguous
+        (rows, sensors, measurements) array of self.sensor_dtype, so that feature computation
+        slices one array instead of indexing the DataFrame column by column. The measurement
+        axis follows SENSOR_MEASUREMENTS.
+
+        Parameters:
+          df: The DataFrame containing the sensor data.
+
+        Returns:
+          A tuple (matrix, numeric) where numeric is a (sensors, measurements) boolean mask of
+          the columns holding numeric data. Entries of non-numeric columns (e.g. "N/A" written
+          for a sensor that did not report) are left as NaN.
+        """
+        matrix = np.full((len(df), self.sensor_count, len(SENSOR_MEASUREMENTS)), np.nan, dtype=self.sensor_dtype)
+        numeric = np.zeros(matrix.shape[1:], dtype=bool)
+        for sensor_num in range(self.sensor_count):
+            for measurement, suffix in enumerate(SENSOR_MEASUREMENTS):
+                column = df[f'Sensor{sensor_num + 1}_{suffix}']
+                if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+                    matrix[:, sensor_num, measurement] = column.to_numpy(dtype=np.float64, na_value=np.nan)
+                    numeric[sensor_num, measurement] = True
+        return matrix, numeric
+
+    def compute_window_bounds(self, times, block_ids, window_ns, stride_ns, origin=None):
+        """
+        Locates the row range of every sliding window. Window start times are laid out from the
+        first timestamp of each continuous block, and the matching rows are found with a binary
+        search on the sorted timestamps instead of masking the whole block for every window.
+
+        Parameters:
+          times: Sorted int64 array of timestamps in nanoseconds (NaT sorts last).
+          block_ids: Array assigning each row to a continuous block.
+          window_ns: Window duration in nanoseconds.
+          stride_ns: Window step in nanoseconds.
+          origin: Optional start time (in nanoseconds) of the first window of the first block,
+            used instead of the block's first timestamp when continuing an earlier run.
+
+        Returns:
+          A tuple (lo, hi, next_start): int arrays holding the first row and the end row
+          (exclusive) of each window, in time order, and the start time in nanoseconds of the
+          first window of the last block that the data does not cover yet (None without data).
+        """
+        nat = np.iinfo(np.int64).min
+        boundaries = np.flatnonzero(np.diff(block_ids)) + 1
+        block_starts = np.concatenate(([0], boundaries))
+        block_ends = np.concatenate((boundaries, [len(times)]))
+        lo_parts, hi_parts = [], []
+        next_start = None
+        for b0, b1 in zip(block_starts, block_ends):
+            first, last = times[b0], times[b1 - 1]
+            if origin is not None and b0 == 0:
+                first = origin
+            next_start = int(first)
+            # A block that ends in NaT never satisfies the window condition.
+            if last == nat or last - first < window_ns:
+                continue
+            n_windows = (last - first - window_ns) // stride_ns + 1
+            starts = first + np.arange(n_windows, dtype=np.int64) * stride_ns
+            next_start = int(first + n_windows * stride_ns)
+            block_times = times[b0:b1]
+            lo_parts.append(b0 + np.searchsorted(block_times, starts, side='left'))
+            hi_parts.append(b0 + np.searchsorted(block_times, starts + window_ns, side='left'))
+        if not lo_parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), next_start
+        return np.concatenate(lo_parts), np.concatenate(hi_parts), next_start
+
+    def select_windows(self, times, block_ids, label_codes, window_size, stride_ns, origin=None):
+        """
+        Locates the sliding windows with compute_window_bounds and marks the ones to keep:
+        windows that are empty, have inconsistent labels, or cover less than 80% of the
+        expected duration are skipped.
+
+        Parameters:
+          times: Sorted int64 array of timestamps in nanoseconds.
+          block_ids: Array assigning each row to a continuous block.
+          label_codes: Integer label codes of the rows, as returned by pd.factorize.
+          window_size: The duration (in seconds) of each sliding window.
+          stride_ns: Window step in nanoseconds.
+          origin: Optional start time in nanoseconds, passed to compute_window_bounds.
+
+        Returns:
+          A tuple (lo, hi, keep, next_start) where keep is a boolean mask over the windows and
+          the other values are those of compute_window_bounds.
+        """
+        lo, hi, next_start = self.compute_window_bounds(
+            times, block_ids, pd.Timedelta(seconds=window_size).value, stride_ns, origin=origin)
+        keep = (hi > lo) & single_label_windows(label_codes, lo, hi)
+        last_row = np.maximum(hi - 1, 0)
+        actual_duration = (times[last_row] - times[lo]) / 1e9
+        keep &= ~(actual_duration < window_size * 0.8)
+        return lo, hi, keep, next_start
+
+    def window_class_names(self, label_codes, label_uniques, rows):
+        """
+        Returns the class names of windows, each taking the label of the row given in rows
+        (the window's last row). The distinct labels are resolved to class names once, up
+        front, so that no label parsing, file I/O or GUI prompts happen per window. Missing
+        labels (code -1) index the trailing "nan" entry of the lookup table.
+        """
+        window_codes = label_codes[rows]
+        used_codes = np.unique(window_codes)
+        raw_labels = [normalize_label(label_uniques[code] if code >= 0 else np.nan) for code in used_codes]
+        class_lookup = np.empty(len(label_uniques) + 1, dtype=object)
+        class_lookup[used_codes] = self.resolve_labels(raw_labels)
+        return class_lookup[window_codes]
+
+    def extract_windows(self, df, window_size, stride, selected_features, data_interval=None, gap_threshold=None, progress_callback=None, origin=None):
+        """
+        Sliding-window engine shared by process_data and process_batch. Window boundaries are
+        found with searchsorted, the sensor columns are copied once into a contiguous matrix
+        (build_sensor_matrix), and the Mean/StdDev/Min/Max features built by
+        get_feature_functions are computed for all windows in batched NumPy passes. Any other
+        feature function is still evaluated per window on the window's DataFrame slice.
+
+        Parameters:
+          df: The DataFrame containing the sensor data.
+          window_size: The duration (in seconds) of each sliding window.
+          stride: The step (in seconds) by which the window moves.
+          selected_features: A list of feature names to compute.
+          data_interval: Optional expected interval between data points.
+          gap_threshold: Optional maximum gap (in seconds) allowed to consider data continuous.
+          progress_callback: Optional callback function for progress updates, called about
+            PROGRESS_UPDATES times with (windows_processed, total_windows), or with
+            (windows_computed, windows_kept) once per completed chunk when n_workers > 1.
+          origin: Optional pd.Timestamp at which the windows of the first block start, passed to
+            compute_window_bounds. The start of the first window not covered by the data is
+            stored in self.next_window_start.
+
         Returns:
           A list of dictionaries, each representing computed features and metadata for a window.
         """
@@ -242,154 +967,168 @@ class DataProcessor:
 
         current_data_interval = data_interval if data_interval is not None else self.data_interval
         gap_threshold = pd.Timedelta(seconds=current_data_interval * 3) if gap_threshold is None else pd.Timedelta(seconds=gap_threshold)
-        window_size_td = pd.Timedelta(seconds=window_size)
         stride_td = pd.Timedelta(seconds=stride)
+        if stride_td <= pd.Timedelta(0):
+            raise ValueError("Stride must be greater than zero.")
 
         # Mark gaps in time series data and assign block IDs for continuous segments.
         df['Time_Diff'] = df['Real_Time'].diff()
         df['Block_ID'] = (df['Time_Diff'] > gap_threshold).cumsum()
 
-        # Estimate the total number of windows for optional progress reporting.
-        total_windows = 0
-        for _, block_df in df.groupby('Block_ID'):
-            block_start = block_df['Real_Time'].iloc[0]
-            block_end = block_df['Real_Time'].iloc[-1]
-            window_start = block_start
-            while window_start + window_size_td <= block_end:
-                total_windows += 1
-                window_start += stride_td
+        # Window bounds are computed once and also give the total for progress reporting.
+        times = df['Real_Time'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        label_codes, label_uniques = pd.factorize(df['Label_Tag'])
+        lo, hi, keep, self.next_window_start = self.select_windows(
+            times, df['Block_ID'].to_numpy(), label_codes, window_size, stride_td.value,
+            origin=None if origin is None else pd.Timestamp(origin).value)
+        total_windows = len(lo)
+        report_every = max(1, total_windows // PROGRESS_UPDATES)
+        window_classes = self.window_class_names(label_codes, label_uniques, hi[keep] - 1)
+
+        # With worker processes, progress is reported as their chunks of windows complete,
+        # since the feature computation then dominates the run time.
+        parallel = self.n_workers > 1
+        names, feature_matrix, extra = self.compute_window_features(
+            df, self.build_sensor_matrix(df), lo[keep], hi[keep], selected_features,
+            progress_callback=progress_callback if parallel else None)
+        start_times = pd.DatetimeIndex(df['Real_Time'].to_numpy()[lo[keep]])
 
         output_data = []
         windows_processed = 0
-
-        # Process each continuous block of data.
-        for _, block_df in df.groupby('Block_ID'):
-            block_start = block_df['Real_Time'].iloc[0]
-            block_end = block_df['Real_Time'].iloc[-1]
-            window_start = block_start
-
-            while window_start + window_size_td <= block_end:
-                window_end = window_start + window_size_td
-                window_df = block_df[(block_df['Real_Time'] >= window_start) & (block_df['Real_Time'] < window_end)]
-                # Skip windows that are empty or have inconsistent labels.
-                if window_df.empty or window_df['Label_Tag'].nunique() != 1:
-                    window_start += stride_td
-                    windows_processed += 1
-                    if progress_callback:
-                        progress_callback(windows_processed, total_windows)
-                    continue
-
-                # Ensure the window covers a sufficient portion of the expected duration.
-                actual_duration = (window_df['Real_Time'].iloc[-1] - window_df['Real_Time'].iloc[0]).total_seconds()
-                if actual_duration < window_size * 0.8:
-                    window_start += stride_td
-                    windows_processed += 1
-                    if progress_callback:
-                        progress_callback(windows_processed, total_windows)
-                    continue
-
-                # Process the label: attempt to convert to integer, otherwise use as string.
-                raw_label_str = str(window_df['Label_Tag'].iloc[-1]).strip()
-                try:
-                    raw_label = int(float(raw_label_str))
-                except ValueError:
-                    raw_label = raw_label_str
-
-                # If the raw label is new, prompt the user to assign a class name.
-                if raw_label not in self.label_mapping:
-                    class_name = self.ask_for_new_label_name(raw_label)
-                else:
-                    class_name = self.label_mapping[raw_label]
-
-                # Compute the selected features for the current window.
-                features = self.calculate_features(window_df, selected_features)
-                features['Real_Time'] = window_df['Real_Time'].iloc[0]
-                features['Label_Tag'] = class_name
+        valid_index = 0
+        for window_index in range(len(lo)):
+            if keep[window_index]:
+                features = dict(zip(names, feature_matrix[valid_index].tolist()))
+                for name, values in extra.items():
+                    features[name] = values[valid_index]
+                features['Real_Time'] = start_times[valid_index]
+                features['Label_Tag'] = window_classes[valid_index]
                 output_data.append(features)
+                valid_index += 1
 
-                window_start += stride_td
-                windows_processed += 1
-                if progress_callback:
-                    progress_callback(windows_processed, total_windows)
+            windows_processed += 1
+            if progress_callback and not parallel and (windows_processed % report_every == 0 or windows_processed == total_windows):
+                progress_callback(windows_processed, total_windows)
 
-        self.output_data = output_data
         return output_data
 
-    def process_batch(self, batch_df, window_size, stride, selected_features, data_interval=None, gap_threshold=None):
+    def compute_window_features(self, df, sensor_data, lo, hi, selected_features, progress_callback=None):
         """
-        Processes a batch of sensor data similar to process_data but returns the result as a DataFrame.
-        It divides the data into sliding windows, computes the selected features, and assigns proper labels.
+        Computes the selected features for every window given by the row ranges [lo, hi) and
+        writes them into a preallocated (windows, features) matrix. Features created by
+        get_feature_functions on numeric sensor columns are evaluated on slices of the sensor
+        matrix, with window_statistics in chunks bounded by MAX_BATCH_ELEMENTS, or in a single
+        pass of rolling_window_statistics when the "rolling" engine is selected, spread over
+        worker processes by parallel_window_statistics when n_workers > 1. All other feature
+        functions fall back to calculate_features on each window's DataFrame slice.
 
         Parameters:
-          batch_df: The DataFrame containing the sensor data.
-          window_size: Duration (in seconds) of each sliding window.
-          stride: Step (in seconds) by which the window slides.
-          selected_features: List of features to compute.
-          data_interval: Optional expected interval between data points.
-          gap_threshold: Optional maximum gap (in seconds) to treat data as continuous.
+          df: The sorted DataFrame the row ranges refer to, or None when the caller only has
+            the sensor matrix, in which case every selected feature must be one of the batched
+            statistics.
+          sensor_data: The (matrix, numeric) pair returned by build_sensor_matrix for df.
+          lo: Array with the first row index of each window.
+          hi: Array with the end row index (exclusive) of each window.
+          selected_features: List of feature names to calculate.
+          progress_callback: Optional callback passed on to parallel_window_statistics.
 
         Returns:
-          A DataFrame with computed features and metadata for each valid window.
+          A tuple (names, matrix, extra): the computed feature names in the order of
+          selected_features, the (windows, features) float matrix, and a dictionary of
+          per-window values for features that are not plain floats (fallback features and the
+          unrounded Min/Max of integer columns), which take precedence over the matrix.
         """
-        self.check_required_columns(batch_df)
-        batch_df['Real_Time'] = pd.to_datetime(batch_df['Real_Time'], errors='coerce')
-        batch_df = batch_df.sort_values('Real_Time').reset_index(drop=True)
-        if batch_df['Real_Time'].isnull().all():
-            raise Exception("All 'Real_Time' entries are NaT. Cannot proceed.")
+        sensor_matrix, numeric = sensor_data
+        measurement_count = len(SENSOR_MEASUREMENTS)
+        positions = {
+            f'Sensor{sensor_num + 1}_{suffix}': sensor_num * measurement_count + measurement
+            for sensor_num in range(sensor_matrix.shape[1])
+            for measurement, suffix in enumerate(SENSOR_MEASUREMENTS)
+        }
+        numeric = numeric.ravel()
 
-        current_data_interval = data_interval if data_interval is not None else self.data_interval
-        gap_threshold = pd.Timedelta(seconds=current_data_interval * 3) if gap_threshold is None else pd.Timedelta(seconds=gap_threshold)
-        window_size_td = pd.Timedelta(seconds=window_size)
-        stride_td = pd.Timedelta(seconds=stride)
+        names = [name for name in selected_features if self.features.get(name)]
+        output = np.full((len(lo), len(names)), np.nan)
+        extra = {}
+        batched, fallback = [], []
+        for index, feature_name in enumerate(names):
+            feature_func = self.features[feature_name]
+            position = positions.get(getattr(feature_func, 'column', None))
+            stat = VECTORIZED_STATS.get(getattr(feature_func, 'func', None))
+            if stat and position is not None and numeric[position]:
+                batched.append((index, feature_name, position, stat))
+            else:
+                fallback.append(feature_name)
 
-        batch_df['Time_Diff'] = batch_df['Real_Time'].diff()
-        batch_df['Block_ID'] = (batch_df['Time_Diff'] > gap_threshold).cumsum()
+        if batched:
+            used = sorted({position for _, _, position, _ in batched})
+            column_index = {position: i for i, position in enumerate(used)}
+            values = sensor_matrix.reshape(len(sensor_matrix), -1)[:, used]
+            if self.n_workers > 1 and len(lo) > 1:
+                stats = self.parallel_window_statistics(values, lo, hi, progress_callback)
+            else:
+                stats = engine_window_statistics(values, lo, hi, self.engine)
+            for index, feature_name, position, stat in batched:
+                result = stats[stat][:, column_index[position]]
+                column = df[self.features[feature_name].column] if df is not None else None
+                if stat in ("Min", "Max") and column is not None and pd.api.types.is_integer_dtype(column):
+                    # Integer minima and maxima are returned unrounded, as by make_feature_func.
+                    extra[feature_name] = result.astype(column.dtype)
+                else:
+                    output[:, index] = np.round(result, 2)
 
-        output_data = []
-        # Process each continuous segment in the batch.
-        for _, block_df in batch_df.groupby('Block_ID'):
-            block_start = block_df['Real_Time'].iloc[0]
-            block_end = block_df['Real_Time'].iloc[-1]
-            window_start = block_start
-
-            while window_start + window_size_td <= block_end:
-                window_end = window_start + window_size_td
-                window_df = block_df[(block_df['Real_Time'] >= window_start) & (block_df['Real_Time'] < window_end)]
-                if window_df.empty or window_df['Label_Tag'].nunique() != 1:
-                    window_start += stride_td
-                    continue
-
-                actual_duration = (window_df['Real_Time'].iloc[-1] - window_df['Real_Time'].iloc[0]).total_seconds()
-                if actual_duration < window_size * 0.8:
-                    window_start += stride_td
-                    continue
-
-                raw_label_str = str(window_df['Label_Tag'].iloc[-1]).strip()
-                try:
-                    raw_label = int(float(raw_label_str))
-                except ValueError:
-                    raw_label = raw_label_str
+        if fallback and df is None:
+            raise ValueError(f"Features that need the DataFrame cannot be computed from the sensor matrix: {fallback}")
+        if fallback:
+            per_window = [self.calculate_features(df.iloc[a:b], fallback) for a, b in zip(lo, hi)]
+            for feature_name in fallback:
+                extra[feature_name] = [window[feature_name] for window in per_window]
 
-                if raw_label not in self.label_mapping:
-                    class_name = self.ask_for_new_label_name(raw_label)
-                else:
-                    class_name = self.label_mapping[raw_label]
+        return names, output, extra
 
-                features = self.calculate_features(window_df, selected_features)
-                features['Real_Time'] = window_df['Real_Time'].iloc[0]
-                features['Label_Tag'] = class_name
-                output_data.append(features)
-                window_start += stride_td
+    def parallel_window_statistics(self, values, lo, hi, progress_callback=None):
+        """
+        Computes the window statistics in self.n_workers worker processes. The values are
+        copied once into a shared memory block that every worker attaches to, and the windows
+        are split into contiguous chunks (CHUNKS_PER_WORKER per worker) that may cut across
+        or group together continuous blocks. Each chunk's results are written back at its own
+        window offsets, so the output is in the same time order as the serial engine and,
+        with the "batched" engine, identical to it.
 
-        if output_data:
-            df_out = pd.DataFrame(output_data).round(2)
-            if 'Real_Time' in df_out.columns:
-                cols = df_out.columns.tolist()
-                cols.remove('Real_Time')
-                df_out = df_out[['Real_Time'] + cols]
-            return df_out
-        else:
-            return pd.DataFrame()
+        Parameters:
+          values: A (rows, columns) float array.
+          lo: Array with the first row index of each window.
+          hi: Array with the end row index (exclusive) of each window.
+          progress_callback: Optional callback called with (windows_done, total_windows) as
+            chunks complete.
+
+        Returns:
+          A dictionary mapping "Mean", "StdDev", "Min" and "Max" to (windows, columns) arrays.
+        """
+        values = np.ascontiguousarray(values)
+        stats = {name: np.empty((len(lo), values.shape[1])) for name in VECTORIZED_STATS.values()}
+        bounds = np.linspace(0, len(lo), min(len(lo), self.n_workers * CHUNKS_PER_WORKER) + 1).astype(np.int64)
+        buffer = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+        try:
+            np.ndarray(values.shape, dtype=values.dtype, buffer=buffer.buf)[:] = values
+            with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+                futures = {
+                    pool.submit(shared_window_statistics, buffer.name, values.shape, values.dtype,
+                                lo[start:end], hi[start:end], self.engine): (start, end)
+                    for start, end in zip(bounds[:-1], bounds[1:]) if end > start
+                }
+                windows_done = 0
+                for future in as_completed(futures):
+                    start, end = futures[future]
+                    for name, array in future.result().items():
+                        stats[name][start:end] = array
+                    windows_done += int(end - start)
+                    if progress_callback:
+                        progress_callback(windows_done, len(lo))
+        finally:
+            buffer.close()
+            buffer.unlink()
+        return stats
 
     def calculate_features(self, window_df, selected_features):
         """
@@ -414,13 +1153,17 @@ class DataProcessor:
                     features[feature_name] = np.nan
         return features
 
-    def save_output(self, output_data, output_path):
+    def save_output(self, output_data, output_path, append=False):
         """
-        Saves the processed sensor data with computed features to a CSV file.
+        Saves the processed sensor data with computed features to a CSV file, or to one of the
+        binary columnar formats of columnarStore when output_path has their extension.
 
         Parameters:
           output_data: List of dictionaries containing processed window data.
           output_path: File path where the output CSV should be saved.
+          append: If True, the rows are appended to an existing CSV with the same columns, and
+            the header is only written when the file is missing or empty. A binary file is
+            rewritten with the new rows added.
         """
         try:
             output_df = pd.DataFrame(output_data).round(2)
@@ -428,7 +1171,15 @@ class DataProcessor:
                 cols = output_df.columns.tolist()
                 cols.remove('Real_Time')
                 output_df = output_df[['Real_Time'] + cols]
-            output_df.to_csv(output_path, index=False, float_format='%.2f')
+            if is_columnar_file(output_path):
+                if append and os.path.isfile(output_path):
+                    output_df = pd.concat([read_table(output_path, memory_map=False), output_df], ignore_index=True)
+                write_table(output_df, output_path)
+            elif append:
+                header = not os.path.isfile(output_path) or os.path.getsize(output_path) == 0
+                output_df.to_csv(output_path, mode='a', header=header, index=False, float_format='%.2f')
+            else:
+                output_df.to_csv(output_path, index=False, float_format='%.2f')
             print(f"Output saved to {output_path}")
         except Exception as e:
             print(f"Error saving output CSV: {e}")
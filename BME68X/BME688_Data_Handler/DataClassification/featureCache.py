@@ -0,0 +1,204 @@
+# Import necessary libraries for hashing, file management and data handling
+import hashlib
+import json
+import os
+import threading
+import pandas as pd
+
+from dataProcessor import PROCESSOR_VERSION
+
+# Default directory of the on-disk feature cache, next to this module.
+FEATURE_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "feature_cache"
+)
+
+# Default upper bound on the total size of the cached feature matrices, in bytes.
+FEATURE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# File extension of the cache entries (pickled DataFrames).
+ENTRY_SUFFIX = ".pkl"
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """
+    Computes the SHA-256 digest of a file's contents, reading it in chunks so that large
+    logs are never held in memory at once.
+
+    Parameters:
+      path: Path of the file to hash.
+      chunk_size: Number of bytes read per step.
+
+    Returns:
+      The hexadecimal digest string.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class FeatureCache:
+    """
+    A content-addressed on-disk cache of extracted feature matrices. Entries are keyed by the
+    digest of the raw CSV file together with every parameter that affects the extracted
+    features, so a changed file or setting never returns stale features. The least recently
+    used entries are evicted once the cache grows beyond its size cap.
+    """
+    def __init__(self, cache_dir=FEATURE_CACHE_DIR, max_bytes=FEATURE_CACHE_MAX_BYTES):
+        """
+        Initializes the cache and creates its directory if needed.
+
+        Parameters:
+          cache_dir: Directory holding the cache entries.
+          max_bytes: Maximum total size of the entries in bytes; 0 disables caching.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        # File digests by (path, size, modification time), so an unchanged file is hashed once.
+        self.digests = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def raw_file_digest(self, raw_file):
+        """
+        Returns the content digest of a raw file, reusing the last digest while the file's size
+        and modification time are unchanged.
+
+        Parameters:
+          raw_file: Path of the raw CSV file.
+
+        Returns:
+          The hexadecimal digest string.
+        """
+        stat = os.stat(raw_file)
+        signature = (os.path.abspath(raw_file), stat.st_size, stat.st_mtime_ns)
+        digest = self.digests.get(signature)
+        if digest is None:
+            digest = file_digest(raw_file)
+            self.digests[signature] = digest
+        return digest
+
+    def make_key(self, raw_file, processor, window_size, stride, selected_features, data_interval=None, gap_threshold=None):
+        """
+        Builds the cache key of a feature extraction run.
+
+        Parameters:
+          raw_file: Path of the raw CSV file.
+          processor: The DataProcessor performing the extraction; its engine, sensor settings
+            and label mapping are part of the key.
+          window_size: The duration (in seconds) of each sliding window.
+          stride: The step (in seconds) by which the window moves.
+          selected_features: List of feature names to compute.
+          data_interval: Optional expected interval between data points.
+          gap_threshold: Optional maximum gap (in seconds) allowed to consider data continuous.
+
+        Returns:
+          A hexadecimal key string.
+        """
+        interval = data_interval if data_interval is not None else processor.data_interval
+        params = {
+            "raw_digest": self.raw_file_digest(raw_file),
+            "window_size": window_size,
+            "stride": stride,
+            "gap_threshold": gap_threshold if gap_threshold is not None else interval * 3,
+            "features": list(selected_features),
+            "processor_version": PROCESSOR_VERSION,
+            "engine": processor.engine,
+            "sensor_dtype": str(processor.sensor_dtype),
+            "sensor_count": processor.sensor_count,
+            "labels": sorted((str(raw), name) for raw, name in processor.label_mapping.items()),
+        }
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+    def entry_path(self, key):
+        """
+        Returns the file path of the cache entry for a key.
+        """
+        return os.path.join(self.cache_dir, key + ENTRY_SUFFIX)
+
+    def load(self, key):
+        """
+        Loads a cached feature matrix and marks it as recently used.
+
+        Parameters:
+          key: Key returned by make_key.
+
+        Returns:
+          The cached DataFrame, or None if there is no usable entry for the key.
+        """
+        path = self.entry_path(key)
+        with self.lock:
+            if not os.path.isfile(path):
+                return None
+            try:
+                df = pd.read_pickle(path)
+                os.utime(path)
+                return df
+            except Exception as e:
+                print(f"Discarding unreadable feature cache entry {path}: {e}")
+                self.remove(path)
+                return None
+
+    def store(self, key, df):
+        """
+        Saves a feature matrix under a key, then evicts the least recently used entries while
+        the cache is over its size cap. The entry is written to a temporary file first, so a
+        concurrent reader never sees a partial entry.
+
+        Parameters:
+          key: Key returned by make_key.
+          df: The DataFrame of extracted features.
+        """
+        if self.max_bytes <= 0:
+            return
+        path = self.entry_path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self.lock:
+            try:
+                df.to_pickle(temp_path)
+                os.replace(temp_path, path)
+            except Exception as e:
+                print(f"Could not write feature cache entry {path}: {e}")
+                self.remove(temp_path)
+                return
+            self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the total size is within max_bytes.
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(ENTRY_SUFFIX):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self.remove(path)
+            total -= size
+
+    def clear(self):
+        """
+        Removes every entry from the cache.
+        """
+        with self.lock:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(ENTRY_SUFFIX):
+                    self.remove(os.path.join(self.cache_dir, name))
+
+    @staticmethod
+    def remove(path):
+        """
+        Deletes a cache file, ignoring files that are already gone.
+        """
+        try:
+            os.remove(path)
+        except OSError:
+            pass
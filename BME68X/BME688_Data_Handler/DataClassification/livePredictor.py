@@ -0,0 +1,125 @@
+# Import necessary libraries for classifying live sensor samples
+import os
+import sys
+import time
+from collections import deque
+from statistics import mode
+import numpy as np
+import pandas as pd
+from streamingFeatures import StreamingFeatureExtractor
+# Shared modules live in the parent BME688_Data_Handler directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from compiledForest import compile_model
+
+class LivePredictor:
+    """
+    The real-time prediction path: window features are updated with every received line,
+    every completed window is classified right away, and the current prediction is the
+    majority vote of the window predictions made during the last vote_length seconds.
+
+    It is used by the real-time section of the Model Trainer GUI and by the replay harness,
+    so that recorded logs are classified by exactly the same code as live data.
+
+    Forest classifiers are flattened into a CompiledForest (compiledForest.py), which makes the
+    same predictions as the model's predict without its per-call overhead. Other models, and
+    forests trained on other columns than the feature stream's, use the model's predict.
+    """
+    def __init__(self, model, label_encoder, feature_stream, vote_length, metrics=None, use_compiled=True):
+        """
+        Parameters:
+          model: The trained classifier.
+          label_encoder: The LabelEncoder saved with the model.
+          feature_stream: The StreamingFeatureExtractor that turns lines into window features.
+          vote_length: Seconds of window predictions that take part in the vote.
+          metrics: Optional pipelineMetrics.PipelineMetrics that receives the durations of the
+            predict and line_total stages and the lines and predictions counters. It is also
+            passed on to feature_stream.
+          use_compiled: If False, the model's own predict is always used.
+        """
+        self.model = model
+        self.label_encoder = label_encoder
+        self.feature_stream = feature_stream
+        self.vote_length = vote_length
+        self.metrics = metrics
+        self.compiled = compile_model(model, feature_stream.names) if use_compiled else None
+        if metrics is not None:
+            feature_stream.metrics = metrics
+        # (arrival time, predicted class) of the windows classified during the last vote length.
+        self.recent_predictions = deque()
+
+    @classmethod
+    def from_settings(cls, processor, model, label_encoder, window_length, stride, vote_length, min_sample_interval, metrics=None, use_compiled=True):
+        """
+        Creates a predictor with a StreamingFeatureExtractor computing all features of processor.
+
+        Raises:
+          ValueError: If a feature cannot be computed incrementally.
+        """
+        feature_stream = StreamingFeatureExtractor(
+            processor, window_length, stride, list(processor.features.keys()),
+            min_sample_interval=min_sample_interval
+        )
+        return cls(model, label_encoder, feature_stream, vote_length, metrics=metrics, use_compiled=use_compiled)
+
+    def classify(self, feature_rows, now):
+        """
+        Classifies feature vectors of completed windows and adds them to the vote.
+
+        Parameters:
+          feature_rows: List of feature arrays in the order of feature_stream.names.
+          now: Arrival time (in seconds) recorded for the predictions; predictions older than
+            vote_length seconds leave the vote.
+
+        Returns:
+          The list of predicted class names.
+        """
+        if self.compiled is not None:
+            features = np.asarray(feature_rows, dtype=np.float64)
+            start = time.perf_counter()
+            predicted = self.compiled.predict(features)
+        else:
+            features_df = pd.DataFrame(feature_rows, columns=self.feature_stream.names)
+            start = time.perf_counter()
+            predicted = self.model.predict(features_df)
+        if self.metrics is not None:
+            self.metrics.record("predict", time.perf_counter() - start)
+            self.metrics.count("predictions", len(feature_rows))
+        predictions = list(self.label_encoder.inverse_transform(predicted))
+        for prediction in predictions:
+            self.recent_predictions.append((now, prediction))
+        while self.recent_predictions and now - self.recent_predictions[0][0] > self.vote_length:
+            self.recent_predictions.popleft()
+        return predictions
+
+    def handle_line(self, line, now=None):
+        """
+        Adds one received line and classifies the windows it completes.
+
+        Parameters:
+          line: The stripped line, with or without the leading Real_Time field.
+          now: Arrival time of the line in seconds; defaults to time.time().
+
+        Returns:
+          The list of class names predicted for the completed windows, usually empty or one.
+        """
+        start = time.perf_counter()
+        now = time.time() if now is None else now
+        completed = self.feature_stream.append_line(line)
+        predictions = self.classify([features for _, _, features in completed], now) if completed else []
+        if self.metrics is not None:
+            self.metrics.record("line_total", time.perf_counter() - start)
+            self.metrics.count("lines")
+        return predictions
+
+    def vote(self):
+        """
+        Returns the majority vote of the recent window predictions, or None without any.
+        """
+        vote_list = [prediction for _, prediction in self.recent_predictions]
+        if not vote_list:
+            return None
+        try:
+            return mode(vote_list)
+        except Exception:
+            values, counts = np.unique(vote_list, return_counts=True)
+            return values[np.argmax(counts)]
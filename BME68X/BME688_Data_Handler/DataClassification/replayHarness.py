@@ -0,0 +1,263 @@
+# Import necessary libraries for replaying recorded logs through the real-time prediction path
+import argparse
+import csv
+import os
+import sys
+import time
+import numpy as np
+from joblib import load
+from dataProcessor import DataProcessor
+from columnarStore import read_table
+from livePredictor import LivePredictor
+from sampleBuffer import parse_float, parse_real_time
+# Shared modules live in the parent BME688_Data_Handler directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipelineMetrics import PipelineMetrics, format_snapshot, write_metrics
+
+# Longest pause (in seconds of recorded time) reproduced between two replayed lines; longer
+# gaps in a log (e.g. between recording sessions) are shortened to this.
+REPLAY_MAX_GAP = 10.0
+
+# Lag (in seconds) behind the replay schedule beyond which a paced replay counts as falling
+# behind.
+REPLAY_LAG_TOLERANCE = 0.5
+
+# Default real-time settings, as in the Model Trainer GUI.
+REPLAY_WINDOW_LENGTH = 10
+REPLAY_STRIDE = 1
+REPLAY_VOTE_LENGTH = 12
+REPLAY_MIN_SAMPLE_INTERVAL = 0.01
+
+def read_log_lines(path):
+    """
+    Returns the header fields and data lines of a recorded log. CSV files are read as text, so
+    the lines reach the predictor exactly as logged; the binary columnar formats are converted
+    to CSV lines first.
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, newline="") as f:
+            lines = [line.rstrip("\r\n") for line in f]
+    else:
+        lines = read_table(path).to_csv(index=False).splitlines()
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+        raise ValueError(f"{path} is empty.")
+    header = next(csv.reader([lines[0]]))
+    return header, lines[1:]
+
+def recorded_offsets(header, rows, max_gap=REPLAY_MAX_GAP):
+    """
+    Returns the recorded time of every line in seconds since the first line, with gaps longer
+    than max_gap shortened. The device's Timestamp_ms is used where it increases (it has
+    millisecond resolution), and Real_Time otherwise (e.g. after a board reset).
+
+    Parameters:
+      header: The header fields of the log.
+      rows: The lines of the log, split into fields.
+      max_gap: Longest gap (in seconds) kept between two lines.
+    """
+    timestamp_index = header.index("Timestamp_ms") if "Timestamp_ms" in header else None
+    real_time_index = header.index("Real_Time") if "Real_Time" in header else None
+    offsets = np.zeros(len(rows))
+    previous_ms = previous_time = None
+    for i, fields in enumerate(rows):
+        timestamp_ms = parse_float(fields[timestamp_index]) if timestamp_index is not None else np.nan
+        real_time = parse_real_time(fields[real_time_index]) if real_time_index is not None else np.datetime64("NaT")
+        delta = np.nan
+        if previous_ms is not None and timestamp_ms >= previous_ms:
+            delta = (timestamp_ms - previous_ms) / 1000.0
+        elif previous_time is not None and not np.isnat(real_time) and real_time >= previous_time:
+            delta = (real_time - previous_time) / np.timedelta64(1, "s")
+        if i:
+            offsets[i] = offsets[i - 1] + (min(delta, max_gap) if not np.isnan(delta) else 0.0)
+        previous_ms = timestamp_ms if not np.isnan(timestamp_ms) else None
+        previous_time = real_time if not np.isnat(real_time) else None
+    return offsets
+
+class ReplayReport:
+    """
+    Measurements of one replay.
+
+    Attributes:
+      lines: Number of replayed lines.
+      predictions: Number of classified windows.
+      recorded_seconds: Recorded time covered by the replayed lines (gaps shortened).
+      wall_seconds: Duration of the replay.
+      busy_seconds: Time spent in the prediction path.
+      latencies: Seconds from the scheduled arrival of each window-completing line until its
+        predictions were available.
+      max_lag: Largest delay (in seconds) of a line behind its scheduled arrival.
+      speed: Requested speed-up, or None for as fast as possible.
+    """
+    def __init__(self, lines, predictions, recorded_seconds, wall_seconds, busy_seconds, latencies, max_lag, speed):
+        self.lines = lines
+        self.predictions = predictions
+        self.recorded_seconds = recorded_seconds
+        self.wall_seconds = wall_seconds
+        self.busy_seconds = busy_seconds
+        self.latencies = np.asarray(latencies)
+        self.max_lag = max_lag
+        self.speed = speed
+
+    @property
+    def lines_per_second(self):
+        return self.lines / self.wall_seconds if self.wall_seconds > 0 else float("inf")
+
+    @property
+    def achieved_speedup(self):
+        """
+        Recorded seconds replayed per wall-clock second.
+        """
+        return self.recorded_seconds / self.wall_seconds if self.wall_seconds > 0 else float("inf")
+
+    @property
+    def sustainable_speedup(self):
+        """
+        Highest speed-up the prediction path can keep up with: recorded seconds per second
+        spent processing. Faster replays queue lines faster than they are handled.
+        """
+        return self.recorded_seconds / self.busy_seconds if self.busy_seconds > 0 else float("inf")
+
+    @property
+    def fell_behind(self):
+        return self.speed is not None and self.max_lag > REPLAY_LAG_TOLERANCE
+
+    def latency_percentiles(self, percentiles=(50, 90, 99, 100)):
+        """
+        Returns {percentile: latency in milliseconds} of the prediction latencies.
+        """
+        if not len(self.latencies):
+            return {}
+        return dict(zip(percentiles, np.percentile(self.latencies * 1000.0, percentiles)))
+
+    def summary(self):
+        """
+        Returns the report as printable text.
+        """
+        speed = "as fast as possible" if self.speed is None else f"{self.speed:g}x"
+        latencies = ", ".join(f"p{p:g} {value:.2f} ms" for p, value in self.latency_percentiles().items()) or "no predictions"
+        lines = [
+            f"Replayed {self.lines} lines ({self.recorded_seconds:.1f} s recorded) in {self.wall_seconds:.2f} s at {speed}.",
+            f"Throughput: {self.lines_per_second:.1f} lines/s, {self.achieved_speedup:.1f}x recorded time.",
+            f"Predictions: {self.predictions}; latency {latencies}.",
+            f"Sustainable speed-up: {self.sustainable_speedup:.1f}x (prediction path busy {self.busy_seconds:.2f} s).",
+        ]
+        if self.speed is not None:
+            status = "fell behind" if self.fell_behind else "kept up"
+            lines.append(f"Maximum lag behind schedule: {self.max_lag * 1000.0:.1f} ms ({status}).")
+        return "\n".join(lines)
+
+class ReplayHarness:
+    """
+    Streams a recorded log through the real-time prediction path (LivePredictor) in place of a
+    serial port, at the recorded pace (speed 1), N times faster, or as fast as possible.
+
+    Raw logs are fed line by line to LivePredictor.handle_line, like lines received by the
+    GUI. Processed feature files (with Real_Time and feature columns but no Timestamp_ms) skip
+    feature extraction: each row is one window and goes straight to LivePredictor.classify.
+    The predictor's vote uses recorded time, so a replay votes over the same windows as the
+    live session did.
+    """
+    def __init__(self, predictor, max_gap=REPLAY_MAX_GAP, on_prediction=None):
+        """
+        Parameters:
+          predictor: The LivePredictor to feed.
+          max_gap: Longest pause (in recorded seconds) reproduced between two lines.
+          on_prediction: Optional callback called with (recorded offset, vote) after every
+            line that completed a window.
+        """
+        self.predictor = predictor
+        self.max_gap = max_gap
+        self.on_prediction = on_prediction
+
+    def feature_rows(self, header, rows):
+        """
+        Returns the feature arrays of the rows of a processed feature file, in the order of the
+        predictor's feature names.
+        """
+        missing = [name for name in self.predictor.feature_stream.names if name not in header]
+        if missing:
+            raise ValueError(f"The feature file lacks {len(missing)} model features, e.g. {missing[0]}.")
+        indices = [header.index(name) for name in self.predictor.feature_stream.names]
+        return [np.array([parse_float(fields[i]) for i in indices]) for fields in rows]
+
+    def run(self, path, speed=1.0, limit=None):
+        """
+        Replays a log and returns a ReplayReport.
+
+        Parameters:
+          path: Raw log or processed feature file (CSV or a binary columnar format).
+          speed: Speed-up over the recorded pace, or None to replay as fast as possible.
+          limit: Optional maximum number of lines to replay.
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("Speed must be greater than zero.")
+        header, lines = read_log_lines(path)
+        if limit is not None:
+            lines = lines[:limit]
+        rows = [next(csv.reader([line])) for line in lines]
+        offsets = recorded_offsets(header, rows, self.max_gap)
+        features = None if "Timestamp_ms" in header else self.feature_rows(header, rows)
+
+        latencies = []
+        predictions = 0
+        busy = 0.0
+        max_lag = 0.0
+        start = time.perf_counter()
+        for i, line in enumerate(lines):
+            if speed is None:
+                due = time.perf_counter()
+            else:
+                due = start + offsets[i] / speed
+                wait = due - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+            begin = time.perf_counter()
+            max_lag = max(max_lag, begin - due)
+            if features is None:
+                predicted = self.predictor.handle_line(line, now=offsets[i])
+            else:
+                predicted = self.predictor.classify([features[i]], offsets[i])
+            end = time.perf_counter()
+            busy += end - begin
+            if predicted:
+                predictions += len(predicted)
+                latencies.append(end - due)
+                if self.on_prediction is not None:
+                    self.on_prediction(offsets[i], self.predictor.vote())
+        wall = time.perf_counter() - start
+        recorded = float(offsets[-1]) if len(offsets) else 0.0
+        return ReplayReport(len(lines), predictions, recorded, wall, busy, latencies, max_lag, speed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded log through the real-time prediction path.")
+    parser.add_argument("log", help="Raw log or processed feature file.")
+    parser.add_argument("--model", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_classifier_model.joblib"), help="Trained model file.")
+    parser.add_argument("--speed", default="max", help="Speed-up over the recorded pace (e.g. 1, 10), or 'max'.")
+    parser.add_argument("--window", type=int, default=REPLAY_WINDOW_LENGTH, help="Window length in seconds.")
+    parser.add_argument("--stride", type=int, default=REPLAY_STRIDE, help="Stride in seconds.")
+    parser.add_argument("--vote-length", type=float, default=REPLAY_VOTE_LENGTH, help="Vote length in seconds.")
+    parser.add_argument("--max-gap", type=float, default=REPLAY_MAX_GAP, help="Longest recorded gap reproduced, in seconds.")
+    parser.add_argument("--limit", type=int, help="Replay only the first N lines.")
+    parser.add_argument("--show", action="store_true", help="Print the vote after every prediction.")
+    parser.add_argument("--sklearn", action="store_true", help="Use the model's own predict instead of the compiled forest.")
+    parser.add_argument("--metrics", help="Append the per-stage timings to this file (.csv, or JSON Lines otherwise).")
+    args = parser.parse_args()
+
+    speed = None if args.speed.lower() == "max" else float(args.speed)
+    model, label_encoder = load(args.model)
+    metrics = PipelineMetrics()
+    predictor = LivePredictor.from_settings(
+        DataProcessor(interactive=False), model, label_encoder, args.window, args.stride, args.vote_length,
+        min_sample_interval=REPLAY_MIN_SAMPLE_INTERVAL, metrics=metrics, use_compiled=not args.sklearn
+    )
+    on_prediction = (lambda offset, vote: print(f"{offset:10.1f} s  {vote}")) if args.show else None
+    report = ReplayHarness(predictor, max_gap=args.max_gap, on_prediction=on_prediction).run(args.log, speed=speed, limit=args.limit)
+    print(report.summary())
+    snapshot = metrics.snapshot()
+    print(format_snapshot(snapshot))
+    if args.metrics:
+        write_metrics(args.metrics, snapshot)
+
+if __name__ == "__main__":
+    main()
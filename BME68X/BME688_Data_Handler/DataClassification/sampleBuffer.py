@@ -0,0 +1,145 @@
+# Import necessary libraries for buffering real-time sensor samples
+import csv
+import datetime
+import numpy as np
+import pandas as pd
+from dataProcessor import SENSOR_MEASUREMENTS
+
+# Number of columns that precede the sensor measurements in a logged line, after Real_Time:
+# Timestamp_ms, Label_Tag and HeaterProfile_ID.
+METADATA_COLUMNS = 3
+
+def parse_float(text):
+    """
+    Converts one field to float, returning NaN for fields that are not numbers (e.g. "N/A").
+    """
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+def parse_real_time(text):
+    """
+    Converts a Real_Time field to datetime64[ns], returning NaT if it cannot be parsed.
+    The "%Y-%m-%d %H:%M:%S" format of the Data Logger GUI is parsed directly by NumPy;
+    anything else goes through pandas, as with pd.to_datetime(errors='coerce').
+    """
+    try:
+        return np.datetime64(text, 'ns')
+    except ValueError:
+        pass
+    try:
+        return np.datetime64(pd.Timestamp(text).tz_localize(None), 'ns')
+    except (ValueError, TypeError):
+        return np.datetime64('NaT', 'ns')
+
+class SampleRingBuffer:
+    """
+    Fixed-capacity buffer of the most recent sensor samples, used by the real-time prediction
+    loop instead of one-row DataFrames. The samples are parsed straight from the serial lines
+    into preallocated NumPy arrays. Every sample is written twice, at slot i and
+    i + capacity, so the latest samples always form one contiguous slice and latest() returns
+    views without copying. When the buffer is full, the oldest sample is overwritten.
+    """
+    def __init__(self, capacity, sensor_count=8):
+        """
+        Allocates the arrays for capacity samples of sensor_count sensors.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.capacity = capacity
+        self.sensor_count = sensor_count
+        self.sensor_columns = sensor_count * len(SENSOR_MEASUREMENTS)
+        # A line holds Real_Time (optional), the metadata columns and the sensor columns.
+        self.column_count = 1 + METADATA_COLUMNS + self.sensor_columns
+        self.real_time = np.full(2 * capacity, np.datetime64('NaT'), dtype='datetime64[ns]')
+        self.timestamp_ms = np.full(2 * capacity, np.nan)
+        self.heater_profile = np.full(2 * capacity, np.nan)
+        self.label_tags = np.empty(2 * capacity, dtype=object)
+        self.sensors = np.full((2 * capacity, sensor_count, len(SENSOR_MEASUREMENTS)), np.nan)
+        # Flat (rows, sensors * measurements) view of self.sensors that a parsed row is assigned to.
+        self.sensor_rows = self.sensors.reshape(2 * capacity, self.sensor_columns)
+        self.position = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def clear(self):
+        """
+        Discards all samples. The arrays are kept for reuse.
+        """
+        self.position = 0
+        self.size = 0
+
+    def append_line(self, line, real_time=None):
+        """
+        Parses one CSV line in the raw log layout and stores it as the newest sample.
+        Lines without the leading Real_Time field are stamped with real_time, or with the
+        current local time truncated to whole seconds like the timestamps of the logged files.
+
+        Parameters:
+          line: The stripped line received from the device.
+          real_time: Optional datetime64 used for lines without a Real_Time field.
+
+        Returns:
+          True if the line was stored, False if it does not have the expected number of fields.
+        """
+        parsed = self.split_line(line, real_time)
+        if parsed is None:
+            return False
+        self.append_fields(*parsed)
+        return True
+
+    def split_line(self, line, real_time=None):
+        """
+        Splits a line into fields and determines its time, the first half of append_line.
+
+        Returns:
+          A tuple (fields, offset, real_time) for append_fields, where offset is 1 if the line
+          starts with Real_Time, or None if the line does not have the expected number of fields.
+        """
+        fields = line.split(',') if '"' not in line else next(csv.reader([line]), [])
+        if len(fields) == self.column_count - 1:
+            if real_time is None:
+                real_time = np.datetime64(datetime.datetime.now().replace(microsecond=0), 'ns')
+            return fields, 0, real_time
+        if len(fields) == self.column_count:
+            return fields, 1, parse_real_time(fields[0])
+        return None
+
+    def append_fields(self, fields, offset, real_time):
+        """
+        Stores the fields of a line split by split_line as the newest sample.
+        """
+        sensor_fields = fields[offset + METADATA_COLUMNS:]
+        slot = self.position
+        mirror = slot + self.capacity
+        try:
+            # NumPy parses numeric strings on assignment; fall back to per-field parsing
+            # when a field (e.g. "N/A" or a hex status) is not a number.
+            self.sensor_rows[slot] = sensor_fields
+        except ValueError:
+            self.sensor_rows[slot] = [parse_float(field) for field in sensor_fields]
+        self.sensor_rows[mirror] = self.sensor_rows[slot]
+        self.real_time[slot] = self.real_time[mirror] = real_time
+        self.timestamp_ms[slot] = self.timestamp_ms[mirror] = parse_float(fields[offset])
+        self.label_tags[slot] = self.label_tags[mirror] = fields[offset + 1]
+        self.heater_profile[slot] = self.heater_profile[mirror] = parse_float(fields[offset + 2])
+
+        self.position = (slot + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def latest(self, count=None):
+        """
+        Returns views of the newest count samples (all buffered samples by default), oldest
+        first. StreamingFeatureExtractor reads its windows from them.
+
+        Returns:
+          A tuple (real_time, label_tags, sensors) of array views into the buffer. They stay
+          valid until count more samples have been appended.
+        """
+        count = self.size if count is None else min(count, self.size)
+        end = self.position + self.capacity
+        rows = slice(end - count, end)
+        return self.real_time[rows], self.label_tags[rows], self.sensors[rows]
@@ -0,0 +1,307 @@
+# Import necessary libraries for per-sample feature extraction in real time
+import time
+import numpy as np
+import pandas as pd
+from dataProcessor import SENSOR_MEASUREMENTS, VECTORIZED_STATS, normalize_label
+from sampleBuffer import SampleRingBuffer
+
+class StreamingFeatureExtractor:
+    """
+    Computes window features sample by sample for live classification, so that a feature
+    vector is available as soon as a window is complete instead of once per batch.
+
+    Windows follow the layout of DataProcessor.extract_windows: within a continuous block they
+    start every `stride` seconds from the block's first sample, cover [start, start +
+    window_size), and are complete once a sample at or after their end arrives. Windows with
+    more than one label or covering less than 80% of window_size are skipped.
+
+    The samples of the current window are kept in a SampleRingBuffer. Mean and StdDev come from
+    running sums that are updated as samples are added and evicted. The sums are taken around a
+    per-column shift to limit cancellation, and they are recomputed exactly once per window
+    turnover so that rounding errors cannot accumulate. Min and Max use a two-stack queue:
+    running minima/maxima of the newest samples, plus suffix minima/maxima of the oldest ones
+    that are rebuilt from the buffer when they run out. Every sample therefore costs O(1)
+    amortized, whatever the window length.
+    """
+    def __init__(self, processor, window_size, stride, selected_features, data_interval=None, gap_threshold=None, min_sample_interval=0.01, metrics=None):
+        """
+        Parameters:
+          processor: The DataProcessor whose feature functions and labels are used.
+          window_size: The duration (in seconds) of each sliding window.
+          stride: The step (in seconds) by which the window moves.
+          selected_features: Feature names to compute. They must be statistics created by
+            get_feature_functions.
+          data_interval: Optional expected interval between data points.
+          gap_threshold: Optional maximum gap (in seconds) allowed to consider data continuous.
+          min_sample_interval: Shortest expected interval (in seconds) between samples, used to
+            size the sample buffer for one window.
+          metrics: Optional pipelineMetrics.PipelineMetrics that receives the durations of the
+            line_parse, buffer_append and feature_extraction stages of every line.
+        """
+        if stride <= 0:
+            raise ValueError("Stride must be greater than zero.")
+        self.processor = processor
+        self.metrics = metrics
+        self.window_size = window_size
+        self.window_ns = pd.Timedelta(seconds=window_size).value
+        self.stride_ns = pd.Timedelta(seconds=stride).value
+        current_data_interval = data_interval if data_interval is not None else processor.data_interval
+        gap_seconds = current_data_interval * 3 if gap_threshold is None else gap_threshold
+        self.gap_ns = pd.Timedelta(seconds=gap_seconds).value
+
+        # Map each feature to its column of the flattened (sensors * measurements) sample row.
+        positions = {
+            f'Sensor{sensor_num + 1}_{suffix}': sensor_num * len(SENSOR_MEASUREMENTS) + measurement
+            for sensor_num in range(processor.sensor_count)
+            for measurement, suffix in enumerate(SENSOR_MEASUREMENTS)
+        }
+        self.names = [name for name in selected_features if processor.features.get(name)]
+        feature_positions, feature_stats = [], []
+        for name in self.names:
+            feature_func = processor.features[name]
+            position = positions.get(getattr(feature_func, 'column', None))
+            stat = VECTORIZED_STATS.get(getattr(feature_func, 'func', None))
+            if position is None or stat is None:
+                raise ValueError(f"Feature {name} cannot be computed incrementally.")
+            feature_positions.append(position)
+            feature_stats.append(stat)
+        self.used = sorted(set(feature_positions))
+        column_index = {position: i for i, position in enumerate(self.used)}
+        self.feature_columns = feature_columns = np.array([column_index[position] for position in feature_positions], dtype=np.int64)
+        feature_stats = np.array(feature_stats)
+        # For each statistic, the feature indices it fills and the columns they read.
+        self.stat_groups = [
+            (stat, np.flatnonzero(feature_stats == stat), feature_columns[feature_stats == stat])
+            for stat in VECTORIZED_STATS.values() if (feature_stats == stat).any()
+        ]
+
+        capacity = int(np.ceil(window_size / min_sample_interval)) + 2
+        self.buffer = SampleRingBuffer(capacity, sensor_count=processor.sensor_count)
+        self.class_names = {}
+        self.reset()
+
+    def reset(self):
+        """
+        Discards the current window, e.g. after a gap in the data. The next sample starts a
+        new block.
+        """
+        column_count = len(self.used)
+        self.window_start = None
+        self.last_time = None
+        self.rows = 0
+        # True while the newest buffered sample has not been added to the window yet.
+        self.pending = False
+        self.label_counts = {}
+        self.shift = np.zeros(column_count)
+        self.sums = np.zeros(column_count)
+        self.squares = np.zeros(column_count)
+        self.counts = np.zeros(column_count)
+        # Two-stack min/max queue: suffix minima/maxima of the oldest front_rows samples, with
+        # front_pos marking the oldest one still in the window, and running minima/maxima of
+        # the samples added since the front was last rebuilt.
+        self.front_min = np.empty((0, column_count))
+        self.front_max = np.empty((0, column_count))
+        self.front_pos = 0
+        self.back_min = np.full(column_count, np.nan)
+        self.back_max = np.full(column_count, np.nan)
+
+    def window(self):
+        """
+        Returns views (real_time, label_tags, sensors) of the samples in the window, oldest
+        first. They are the newest samples of the buffer, apart from a pending one.
+        """
+        real_time, label_tags, sensors = self.buffer.latest(self.rows + self.pending)
+        end = self.rows
+        return real_time[:end], label_tags[:end], sensors[:end]
+
+    def window_values(self, count=None):
+        """
+        Returns a (count, columns) array of the used columns of the oldest count samples of
+        the window (all of them by default), oldest first.
+        """
+        _, _, sensors = self.window()
+        count = self.rows if count is None else count
+        return sensors[:count].reshape(count, -1)[:, self.used]
+
+    def add_sample(self, values, label):
+        """
+        Adds the newest sample to the running statistics.
+        """
+        valid = ~np.isnan(values)
+        if self.rows == 0:
+            self.shift = np.where(valid, values, 0.0)
+            self.sums.fill(0.0)
+            self.squares.fill(0.0)
+            self.counts.fill(0.0)
+        centred = np.where(valid, values - self.shift, 0.0)
+        self.sums += centred
+        self.squares += centred * centred
+        self.counts += valid
+        np.fmin(self.back_min, values, out=self.back_min)
+        np.fmax(self.back_max, values, out=self.back_max)
+        self.label_counts[label] = self.label_counts.get(label, 0) + 1
+        self.rows += 1
+
+    def evict_oldest(self, values, label):
+        """
+        Removes the oldest sample of the window from the running statistics.
+        """
+        if self.front_pos == len(self.front_min):
+            self.rebuild_front()
+        valid = ~np.isnan(values)
+        centred = np.where(valid, values - self.shift, 0.0)
+        self.sums -= centred
+        self.squares -= centred * centred
+        self.counts -= valid
+        self.front_pos += 1
+        self.label_counts[label] -= 1
+        if not self.label_counts[label]:
+            del self.label_counts[label]
+        self.rows -= 1
+
+    def rebuild_front(self):
+        """
+        Moves all samples of the window to the front stack of the min/max queue. At this point
+        the window holds exactly the samples added since the last rebuild, so the running sums
+        are also recomputed from them around their mean.
+        """
+        values = self.window_values()
+        reversed_values = values[::-1]
+        self.front_min = np.fmin.accumulate(reversed_values, axis=0)[::-1]
+        self.front_max = np.fmax.accumulate(reversed_values, axis=0)[::-1]
+        self.front_pos = 0
+        self.back_min.fill(np.nan)
+        self.back_max.fill(np.nan)
+        missing = np.isnan(values)
+        self.counts = (~missing).sum(axis=0).astype(np.float64)
+        filled = np.where(missing, 0.0, values)
+        self.shift = filled.sum(axis=0) / np.maximum(self.counts, 1)
+        centred = np.where(missing, 0.0, values - self.shift)
+        self.sums = centred.sum(axis=0)
+        self.squares = (centred * centred).sum(axis=0)
+
+    def evict_before(self, start):
+        """
+        Evicts the samples older than start (in nanoseconds) from the window.
+        """
+        times, _, _ = self.window()
+        self.evict_rows(int(np.searchsorted(times.view(np.int64), start, side='left')))
+
+    def evict_rows(self, count):
+        """
+        Evicts the oldest count samples from the window.
+        """
+        if count == 0:
+            return
+        _, labels, _ = self.window()
+        labels = labels[:count].copy()
+        rows = self.window_values(count)
+        for index in range(count):
+            self.evict_oldest(rows[index], labels[index])
+
+    def current_features(self):
+        """
+        Returns the feature vector of the current window, or None if the window is skipped.
+
+        Returns:
+          A tuple (real_time, label, features) with the time of the window's first sample, its
+          class name and a float array of the features in the order of self.names, rounded to
+          two decimals like the output of process_batch.
+        """
+        if self.rows == 0 or len(self.label_counts) != 1:
+            return None
+        times, labels, _ = self.window()
+        first, last = times[0], times[-1]
+        if (last - first).astype(np.int64) / 1e9 < self.window_size * 0.8:
+            return None
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.sums / self.counts
+            variance = np.maximum(self.squares / self.counts - mean * mean, 0.0)
+        front = self.front_pos < len(self.front_min)
+        minimum = np.fmin(self.front_min[self.front_pos], self.back_min) if front else self.back_min
+        maximum = np.fmax(self.front_max[self.front_pos], self.back_max) if front else self.back_max
+        std = np.sqrt(variance)
+        # Constant readings have no spread, as in rolling_window_statistics.
+        std[minimum == maximum] = 0.0
+        stats = {"Mean": mean + self.shift, "StdDev": std, "Min": minimum, "Max": maximum}
+        empty = self.counts == 0
+
+        features = np.empty(len(self.names))
+        for stat, indices, columns in self.stat_groups:
+            features[indices] = stats[stat][columns]
+        features[empty[self.feature_columns]] = np.nan
+
+        raw_label = labels[-1]
+        if raw_label not in self.class_names:
+            self.class_names[raw_label] = self.processor.resolve_labels([normalize_label(raw_label)])[0]
+        return pd.Timestamp(first), self.class_names[raw_label], np.round(features, 2)
+
+    def append_line(self, line, real_time=None):
+        """
+        Adds one raw log line (see SampleRingBuffer.append_line) and returns the features of
+        every window completed by it, usually none or one.
+
+        Returns:
+          A list of (real_time, label, features) tuples as returned by current_features.
+        """
+        if self.rows >= self.buffer.capacity:
+            # Sampling faster than min_sample_interval: the oldest sample would be overwritten,
+            # so it leaves the window early.
+            self.evict_rows(1)
+        metrics = self.metrics
+        if metrics is None:
+            if not self.buffer.append_line(line, real_time=real_time):
+                return []
+            return self.add_latest_sample()
+        start = time.perf_counter()
+        parsed = self.buffer.split_line(line, real_time)
+        parsed_at = time.perf_counter()
+        metrics.record("line_parse", parsed_at - start)
+        if parsed is None:
+            return []
+        self.buffer.append_fields(*parsed)
+        appended_at = time.perf_counter()
+        metrics.record("buffer_append", appended_at - parsed_at)
+        completed = self.add_latest_sample()
+        metrics.record("feature_extraction", time.perf_counter() - appended_at)
+        return completed
+
+    def add_latest_sample(self):
+        """
+        Adds the newest buffered sample to the window statistics and returns the features of
+        the windows it completes (see append_line).
+        """
+        self.pending = True
+        times, labels, sensors = self.buffer.latest(1)
+        if np.isnat(times[0]):
+            # A sample without a usable time cannot be placed in a window.
+            self.reset()
+            return []
+        time_ns = int(times[0].astype(np.int64))
+        if self.last_time is not None and (time_ns < self.last_time or time_ns - self.last_time > self.gap_ns):
+            self.reset()
+
+        completed = []
+        if self.window_start is None:
+            self.window_start = time_ns
+        while self.window_start + self.window_ns <= time_ns:
+            features = self.current_features()
+            if features is not None:
+                completed.append(features)
+            self.window_start += self.stride_ns
+            self.evict_before(self.window_start)
+
+        self.add_sample(sensors[0].reshape(-1)[self.used], labels[0])
+        self.pending = False
+        self.last_time = time_ns
+        return completed
+
+    def seconds_to_next_window(self):
+        """
+        Returns the time in seconds until the current window is complete, based on the time
+        of the latest sample, or None before the first sample.
+        """
+        if self.window_start is None or self.last_time is None:
+            return None
+        return max(0.0, (self.window_start + self.window_ns - self.last_time) / 1e9)
@@ -1,8 +1,10 @@
 # Standard library imports
 import os
+import sys
 import threading
 import time
 import csv
+import collections
 import datetime
 from queue import Queue, Empty
 from io import StringIO
@@ -22,8 +24,65 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.dates as mdates
 
-# Pandas for data handling
-import pandas as pd
+# NumPy for the plotted sample arrays
+import numpy as np
+
+# Rolling store of the plotted samples and its decimation for the plot
+from rollingStore import RollingSampleStore, parse_float
+from plotDecimation import MinMaxDecimator
+
+# Background writer of the CSV log files
+from logWriter import CsvLogWriter, LOG_FLUSH_ROWS, LOG_FLUSH_INTERVAL_MS
+
+# Shared device I/O modules live in the parent BME688_Data_Handler directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from serialReader import SerialLineReader
+
+# Longest time window of the plot in seconds ("120 Minutes").
+MAX_TIME_WINDOW = 7200
+
+# Samples kept for the plot: the longest time window at 10 samples per second. The store
+# grows up to this size as samples arrive; beyond it the oldest samples are dropped, which
+# only shortens the 120-minute window at higher rates.
+LIVE_STORE_CAPACITY = MAX_TIME_WINDOW * 10
+
+# Number of fields of a data line: Timestamp_ms, Label_Tag, HeaterProfile_ID and six fields
+# for each of the 8 sensors.
+SAMPLE_FIELD_COUNT = 3 + 8 * 6
+
+# Default highest rate (frames per second) at which the plot is redrawn. Samples that arrive
+# between two frames are drawn together in the next one.
+PLOT_MAX_FPS = 10
+
+# Seconds after the last redraw at which the plot is redrawn without new samples, so that
+# the time axis keeps moving.
+PLOT_IDLE_INTERVAL = 1.0
+
+# Fraction of the time window that the time axis extends past the current time. The axis
+# stays fixed, and the lines are blitted, until the current time reaches its end.
+PLOT_TIME_LEAD = 0.1
+
+# Fraction of the value range added below and above the data when the value axis is fitted.
+PLOT_VALUE_MARGIN = 0.05
+
+# Seconds between updates of the log writer statistics below the plot.
+LOG_STATS_INTERVAL = 1.0
+
+
+class SampleBatch(collections.namedtuple("SampleBatch", ["local_times", "real_times", "values", "label_tag", "heater_profile_id", "lines"])):
+    """
+    Data lines received by one serial read during logging, parsed once on the serial reader
+    thread and passed to the Tk thread as one item of the data queue.
+    
+    Fields:
+        local_times: Float array of the reception times (time.time()).
+        real_times: datetime64[s] array of the Real_Time of the samples.
+        values: Float array of shape (samples, SAMPLE_FIELD_COUNT) with the fields of the
+            lines, Timestamp_ms to Sensor8_GasIndex (NaN for fields that are not numbers).
+        label_tag, heater_profile_id: The Label Tag and Heater Profile of the newest sample.
+        lines: The logged rows as text (Real_Time followed by the line), for the display.
+    """
+    __slots__ = ()
 
 
 class DataLoggerGUI:
@@ -33,12 +92,17 @@ class DataLoggerGUI:
     This class manages serial communication, logging data to CSV files,
     real-time plotting of sensor data, and additional device commands.
     """
-    def __init__(self, master):
+    def __init__(self, master, plot_fps=PLOT_MAX_FPS, log_flush_rows=LOG_FLUSH_ROWS,
+                 log_flush_interval_ms=LOG_FLUSH_INTERVAL_MS, log_fsync=False):
         """
         Initialize the GUI, set up variables, and start periodic tasks.
         
         Args:
             master (tk.Tk): The root Tkinter window.
+            plot_fps (float): Highest rate (frames per second) at which the plot is redrawn.
+            log_flush_rows (int): Number of logged rows after which the log file is flushed.
+            log_flush_interval_ms (int): Milliseconds after which logged rows are flushed.
+            log_fsync (bool): If True, every flush of the log file is followed by os.fsync.
         """
         self.master = master
         self.master.title("Data Logger GUI")
@@ -48,9 +112,15 @@ class DataLoggerGUI:
         # Serial communication and logging state variables
         self.serial_port = None
         self.logging = False
-        self.log_file = None
         self.plotting = False
-        self.stop_event = threading.Event()
+        # Writer thread of the current log file (see logWriter.CsvLogWriter) and its settings
+        self.log_writer = None
+        self.log_flush_rows = log_flush_rows
+        self.log_flush_interval_ms = log_flush_interval_ms
+        self.log_fsync = log_fsync
+        self.last_log_stats_time = 0.0
+        # Background reader publishing the received lines (see serialReader.SerialLineReader)
+        self.serial_reader = None
 
         # Flag and buffer for heater profiles response from the device
         self.get_heat_response_pending = False
@@ -112,9 +182,10 @@ class DataLoggerGUI:
             "Sensor8_GasIndex"
         ]
 
-        # DataFrame for storing logged data; protected by a thread lock
+        # Rolling store of the numeric columns of the received samples for the plot;
+        # protected by a thread lock
         self.data_lock = threading.Lock()
-        self.df = pd.DataFrame(columns=self.predefined_columns.copy())
+        self.store = RollingSampleStore(self.predefined_columns[1:], LIVE_STORE_CAPACITY)
 
         # Parameters available for plotting sensor data
         self.parameters = [
@@ -139,6 +210,19 @@ class DataLoggerGUI:
         # Time window (in seconds) for displaying recent data in the plot
         self.time_window = 60
 
+        # Render scheduling of the plot (see request_plot_update): the pending after() job,
+        # the time of the last redraw, and the lines, limits and background of the axes
+        self.plot_fps = plot_fps
+        self.plot_job = None
+        self.plot_rebuild_pending = False
+        self.last_plot_time = 0.0
+        self.plot_lines = {}
+        self.plot_xlim = None
+        self.plot_ylim = None
+        self.plot_background = None
+        # Reduces the plotted series to about two points per horizontal pixel
+        self.plot_decimator = MinMaxDecimator()
+
         # GUI variables for displaying Label Tag and Heater Profile information
         self.label_tag_var = tk.StringVar(value="N/A")
         self.heaterpfl_var = tk.StringVar(value="N/A")
@@ -228,7 +312,7 @@ class DataLoggerGUI:
         self.checkbox_buttons = []
         for i in range(1, 9):
             var = self.selected_sensors[f"Sensor{i}"]
-            chk = tk.Checkbutton(sensors_side_frame, text=str(i), variable=var, command=lambda: self.update_plot(immediate=True))
+            chk = tk.Checkbutton(sensors_side_frame, text=str(i), variable=var, command=lambda: self.request_plot_update(rebuild=True))
             chk.config(state=tk.DISABLED)
             chk.pack(anchor='w', pady=2)
             self.checkbox_buttons.append(chk)
@@ -250,6 +334,7 @@ class DataLoggerGUI:
 
         # Embed the matplotlib canvas into the Tkinter GUI
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
+        self.canvas.mpl_connect("draw_event", self.on_plot_draw)
         self.canvas.draw()
         self.canvas.get_tk_widget().pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
 
@@ -261,6 +346,8 @@ class DataLoggerGUI:
         self.log_file_var = tk.StringVar(value="No file selected.")
         self.log_file_label = tk.Label(log_in_plot_frame, textvariable=self.log_file_var, fg="green")
         self.log_file_label.grid(row=0, column=1, padx=5, pady=5, sticky="w")
+        self.log_stats_var = tk.StringVar(value="")
+        tk.Label(log_in_plot_frame, textvariable=self.log_stats_var).grid(row=0, column=2, padx=5, pady=5, sticky="e")
 
         # Controls for selecting parameter and time window
         controls_frame = tk.Frame(self.plotting_frame)
@@ -273,7 +360,7 @@ class DataLoggerGUI:
         if self.parameter_dropdown['values']:
             self.parameter_dropdown.current(0)
         self.parameter_dropdown.grid(row=0, column=1, padx=5, pady=5, sticky="w")
-        self.parameter_dropdown.bind("<<ComboboxSelected>>", lambda event: self.update_plot(immediate=True))
+        self.parameter_dropdown.bind("<<ComboboxSelected>>", lambda event: self.request_plot_update(rebuild=True))
         tk.Label(controls_frame, text="Time Window:").grid(row=0, column=2, padx=5, pady=5, sticky="e")
         self.time_window_var = tk.StringVar(value="1 Minute")
         self.time_window_dropdown = ttk.Combobox(controls_frame, textvariable=self.time_window_var, state="readonly", width=10)
@@ -409,9 +496,10 @@ class DataLoggerGUI:
             self.disconnect_button.config(state=tk.NORMAL)
             self.refresh_button.config(state=tk.DISABLED)
             self.enable_controller_widgets()
-            self.stop_event.clear()
-            self.read_thread = threading.Thread(target=self.read_serial_data, daemon=True)
-            self.read_thread.start()
+            # Lines are read by a blocking reader thread and handed to handle_serial_lines.
+            self.serial_reader = SerialLineReader(self.serial_port, on_error=self.handle_serial_error)
+            self.serial_reader.subscribe(self.handle_serial_lines, batch=True)
+            self.serial_reader.start()
         except serial.SerialException as e:
             self.update_status(f"Serial Connection Error: {str(e)}")
             messagebox.showerror("Connection Error", f"Failed to connect to {selected_port}.\nError: {str(e)}")
@@ -424,8 +512,7 @@ class DataLoggerGUI:
             try:
                 if self.logging:
                     self.stop_logging()
-                self.stop_event.set()
-                self.read_thread.join(timeout=2)
+                self.serial_reader.stop()
                 self.serial_port.close()
                 self.update_status("Serial port disconnected.")
                 self.connect_button.config(state=tk.NORMAL)
@@ -478,9 +565,11 @@ class DataLoggerGUI:
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
         try:
-            self.log_file = open(file_path, 'w', newline='')
-            self.csv_writer = csv.writer(self.log_file)
-            self.csv_writer.writerow(self.predefined_columns)
+            self.log_writer = CsvLogWriter(
+                file_path, self.predefined_columns, flush_rows=self.log_flush_rows,
+                flush_interval_ms=self.log_flush_interval_ms, fsync=self.log_fsync
+            )
+            self.last_log_stats_time = time.monotonic()
             self.logging = True
             self.plotting = True
             self.start_button.config(state=tk.DISABLED)
@@ -488,14 +577,7 @@ class DataLoggerGUI:
             self.send_command("START")
 
             # Reset and configure the plot for new logging session
-            self.ax.cla()
-            self.ax.set_title(f"Sensor Data Over Time")
-            self.ax.set_xlabel("Time (HH:MM:SS)")
-            self.ax.set_ylabel("Value")
-            self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
-            self.ax.xaxis.set_major_locator(mdates.AutoDateLocator())
-            self.fig.autofmt_xdate()
-            self.canvas.draw()
+            self.request_plot_update(rebuild=True)
 
             self.log_file_var.set(file_path)
             self.update_status(f"Logging started. Saving to {file_path}.")
@@ -506,7 +588,8 @@ class DataLoggerGUI:
 
     def stop_logging(self):
         """
-        Stops the logging process, sends a stop command, and closes the log file.
+        Stops the logging process, sends a stop command, and closes the log file after
+        writing and flushing all rows still queued for it.
         """
         if not self.logging:
             self.update_status("Logging is not active.")
@@ -518,17 +601,21 @@ class DataLoggerGUI:
         self.plotting = False
         self.stop_button.config(state=tk.DISABLED)
 
-        if self.log_file:
+        status = "Logging stopped."
+        if self.log_writer:
+            log_writer, self.log_writer = self.log_writer, None
             try:
-                self.log_file.close()
+                log_writer.close()
+                status = f"Logging stopped. {self.format_log_stats(log_writer.stats())}"
             except IOError as e:
-                self.update_status(f"File Error: {str(e)}")
-                messagebox.showerror("File Error", f"Failed to close file.\nError: {str(e)}")
+                status = f"File Error: {str(e)}"
+                messagebox.showerror("File Error", f"Failed to write file.\nError: {str(e)}")
 
         self.start_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
         self.log_file_var.set("No file selected.")
-        self.update_status("Logging stopped.")
+        self.log_stats_var.set("")
+        self.update_status(status)
         self.sampling_entry.config(state="normal")
 
     def get_heater_profiles(self):
@@ -550,147 +637,148 @@ class DataLoggerGUI:
             messagebox.showerror("Error", f"Failed to send GETHEAT command.\nError: {str(e)}")
             self.get_heat_response_pending = False
 
-    def read_serial_data(self):
+    def handle_serial_lines(self, lines):
         """
-        Continuously reads from the serial port.
+        Handles the lines completed by one read from the serial port; called on the serial
+        reader thread.
         
-        This method handles heater profile responses as well as CSV data lines.
-        Valid CSV lines are enqueued for further parsing.
-        """
-        buffer = ""
-        while not self.stop_event.is_set():
-            try:
-                if self.serial_port.in_waiting:
-                    byte_data = self.serial_port.read(self.serial_port.in_waiting)
-                    buffer += byte_data.decode(errors='ignore')
-                    while '\n' in buffer:
-                        line, buffer = buffer.split('\n', 1)
-                        line = line.strip()
-                        if not line:
-                            continue
-
-                        if self.get_heat_response_pending:
-                            self.heater_profiles_buffer.append(line)
-                            # Adjusted check: look for "retrieval complete" in the line.
-                            if "retrieval complete" in line.lower():
-                                self.get_heat_response_pending = False
-                                heater_profiles_str = "\n".join(self.heater_profiles_buffer)
-                                # Schedule the GUI update on the main thread
-                                self.master.after(0, lambda: self.show_heater_profiles(heater_profiles_str))
-                                self.master.after(0, lambda: self.update_status("Received Heater Profiles."))
-                        else:
-                            if self.logging:
-                                csv_reader = csv.reader(StringIO(line))
-                                parsed = next(csv_reader, None)
-                                if parsed and len(parsed) >= 51:
-                                    real_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                                    new_row = [real_time] + parsed
-                                    if self.log_file:
-                                        self.csv_writer.writerow(new_row)
-                                        self.log_file.flush()
-                                    reconstructed_line = ",".join(new_row)
-                                    self.data_queue.put(reconstructed_line)
-                            else:
-                                self.data_queue.put(line)
-            except serial.SerialException:
-                self.master.after(0, lambda: self.update_status("Serial Communication Error: Connection lost."))
-                self.master.after(0, lambda: messagebox.showerror("Communication Error", "Serial Communication Error: Connection lost."))
-                break
-            except UnicodeDecodeError:
-                continue
-
-    def parse_and_store_data(self, line):
-        """
-        Parses a CSV-formatted string from the serial input and stores the data
-        in a pandas DataFrame. Also updates the Label Tag and Heater Profile display.
+        This method handles heater profile responses as well as CSV data lines. During
+        logging, the data lines are parsed once, here: they are written to the log file with
+        the time of reception and queued as one SampleBatch. Other lines are queued as text
+        for the data display.
         
         Args:
-            line (str): A CSV-formatted string containing sensor data.
+            lines (list of str): The received lines, stripped and non-empty.
         """
-        try:
+        rows = []
+        for line in lines:
             if self.get_heat_response_pending:
-                return
-
-            if line.startswith("Real_Time"):
-                return
-
-            csv_reader = csv.reader(StringIO(line))
-            row = next(csv_reader)
-            expected_fields = 1 + 3 + 8 * 6
-            if len(row) < expected_fields:
-                self.update_status(f"Incomplete data received. Expected at least {expected_fields} fields, got {len(row)}.")
-                return
+                self.heater_profiles_buffer.append(line)
+                # Adjusted check: look for "retrieval complete" in the line.
+                if "retrieval complete" in line.lower():
+                    self.get_heat_response_pending = False
+                    heater_profiles_str = "\n".join(self.heater_profiles_buffer)
+                    # Schedule the GUI update on the main thread
+                    self.master.after(0, lambda: self.show_heater_profiles(heater_profiles_str))
+                    self.master.after(0, lambda: self.update_status("Received Heater Profiles."))
+            elif self.logging:
+                parsed = line.split(',') if '"' not in line else next(csv.reader(StringIO(line)), [])
+                if len(parsed) >= SAMPLE_FIELD_COUNT:
+                    rows.append((line, parsed))
+            else:
+                self.data_queue.put(line)
+        if rows:
+            self.data_queue.put(self.log_sample_rows(rows))
 
-            real_time_str = row[0]
-            try:
-                real_time = datetime.datetime.strptime(real_time_str, "%Y-%m-%d %H:%M:%S")
-            except ValueError:
-                self.update_status(f"Invalid Real_Time format: {real_time_str}")
-                return
+    def log_sample_rows(self, rows):
+        """
+        Queues data lines received together for the log file and returns them as a SampleBatch.
+        
+        Args:
+            rows (list of tuple): The (line, fields) of every data line.
+        
+        Returns:
+            SampleBatch: The parsed samples.
+        """
+        local_time = time.time()
+        real_time = datetime.datetime.fromtimestamp(local_time).replace(microsecond=0)
+        real_time_str = real_time.strftime("%Y-%m-%d %H:%M:%S")
+        log_writer = self.log_writer
+        if log_writer:
+            # Queued for the writer thread; the reader never waits for the disk.
+            log_writer.write_rows([real_time_str] + parsed for _, parsed in rows)
+        try:
+            # NumPy parses numeric strings on conversion; fall back to per-field parsing
+            # when a field (e.g. "N/A") is not a number.
+            values = np.array([parsed[:SAMPLE_FIELD_COUNT] for _, parsed in rows], dtype=np.float64)
+        except ValueError:
+            values = np.array([[parse_float(field) for field in parsed[:SAMPLE_FIELD_COUNT]] for _, parsed in rows])
+        return SampleBatch(
+            np.full(len(rows), local_time),
+            np.full(len(rows), np.datetime64(real_time, 's')),
+            values,
+            rows[-1][1][1],
+            rows[-1][1][2],
+            [f"{real_time_str},{line}" for line, _ in rows]
+        )
 
-            timestamp_ms = row[1]
-            label_tag = row[2]
-            heater_profile_id = row[3]
-
-            sensors_data = {}
-            for sensor_num in range(1, 9):
-                base_idx = 4 + (sensor_num - 1) * 6
-                sensors_data[f"Sensor{sensor_num}"] = {
-                    "Temperature_deg_C": row[base_idx],
-                    "Pressure_Pa": row[base_idx + 1],
-                    "Humidity_%": row[base_idx + 2],
-                    "GasResistance_ohm": row[base_idx + 3],
-                    "Status": row[base_idx + 4],
-                    "GasIndex": row[base_idx + 5]
-                }
-
-            data_dict = {
-                "Real_Time": real_time,
-                "Timestamp_ms": timestamp_ms,
-                "Label_Tag": label_tag,
-                "HeaterProfile_ID": heater_profile_id,
-                "local_timestamp": time.time()
-            }
-
-            for sensor, params in sensors_data.items():
-                for param, value in params.items():
-                    column_name = f"{sensor}_{param}"
-                    data_dict[column_name] = value
-
-            with self.data_lock:
-                new_row = pd.DataFrame([data_dict])
-                self.df = pd.concat([self.df, new_row], ignore_index=True)
-
-                if not self.df.empty:
-                    latest_row = self.df.iloc[-1]
-                    heater_profile_id = latest_row.get("HeaterProfile_ID", "N/A")
-                    label_tag = latest_row.get("Label_Tag", "N/A")
-                    self.heaterpfl_var.set(str(heater_profile_id))
-                    self.label_tag_var.set(str(label_tag))
-
-                current_time = time.time()
-                self.df = self.df[self.df["local_timestamp"] >= current_time - self.time_window]
+    def handle_serial_error(self, error):
+        """
+        Reports a lost serial connection; called on the serial reader thread, which stops.
+        
+        Args:
+            error (serial.SerialException): The error raised by the port.
+        """
+        self.master.after(0, lambda: self.update_status("Serial Communication Error: Connection lost."))
+        self.master.after(0, lambda: messagebox.showerror("Communication Error", "Serial Communication Error: Connection lost."))
 
-        except Exception as e:
-            self.update_status(f"Data Parsing Error: {str(e)}")
-            messagebox.showerror("Parsing Error", f"An error occurred while parsing data.\nError: {str(e)}")
+    def store_sample_batch(self, batch):
+        """
+        Appends the samples of a SampleBatch to the rolling sample store and updates the
+        Label Tag and Heater Profile display.
+        
+        Args:
+            batch (SampleBatch): Samples parsed on the serial reader thread.
+        """
+        with self.data_lock:
+            self.store.extend(batch.local_times, batch.real_times, batch.values)
+        self.heaterpfl_var.set(batch.heater_profile_id)
+        self.label_tag_var.set(batch.label_tag)
 
     def process_queue(self):
         """
-        Processes lines from the data queue by parsing, storing, updating the data display,
-        and refreshing the plot.
+        Processes all items waiting in the data queue: stores the sample batches, then
+        shows their lines and the other received lines in the data display at once and
+        requests one plot update for all of them.
         """
+        lines = []
         try:
             while True:
-                line = self.data_queue.get_nowait()
-                self.parse_and_store_data(line)
-                self.update_data_display(line)
-                self.update_plot(immediate=True)
+                item = self.data_queue.get_nowait()
+                if isinstance(item, SampleBatch):
+                    self.store_sample_batch(item)
+                    lines.extend(item.lines)
+                else:
+                    lines.append(item)
                 self.data_queue.task_done()
         except Empty:
             pass
+        if lines:
+            self.update_data_display("\n".join(lines))
+        if lines or time.monotonic() - self.last_plot_time >= PLOT_IDLE_INTERVAL:
+            self.request_plot_update()
+        if self.log_writer and time.monotonic() - self.last_log_stats_time >= LOG_STATS_INTERVAL:
+            self.update_log_stats()
         self.master.after(100, self.process_queue)
 
+    def update_log_stats(self):
+        """
+        Shows the write throughput and backlog of the log writer, and reports a failed write.
+        """
+        self.last_log_stats_time = time.monotonic()
+        stats = self.log_writer.stats()
+        self.log_stats_var.set(self.format_log_stats(stats))
+        if stats["error"]:
+            self.update_status(f"File Error: {stats['error']}")
+
+    def format_log_stats(self, stats):
+        """
+        Formats the statistics of a CsvLogWriter for the GUI.
+        
+        Args:
+            stats (dict): The dict returned by CsvLogWriter.stats().
+        
+        Returns:
+            str: Rows written, write rate, backlog and dropped rows.
+        """
+        text = (
+            f"{stats['rows_written']} rows written ({stats['rows_per_second']:.1f} rows/s, "
+            f"{stats['bytes_per_second'] / 1024:.1f} KiB/s), backlog {stats['backlog_rows']} rows"
+        )
+        if stats["dropped_rows"]:
+            text += f", {stats['dropped_rows']} rows dropped"
+        return text
+
     def update_data_display(self, data):
         """
         Appends a new line of data to the scrollable text widget.
@@ -745,84 +833,142 @@ class DataLoggerGUI:
         self.send_command(command)
         self.update_status(f"Sampling Period set to {msec} ms.")
 
-    def update_plot(self, immediate=False):
+    def request_plot_update(self, rebuild=False):
         """
-        Updates the real-time plot based on selected sensor data and parameter.
+        Schedules a redraw of the plot. Requests made before the redraw runs are coalesced
+        into it, and redraws are at least 1 / plot_fps seconds apart, so the plot costs the
+        same whether the device sends 1 or 100 samples per second.
         
         Args:
-            immediate (bool): If True, update the plot immediately.
+            rebuild (bool): If True, the axes and lines are recreated (after another parameter,
+                sensor or time window was selected); otherwise only the line data is updated.
+        """
+        self.plot_rebuild_pending = self.plot_rebuild_pending or rebuild
+        if self.plot_job is None:
+            delay = self.last_plot_time + 1.0 / self.plot_fps - time.monotonic()
+            self.plot_job = self.master.after(max(0, int(delay * 1000)), self.render_plot)
+
+    def render_plot(self):
         """
+        Runs a scheduled redraw of the plot.
+        """
+        self.plot_job = None
+        self.last_plot_time = time.monotonic()
         if not self.plotting:
             return
+        if self.plot_rebuild_pending:
+            self.plot_rebuild_pending = False
+            self.rebuild_plot()
+        else:
+            self.refresh_plot()
 
+    def rebuild_plot(self):
+        """
+        Clears the axes and creates one line per selected sensor for the selected parameter
+        (and the Label Tag line), then draws them with refresh_plot(). The lines are
+        animated: full draws leave them out, so that they can be blitted over the saved
+        background of the axes.
+        """
         selected_parameter = self.selected_parameter.get().replace(' ', '_')
-        column = selected_parameter
 
-        if column not in self.parameters:
+        if selected_parameter not in self.parameters:
             self.update_status(f"Invalid parameter selected: {selected_parameter}")
             messagebox.showerror("Parameter Error", f"Invalid parameter selected: {selected_parameter}")
             return
 
+        self.ax.cla()
+        self.ax.xaxis_date()
+        self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
+        self.ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+        self.ax.set_xlabel("Time (HH:MM:SS)")
+        self.plot_lines = {}
+        self.plot_xlim = None
+        self.plot_ylim = None
+        self.plot_decimator.reset()
+
         selected_sensors = [sensor for sensor, var in self.selected_sensors.items() if var.get()]
         if not selected_sensors:
-            self.ax.cla()
             self.ax.set_title("Sensor Data")
-            self.ax.set_xlabel("Time (HH:MM:SS)")
             self.ax.set_ylabel("Value")
-            self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
-            self.ax.xaxis.set_major_locator(mdates.AutoDateLocator())
-            self.fig.autofmt_xdate()
-            self.canvas.draw()
+            self.refresh_plot(full_draw=True)
             return
 
-        self.ax.cla()
         self.ax.set_title(f"{selected_parameter.replace('_', ' ')} Over Time")
-        self.ax.set_xlabel("Time (HH:MM:SS)")
         self.ax.set_ylabel(selected_parameter.replace('_', ' '))
-        self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
-        self.ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+        for sensor in selected_sensors:
+            sensor_column = f"{sensor}_{selected_parameter}"
+            if sensor_column in self.store.column_index:
+                self.plot_lines[sensor_column], = self.ax.plot([], [], label=sensor, animated=True)
+        if selected_parameter == "Label_Tag":
+            self.plot_lines["Label_Tag"], = self.ax.plot([], [], label="Label Tag", color='red', animated=True)
 
-        has_data = False
+        if not len(self.store):
+            self.update_status("No data available.")
+        if self.plot_lines:
+            self.ax.legend(loc='upper left')
+        self.refresh_plot(full_draw=True)
 
+    def refresh_plot(self, full_draw=False):
+        """
+        Updates the lines with the samples of the time window, decimated to one bucket per
+        horizontal pixel of the axes (see plotDecimation.MinMaxDecimator).
+        
+        The axes limits change only when the data leaves them. When the current time passes
+        the end of the time axis, the axis moves on so that it ends PLOT_TIME_LEAD of the
+        window ahead, and the value axis is fitted to the data again. The value axis also
+        widens when a value falls outside it. While the limits hold, only the lines are
+        blitted over the saved background; otherwise the whole figure is drawn.
+        
+        Args:
+            full_draw (bool): If True, the whole figure is drawn.
+        """
+        bucket_seconds = self.time_window / max(self.ax.bbox.width, 1.0)
         with self.data_lock:
-            if not self.df.empty:
-                df_filtered = self.df[self.df["local_timestamp"] >= time.time() - self.time_window]
-                if not df_filtered.empty:
-                    sensor_times = df_filtered['Real_Time']
-                    for sensor in selected_sensors:
-                        sensor_column = f"{sensor}_{selected_parameter}"
-                        if sensor_column in self.df.columns:
-                            try:
-                                sensor_data = pd.to_numeric(df_filtered[sensor_column], errors='coerce')
-                                self.ax.plot(sensor_times, sensor_data, label=sensor)
-                                has_data = True
-                            except Exception as e:
-                                self.update_status(f"Plotting Error for {sensor}: {str(e)}")
-                                messagebox.showerror("Plotting Error", f"An error occurred while plotting {sensor} data.\nError: {str(e)}")
-            else:
-                self.update_status("No data available.")
-
-        if selected_parameter == "Label_Tag":
-            with self.data_lock:
-                if not self.df.empty:
-                    df_filtered = self.df[self.df["local_timestamp"] >= time.time() - self.time_window]
-                    if not df_filtered.empty:
-                        sensor_times = df_filtered['Real_Time']
-                        label_tags = pd.to_numeric(df_filtered["Label_Tag"], errors='coerce')
-                        self.ax.plot(sensor_times, label_tags, label="Label Tag", color='red')
-                        has_data = True
-
-        if has_data:
-            self.ax.legend(loc='upper left')
+            sensor_times, values = self.store.window(time.time() - self.time_window)
+            # The decimated series are new arrays, so the store can overwrite its slots.
+            series = self.plot_decimator.decimate(self.store, sensor_times, values, bucket_seconds, self.plot_lines)
+        for column, line in self.plot_lines.items():
+            line.set_data(*series[column])
 
         current_time = datetime.datetime.now()
-        time_window_start = current_time - datetime.timedelta(seconds=self.time_window)
-        self.ax.set_xlim(time_window_start, current_time)
-        self.fig.autofmt_xdate()
-        self.canvas.draw()
+        if self.plot_xlim is None or current_time > self.plot_xlim[1]:
+            self.plot_xlim = (
+                current_time - datetime.timedelta(seconds=self.time_window),
+                current_time + datetime.timedelta(seconds=self.time_window * PLOT_TIME_LEAD)
+            )
+            self.ax.set_xlim(*self.plot_xlim)
+            self.plot_ylim = None
+            full_draw = True
+
+        finite = [column_data[np.isfinite(column_data)] for _, column_data in series.values()]
+        finite = [column_data for column_data in finite if len(column_data)]
+        if finite:
+            low = min(column_data.min() for column_data in finite)
+            high = max(column_data.max() for column_data in finite)
+            if self.plot_ylim is None or low < self.plot_ylim[0] or high > self.plot_ylim[1]:
+                margin = (high - low) * PLOT_VALUE_MARGIN or abs(high) * PLOT_VALUE_MARGIN or 1.0
+                self.plot_ylim = (low - margin, high + margin)
+                self.ax.set_ylim(*self.plot_ylim)
+                full_draw = True
+
+        if full_draw or self.plot_background is None:
+            self.fig.autofmt_xdate()
+            # on_plot_draw saves the new background and draws the lines on it.
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.plot_background)
+            for line in self.plot_lines.values():
+                self.ax.draw_artist(line)
+            self.canvas.blit(self.ax.bbox)
 
-        if not immediate:
-            self.master.after(1000, self.update_plot)
+    def on_plot_draw(self, event):
+        """
+        Saves the background of the axes after every full draw of the figure (including
+        redraws after the window was resized) and draws the animated lines on it.
+        """
+        self.plot_background = self.canvas.copy_from_bbox(self.ax.bbox)
+        for line in self.plot_lines.values():
+            self.ax.draw_artist(line)
 
     def on_closing(self):
         """
@@ -832,13 +978,15 @@ class DataLoggerGUI:
         if self.logging:
             if self.confirm_action("Logging is in progress. Do you want to quit?"):
                 self.stop_logging()
-                self.stop_event.set()
+                if self.serial_reader:
+                    self.serial_reader.stop()
                 self.master.destroy()
                 os._exit(0)
             else:
                 return
         else:
-            self.stop_event.set()
+            if self.serial_reader:
+                self.serial_reader.stop()
             self.master.destroy()
             os._exit(0)
 
@@ -861,7 +1009,7 @@ class DataLoggerGUI:
             self.time_window = 7200
         else:
             self.time_window = 60
-        self.update_plot()
+        self.request_plot_update(rebuild=True)
 
     def update_status(self, message):
         """
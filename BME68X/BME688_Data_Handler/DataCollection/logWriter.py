@@ -0,0 +1,204 @@
+# Import necessary libraries for writing CSV logs in a background thread
+import csv
+import io
+import os
+import threading
+import time
+from queue import Queue, Full, Empty
+
+# Default number of written rows after which the log file is flushed.
+LOG_FLUSH_ROWS = 100
+
+# Default milliseconds after which written rows are flushed, however few they are.
+LOG_FLUSH_INTERVAL_MS = 1000
+
+# Default number of row batches the queue holds before further rows are dropped.
+LOG_QUEUE_SIZE = 10000
+
+class CsvLogWriter:
+    """
+    Writes the rows of a CSV log on its own thread, so that the serial reader thread never
+    waits for the disk.
+
+    write_rows() only puts a batch of rows into a bounded queue. The writer thread formats
+    the batches it takes from the queue and writes them with one write call each. The file
+    is flushed once flush_rows rows or flush_interval_ms milliseconds have passed since the
+    last flush, and, with fsync=True, forced to disk with os.fsync. A crash can therefore lose
+    the rows of the last flush interval, but not the rows of earlier intervals.
+    If the queue is full, for example because the disk stalls, new rows are dropped and
+    counted rather than blocking the caller. close() writes everything queued before it
+    and flushes the file.
+    """
+    def __init__(self, path, header, flush_rows=LOG_FLUSH_ROWS, flush_interval_ms=LOG_FLUSH_INTERVAL_MS,
+                 fsync=False, queue_size=LOG_QUEUE_SIZE):
+        """
+        Opens the log file, writes the header and starts the writer thread.
+
+        Parameters:
+          path: Path of the CSV file; an existing file is overwritten.
+          header: The column names, written as the first row.
+          flush_rows: Number of rows after which the file is flushed.
+          flush_interval_ms: Milliseconds after which written rows are flushed.
+          fsync: If True, every flush is followed by os.fsync.
+          queue_size: Number of batches of rows the queue holds.
+
+        Raises:
+          IOError: If the file cannot be opened or the header cannot be written.
+        """
+        self.path = path
+        self.flush_rows = max(1, int(flush_rows))
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.fsync = fsync
+        self.log_file = open(path, 'w', newline='')
+        try:
+            csv.writer(self.log_file).writerow(header)
+            self.log_file.flush()
+        except IOError:
+            self.log_file.close()
+            raise
+        self.buffer = io.StringIO()
+        self.csv_writer = csv.writer(self.buffer)
+        self.queue = Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.closed = False
+        self.error = None
+        # Counters (see stats); queued_rows, dropped_rows and the last stats() call are
+        # updated under the lock.
+        self.queued_rows = 0
+        self.dropped_rows = 0
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.unflushed_rows = 0
+        self.flushes = 0
+        self.started = time.monotonic()
+        self.last_stats = (self.started, 0, 0)
+        self.thread = threading.Thread(target=self.run, name="CsvLogWriter", daemon=True)
+        self.thread.start()
+
+    def write_rows(self, rows):
+        """
+        Queues rows (lists of fields) to be written; never blocks. Returns False if they were
+        dropped because the writer is closed, has failed or its queue is full.
+        """
+        rows = list(rows)
+        with self.lock:
+            if self.closed or self.error is not None:
+                self.dropped_rows += len(rows)
+                return False
+            try:
+                self.queue.put_nowait(rows)
+            except Full:
+                self.dropped_rows += len(rows)
+                return False
+            self.queued_rows += len(rows)
+        return True
+
+    def run(self):
+        """
+        Body of the writer thread: writes the queued batches and flushes them every
+        flush_rows rows or flush_interval seconds, until close() queues None.
+        """
+        last_flush = time.monotonic()
+        while True:
+            wait = max(0.0, last_flush + self.flush_interval - time.monotonic()) if self.unflushed_rows else None
+            try:
+                rows = self.queue.get(timeout=wait)
+            except Empty:
+                rows = []
+            if rows is None:
+                break
+            if rows:
+                self.write_batch(rows)
+            if self.unflushed_rows and (self.unflushed_rows >= self.flush_rows or time.monotonic() - last_flush >= self.flush_interval):
+                self.flush()
+                last_flush = time.monotonic()
+        self.flush()
+        try:
+            self.log_file.close()
+        except IOError as e:
+            self.error = self.error or e
+
+    def write_batch(self, rows):
+        """
+        Formats a batch of rows and writes it to the file.
+        """
+        with self.lock:
+            self.queued_rows -= len(rows)
+            if self.error is not None:
+                self.dropped_rows += len(rows)
+                return
+        self.csv_writer.writerows(rows)
+        text = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        try:
+            self.log_file.write(text)
+        except IOError as e:
+            self.error = e
+            with self.lock:
+                self.dropped_rows += len(rows)
+            return
+        self.rows_written += len(rows)
+        self.bytes_written += len(text)
+        self.unflushed_rows += len(rows)
+
+    def flush(self):
+        """
+        Flushes the written rows to the operating system, and to disk with fsync=True.
+        """
+        if self.error is not None or not self.unflushed_rows:
+            return
+        try:
+            self.log_file.flush()
+            if self.fsync:
+                os.fsync(self.log_file.fileno())
+        except IOError as e:
+            self.error = e
+            return
+        self.unflushed_rows = 0
+        self.flushes += 1
+
+    def close(self, timeout=10):
+        """
+        Writes all rows queued so far, flushes and closes the file, and stops the writer
+        thread, waiting up to timeout seconds for it. Rows written after close are dropped.
+
+        Raises:
+          IOError: If writing, flushing or closing the file failed at any point.
+        """
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+        # The end marker is queued behind all rows, blocking only until there is room.
+        self.queue.put(None)
+        self.thread.join(timeout=timeout)
+        if self.error is not None:
+            raise self.error
+
+    def stats(self):
+        """
+        Returns the writer's counters as a dict: rows_written, bytes_written, flushes,
+        backlog_rows (queued but not yet written), unflushed_rows, dropped_rows, error (the
+        message of the first failure or None), and rows_per_second and bytes_per_second since
+        the previous call.
+        """
+        now = time.monotonic()
+        with self.lock:
+            previous_time, previous_rows, previous_bytes = self.last_stats
+            rows_written, bytes_written = self.rows_written, self.bytes_written
+            self.last_stats = (now, rows_written, bytes_written)
+            backlog_rows = self.queued_rows
+            dropped_rows = self.dropped_rows
+        elapsed = now - previous_time
+        return {
+            "rows_written": rows_written,
+            "bytes_written": bytes_written,
+            "flushes": self.flushes,
+            "backlog_rows": backlog_rows,
+            "unflushed_rows": self.unflushed_rows,
+            "dropped_rows": dropped_rows,
+            "error": str(self.error) if self.error is not None else None,
+            "rows_per_second": (rows_written - previous_rows) / elapsed if elapsed > 0 else 0.0,
+            "bytes_per_second": (bytes_written - previous_bytes) / elapsed if elapsed > 0 else 0.0,
+        }
@@ -0,0 +1,322 @@
+# Standard library imports
+import argparse
+import asyncio
+import csv
+import datetime
+import os
+import re
+import sys
+import time
+
+# Shared device I/O modules live in the parent BME688_Data_Handler directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from deviceIO import BME688Device, DeviceError, LOG_COLUMNS
+
+# Columns of the logs written by the multi-device logger: the columns of the Data Logger GUI
+# logs followed by the ID of the board and the time of reception in seconds since the start
+# of the session, from the monotonic clock. The extra columns come last, so the logs can be
+# processed like single-board logs.
+MULTI_LOG_COLUMNS = LOG_COLUMNS + ["Device_ID", "Monotonic_s"]
+
+# Seconds between flushes of the log files to disk.
+FLUSH_INTERVAL = 1.0
+
+# Rows of a merged log are written in order of reception once they are this many seconds old,
+# so that rows of several boards that were processed out of order can still be sorted.
+MERGE_DELAY = 0.5
+
+# Default seconds between throughput reports.
+REPORT_INTERVAL = 10.0
+
+def device_id_for_port(port):
+    """
+    Derives a device ID usable in file names from a port name, e.g. "ttyUSB0" for
+    "/dev/ttyUSB0" and "COM3" for "COM3".
+    """
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', os.path.basename(port.rstrip('/\\'))) or "device"
+
+class DeviceStats:
+    """
+    Reception counters of one board, with the values at the previous report for the rates.
+    """
+    def __init__(self, device_id, port):
+        self.device_id = device_id
+        self.port = port
+        self.rows = 0
+        self.error = None
+        self.last_rows = 0
+        self.last_report = time.monotonic()
+
+class MultiDeviceLogger:
+    """
+    Headless collector that logs the samples of several BME688 boards in one process. All
+    boards are served by one asyncio event loop through deviceIO.BME688Device, so no thread
+    is needed per port. Each row is tagged with its Device_ID and Monotonic_s. Rows are written
+    either to one CSV file per board or to a single merged file in order of reception.
+    """
+    def __init__(self, ports, output, merged=False, interval_ms=None, send_start=True, report_interval=REPORT_INTERVAL, settle_time=None, binary=False):
+        """
+        Parameters:
+          ports: Dict mapping each device ID to its serial port name.
+          output: Directory of the per-device logs, or the path of the merged log.
+          merged: If True, all rows go to one file at output.
+          interval_ms: Optional data interval sent to every board (MS_<n>) before starting.
+          send_start: If True, START is sent to every board and STOP when logging ends.
+          report_interval: Seconds between throughput reports; 0 disables periodic reports.
+          settle_time: Optional seconds to wait after opening the ports (see deviceIO).
+          binary: If True, boards that support it send binary frames instead of CSV lines
+            while logging (FORMAT_BINARY), and are switched back to CSV at the end.
+        """
+        if not ports:
+            raise ValueError("At least one port is required.")
+        self.ports = dict(ports)
+        self.output = output
+        self.merged = merged
+        self.interval_ms = interval_ms
+        self.send_start = send_start
+        self.report_interval = report_interval
+        self.settle_time = settle_time
+        self.binary = binary
+        self.devices = {}
+        self.stats = {device_id: DeviceStats(device_id, port) for device_id, port in self.ports.items()}
+        self.files = {}
+        self.writers = {}
+        self.merge_buffer = []
+        self.start_monotonic = None
+
+    def log_path(self, device_id):
+        """
+        Returns the path of the log file that receives the rows of device_id.
+        """
+        if self.merged:
+            return self.output
+        return os.path.join(self.output, f"{device_id}.csv")
+
+    def open_logs(self):
+        """
+        Creates the log files and writes their header rows.
+        """
+        paths = {self.output: None} if self.merged else {self.log_path(device_id): device_id for device_id in self.devices}
+        for path, device_id in paths.items():
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            log_file = open(path, "w", newline="")
+            writer = csv.writer(log_file)
+            writer.writerow(MULTI_LOG_COLUMNS)
+            self.files[device_id] = log_file
+            self.writers[device_id] = writer
+
+    def flush_logs(self, final=False):
+        """
+        Writes the merged rows that are old enough (all of them if final) and flushes the files.
+        """
+        if self.merged and self.merge_buffer:
+            cutoff = float("inf") if final else time.monotonic() - MERGE_DELAY
+            self.merge_buffer.sort(key=lambda item: item[0])
+            ready = 0
+            while ready < len(self.merge_buffer) and self.merge_buffer[ready][0] <= cutoff:
+                ready += 1
+            self.writers[None].writerows(row for _, row in self.merge_buffer[:ready])
+            del self.merge_buffer[:ready]
+        for log_file in self.files.values():
+            log_file.flush()
+
+    def close_logs(self):
+        self.flush_logs(final=True)
+        for log_file in self.files.values():
+            log_file.close()
+        self.files.clear()
+        self.writers.clear()
+
+    def write_sample(self, device_id, sample):
+        """
+        Adds the row of one sample to the device's log or to the merge buffer.
+        """
+        row = sample.log_row() + [device_id, f"{sample.monotonic - self.start_monotonic:.6f}"]
+        if self.merged:
+            self.merge_buffer.append((sample.monotonic, row))
+        else:
+            self.writers[device_id].writerow(row)
+        self.stats[device_id].rows += 1
+
+    async def open_devices(self):
+        """
+        Opens all ports concurrently. Ports that cannot be opened or configured are reported
+        and left out.
+
+        Raises:
+          DeviceError: If no port could be opened.
+        """
+        options = {} if self.settle_time is None else {"settle_time": self.settle_time}
+        devices = {
+            device_id: BME688Device(port, name=device_id, on_message=self.print_message, **options)
+            for device_id, port in self.ports.items()
+        }
+        results = await asyncio.gather(*(self.prepare_device(device) for device in devices.values()), return_exceptions=True)
+        for (device_id, device), result in zip(devices.items(), results):
+            if isinstance(result, Exception):
+                self.stats[device_id].error = str(result)
+                print(f"[{device_id}] Not logged: {result}")
+                await device.close()
+            else:
+                self.devices[device_id] = device
+        if not self.devices:
+            raise DeviceError("None of the ports could be opened.")
+
+    async def prepare_device(self, device):
+        """
+        Opens one board, sets its data interval and output format.
+        """
+        await device.open()
+        if self.interval_ms is not None:
+            await device.set_interval(self.interval_ms)
+        if self.binary and not await device.set_binary_output(True):
+            print(f"[{device.name}] Binary frames not supported by the firmware; logging CSV lines.")
+
+    def print_message(self, device_id, line):
+        print(f"[{device_id}] {line}")
+
+    async def log_device(self, device_id, device):
+        """
+        Writes the samples of one board until it is closed or its connection is lost.
+        """
+        try:
+            async for sample in device.samples():
+                self.write_sample(device_id, sample)
+        except DeviceError as e:
+            self.stats[device_id].error = str(e)
+            print(f"[{device_id}] {e}")
+
+    async def flush_periodically(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            self.flush_logs()
+
+    async def report_periodically(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            self.print_report()
+
+    def report(self, final=False):
+        """
+        Returns the reception statistics of every board as a list of dicts with the keys
+        device_id, port, rows, rows_per_second, received_lines, dropped_samples,
+        malformed_lines and error. The rate covers the time since the previous report, or the
+        whole session if final.
+        """
+        now = time.monotonic()
+        rows = []
+        for device_id, stats in self.stats.items():
+            device = self.devices.get(device_id)
+            if final:
+                stats.last_rows = 0
+                stats.last_report = self.start_monotonic if self.start_monotonic is not None else now
+            elapsed = now - stats.last_report
+            rows.append({
+                "device_id": device_id,
+                "port": stats.port,
+                "rows": stats.rows,
+                "rows_per_second": (stats.rows - stats.last_rows) / elapsed if elapsed > 0 else 0.0,
+                "received_lines": device.received_lines if device else 0,
+                "dropped_samples": device.dropped_samples if device else 0,
+                "malformed_lines": device.malformed_lines if device else 0,
+                "error": stats.error,
+            })
+            stats.last_rows = stats.rows
+            stats.last_report = now
+        return rows
+
+    def print_report(self, final=False):
+        """
+        Prints one line of statistics per board. Boards that could not be opened are only
+        listed in the final report.
+        """
+        for row in self.report(final):
+            if not final and row["device_id"] not in self.devices:
+                continue
+            status = f", error: {row['error']}" if row["error"] else ""
+            print(
+                f"[{row['device_id']}] {row['port']}: {row['rows']} rows, {row['rows_per_second']:.1f} rows/s, "
+                f"{row['dropped_samples']} dropped, {row['malformed_lines']} malformed{status}"
+            )
+
+    async def run(self, duration=None):
+        """
+        Opens the boards, logs their samples until duration seconds have passed (or until
+        cancelled, e.g. by Ctrl+C) and then stops the boards and closes the logs.
+
+        Parameters:
+          duration: Optional logging time in seconds; without it, logging runs until all
+            connections are lost or the task is cancelled.
+        """
+        await self.open_devices()
+        self.start_monotonic = time.monotonic()
+        for stats in self.stats.values():
+            stats.last_report = self.start_monotonic
+        self.open_logs()
+        tasks = [asyncio.create_task(self.flush_periodically())]
+        if self.report_interval:
+            tasks.append(asyncio.create_task(self.report_periodically()))
+        loggers = [asyncio.create_task(self.log_device(device_id, device)) for device_id, device in self.devices.items()]
+        try:
+            if self.send_start:
+                await asyncio.gather(*(device.start() for device in self.devices.values()))
+            await asyncio.wait(loggers, timeout=duration)
+        finally:
+            if self.send_start:
+                await asyncio.gather(*(device.stop() for device in self.devices.values()), return_exceptions=True)
+            binary_devices = [device for device in self.devices.values() if device.binary_output]
+            await asyncio.gather(*(device.set_binary_output(False) for device in binary_devices), return_exceptions=True)
+            await asyncio.gather(*(device.close() for device in self.devices.values()), return_exceptions=True)
+            await asyncio.gather(*loggers, return_exceptions=True)
+            for task in tasks:
+                task.cancel()
+            self.close_logs()
+            self.print_report(final=True)
+
+def parse_port_arguments(arguments):
+    """
+    Converts "PORT" or "PORT=DEVICE_ID" arguments into a dict of device IDs to ports.
+    """
+    ports = {}
+    for argument in arguments:
+        port, _, device_id = argument.partition("=")
+        device_id = device_id or device_id_for_port(port)
+        if device_id in ports:
+            raise ValueError(f"Duplicate device ID {device_id}; name the ports with PORT=DEVICE_ID.")
+        ports[device_id] = port
+    return ports
+
+def main():
+    parser = argparse.ArgumentParser(description="Log the samples of several BME688 boards at once.")
+    parser.add_argument("ports", nargs="+", help="Serial ports, optionally named as PORT=DEVICE_ID.")
+    parser.add_argument("--output", help="Directory of the per-device logs, or file of the merged log.")
+    parser.add_argument("--merged", action="store_true", help="Write all boards to one log file.")
+    parser.add_argument("--interval", type=int, help="Data interval in milliseconds sent to every board.")
+    parser.add_argument("--duration", type=float, help="Logging time in seconds (default: until Ctrl+C).")
+    parser.add_argument("--report-interval", type=float, default=REPORT_INTERVAL, help="Seconds between throughput reports.")
+    parser.add_argument("--no-start", action="store_true", help="Do not send START/STOP to the boards.")
+    parser.add_argument("--binary", action="store_true", help="Receive binary frames instead of CSV lines where supported.")
+    args = parser.parse_args()
+
+    try:
+        ports = parse_port_arguments(args.ports)
+    except ValueError as e:
+        parser.error(str(e))
+    session = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    output = args.output or (f"multi_log_{session}.csv" if args.merged else f"multi_logs_{session}")
+    logger = MultiDeviceLogger(
+        ports, output, merged=args.merged, interval_ms=args.interval,
+        send_start=not args.no_start, report_interval=args.report_interval, binary=args.binary,
+    )
+    try:
+        asyncio.run(logger.run(args.duration))
+    except KeyboardInterrupt:
+        pass
+    except DeviceError as e:
+        print(e)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
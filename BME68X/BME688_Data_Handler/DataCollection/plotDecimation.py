@@ -0,0 +1,140 @@
+# Import necessary libraries for decimating the live plot of the Data Logger GUI
+import numpy as np
+
+def bucket_ids(real_times, bucket_seconds):
+    """
+    Returns the bucket of every Real_Time stamp (datetime64[s]): the number of whole
+    bucket_seconds since the epoch.
+    """
+    return np.floor(real_times.astype(np.int64) / bucket_seconds).astype(np.int64)
+
+def min_max_buckets(ids, real_times, data):
+    """
+    Reduces every run of samples in the same bucket to two points: its minimum and its
+    maximum, in the order they occurred. NaN samples (sensors that did not report) are
+    ignored; a bucket with only NaN samples gives two NaN points, which break the line.
+
+    Parameters:
+      ids: Bucket of every sample (see bucket_ids).
+      real_times: Real_Time of every sample.
+      data: Values of one column.
+
+    Returns:
+      A tuple (ids, x, y): the bucket of every run and the two points of every run.
+    """
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    counts = np.diff(np.r_[starts, len(ids)])
+    index = np.arange(len(data))
+    missing = np.isnan(data)
+    low = np.where(missing, np.inf, data)
+    high = np.where(missing, -np.inf, data)
+    # Position of the first minimum and the first maximum of every run.
+    first_min = np.minimum.reduceat(np.where(low == np.repeat(np.minimum.reduceat(low, starts), counts), index, len(data)), starts)
+    first_max = np.minimum.reduceat(np.where(high == np.repeat(np.maximum.reduceat(high, starts), counts), index, len(data)), starts)
+    order = np.sort(np.stack([first_min, first_max], axis=1), axis=1).ravel()
+    return ids[starts], real_times[order], data[order]
+
+class MinMaxDecimator:
+    """
+    Reduces the series of the rolling sample store shown in the live plot to about two
+    points per bucket. The plot uses one bucket per horizontal pixel, so draw time no longer
+    grows with the time window. Every bucket is drawn as its minimum and maximum in the
+    order they occurred (min/max decimation). Peaks, dips and the band of noisy data
+    therefore look the same as with all samples drawn; averaging or LTTB would drop
+    single-sample spikes.
+
+    Buckets are aligned to whole multiples of bucket_seconds, so a bucket does not change
+    once it is complete, and completed buckets are cached per column. A refresh only
+    computes the buckets of the samples appended since the previous one, from the start of
+    the last, still open bucket. Cached buckets that leave the time window are dropped, and
+    the bucket the window's left edge cuts through is recomputed from the samples still in
+    the window, so the result is the same as decimating the window from scratch. The cache
+    is reset when the bucket width or the columns change, or when the window starts before
+    the previous one. While the window holds Real_Time stamps that go back (e.g. after a
+    clock change), nothing is cached.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self, bucket_seconds=None, columns=()):
+        """
+        Discards the cached buckets.
+        """
+        self.bucket_seconds = bucket_seconds
+        self.columns = list(columns)
+        self.cached_ids = np.empty(0, dtype=np.int64)
+        # Number in the store (see RollingSampleStore.appended) of the first sample of every
+        # cached bucket.
+        self.cached_starts = np.empty(0, dtype=np.int64)
+        self.cached_x = {column: np.empty(0, dtype='datetime64[s]') for column in self.columns}
+        self.cached_y = {column: np.empty(0) for column in self.columns}
+        # Number in the store of the first sample of the open bucket, from which the next
+        # refresh starts, and of the first sample of the previous window.
+        self.open_start = None
+        self.window_start = None
+
+    def decimate(self, store, real_times, values, bucket_seconds, columns):
+        """
+        Returns the decimated series of a time window of the store.
+
+        Parameters:
+          store: The RollingSampleStore the window was taken from.
+          real_times, values: The views returned by store.window(), taken after the newest
+            sample was appended.
+          bucket_seconds: Width of a bucket in seconds.
+          columns: Names of the columns to decimate.
+
+        Returns:
+          A dict of (x, y) arrays per column, with x in Real_Time.
+        """
+        columns = list(columns)
+        if bucket_seconds != self.bucket_seconds or columns != self.columns:
+            self.reset(bucket_seconds, columns)
+        count = len(real_times)
+        if not count or not columns:
+            self.reset(bucket_seconds, columns)
+            return {column: (real_times[:0], np.empty(0)) for column in columns}
+
+        window_start = store.appended - count
+        if self.open_start is None or not self.window_start <= window_start <= self.open_start:
+            # Nothing is cached, the open bucket has left the window, or the window now
+            # starts before the samples the cache covers.
+            self.reset(bucket_seconds, columns)
+            tail = 0
+        else:
+            tail = self.open_start - window_start
+        ids = bucket_ids(real_times[tail:], bucket_seconds)
+        if np.any(ids[1:] < ids[:-1]) or (len(self.cached_ids) and ids[0] <= self.cached_ids[-1]):
+            # The stamps went back (e.g. after a clock change). Until that has left the
+            # window, the whole window is decimated on every refresh, without caching.
+            self.reset(bucket_seconds, columns)
+            ids = bucket_ids(real_times, bucket_seconds)
+            return {column: min_max_buckets(ids, real_times, store.column(values, column))[1:] for column in columns}
+
+        # All runs but the last are complete buckets; the last one may still grow.
+        run_starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        last_run = tail + int(run_starts[-1])
+        # The cached buckets up to the first one in the window are dropped. That bucket may
+        # have lost samples to the window's left edge, so it is recomputed from the head of
+        # the window, the samples before the first cached bucket that is kept.
+        first_id = bucket_ids(real_times[:1], bucket_seconds)[0]
+        keep = int(np.searchsorted(self.cached_ids, first_id, side="right"))
+        if not tail:
+            head = 0
+        elif keep < len(self.cached_ids):
+            head = int(self.cached_starts[keep]) - window_start
+        else:
+            head = tail
+        series = {}
+        for column in columns:
+            data = store.column(values, column)
+            run_ids, x, y = min_max_buckets(ids, real_times[tail:], data[tail:])
+            self.cached_x[column] = np.concatenate([self.cached_x[column][2 * keep:], x[:-2]])
+            self.cached_y[column] = np.concatenate([self.cached_y[column][2 * keep:], y[:-2]])
+            head_x, head_y = min_max_buckets(np.full(head, first_id), real_times[:head], data[:head])[1:] if head else (x[:0], y[:0])
+            series[column] = (np.concatenate([head_x, self.cached_x[column], x[-2:]]), np.concatenate([head_y, self.cached_y[column], y[-2:]]))
+        self.cached_ids = np.concatenate([self.cached_ids[keep:], run_ids[:-1]])
+        self.cached_starts = np.concatenate([self.cached_starts[keep:], window_start + tail + run_starts[:-1]])
+        self.open_start = window_start + last_run
+        self.window_start = window_start
+        return series
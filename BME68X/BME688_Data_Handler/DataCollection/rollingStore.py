@@ -0,0 +1,166 @@
+# Import necessary libraries for storing the live samples of the Data Logger GUI
+import numpy as np
+
+def parse_float(text):
+    """
+    Converts one field to float, returning NaN for fields that are not numbers (e.g. "N/A").
+    """
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+class RollingSampleStore:
+    """
+    Column-oriented store of the most recent samples, used by the live plot of the Data Logger
+    GUI instead of a DataFrame that grows one row at a time. Each column is a float array,
+    next to an array of local reception times (seconds since the epoch) and one of Real_Time
+    stamps.
+
+    As in the Model Trainer's SampleRingBuffer, every sample is written twice, at slot i and
+    i + capacity, so the newest samples always form one contiguous slice and window() returns
+    views without copying. The arrays start at initial_capacity samples and double until they
+    hold max_capacity; after that the oldest sample is overwritten. Appending is amortized
+    O(1), and a time window is found by binary search over the reception times.
+    """
+    def __init__(self, columns, max_capacity, initial_capacity=1024):
+        """
+        Parameters:
+          columns: Names of the numeric columns, in the order of the values passed to append.
+          max_capacity: Largest number of samples kept.
+          initial_capacity: Number of samples the arrays are first allocated for.
+        """
+        if max_capacity < 1:
+            raise ValueError("max_capacity must be at least 1.")
+        self.columns = list(columns)
+        self.column_index = {name: index for index, name in enumerate(self.columns)}
+        self.max_capacity = max_capacity
+        self.allocate(min(max(initial_capacity, 1), max_capacity))
+        self.position = 0
+        self.size = 0
+        # Number of samples appended since the store was created; the newest sample is
+        # sample appended - 1.
+        self.appended = 0
+
+    def __len__(self):
+        return self.size
+
+    def allocate(self, capacity):
+        """
+        Allocates the arrays for capacity samples, keeping the stored samples.
+        """
+        local_times = np.full(2 * capacity, np.nan)
+        real_times = np.full(2 * capacity, np.datetime64('NaT'), dtype='datetime64[s]')
+        values = np.full((len(self.columns), 2 * capacity), np.nan)
+        if getattr(self, "capacity", None):
+            # Copy the samples, oldest first, to the start of both halves of the new arrays.
+            rows = self.rows()
+            for half in (0, capacity):
+                local_times[half:half + self.size] = self.local_times[rows]
+                real_times[half:half + self.size] = self.real_times[rows]
+                values[:, half:half + self.size] = self.values[:, rows]
+            self.position = self.size % capacity
+        self.capacity = capacity
+        self.local_times = local_times
+        self.real_times = real_times
+        self.values = values
+
+    def clear(self):
+        """
+        Discards all samples. The arrays are kept for reuse.
+        """
+        self.position = 0
+        self.size = 0
+
+    def rows(self, count=None):
+        """
+        Returns the slice of the newest count samples (all samples by default) in the arrays.
+        """
+        count = self.size if count is None else min(count, self.size)
+        end = self.position + self.capacity
+        return slice(end - count, end)
+
+    def append(self, local_time, real_time, values):
+        """
+        Stores a sample as the newest one.
+
+        Parameters:
+          local_time: Reception time in seconds since the epoch (time.time()). Times that go
+            back (e.g. after a clock change) are stored as the previous time, so that the
+            times stay sorted for window().
+          real_time: The sample's Real_Time as a datetime.datetime or datetime64.
+          values: The sample's values, one per column, as numbers or numeric strings.
+            Fields that are not numbers (e.g. "N/A") are stored as NaN.
+        """
+        if self.size == self.capacity and self.capacity < self.max_capacity:
+            self.allocate(min(2 * self.capacity, self.max_capacity))
+        slot = self.position
+        mirror = slot + self.capacity
+        if self.size:
+            # mirror - 1 holds the previous sample, also when slot is 0.
+            local_time = max(local_time, self.local_times[mirror - 1])
+        try:
+            # NumPy parses numeric strings on assignment; fall back to per-field parsing
+            # when a field is not a number.
+            self.values[:, slot] = values
+        except ValueError:
+            self.values[:, slot] = [parse_float(value) for value in values]
+        self.values[:, mirror] = self.values[:, slot]
+        self.local_times[slot] = self.local_times[mirror] = local_time
+        self.real_times[slot] = self.real_times[mirror] = real_time
+
+        self.position = (slot + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.appended += 1
+
+    def extend(self, local_times, real_times, values):
+        """
+        Stores several samples as the newest ones at once, e.g. the lines of one serial read.
+        Equivalent to calling append for every sample, without per-field parsing.
+
+        Parameters:
+          local_times: Float array of reception times, as for append.
+          real_times: datetime64 array of the samples' Real_Time.
+          values: Float array of shape (samples, columns).
+        """
+        count = len(local_times)
+        if not count:
+            return
+        while self.size + count > self.capacity and self.capacity < self.max_capacity:
+            self.allocate(min(2 * self.capacity, self.max_capacity))
+        local_times = np.asarray(local_times, dtype=np.float64)
+        if self.size:
+            local_times = np.maximum(local_times, self.local_times[self.position + self.capacity - 1])
+        local_times = np.maximum.accumulate(local_times)
+        self.appended += count
+        if count > self.capacity:
+            # Only the newest capacity samples would survive.
+            self.position = (self.position + count - self.capacity) % self.capacity
+            local_times, real_times, values = local_times[-self.capacity:], real_times[-self.capacity:], values[-self.capacity:]
+            count = self.capacity
+        slots = (self.position + np.arange(count)) % self.capacity
+        for offset in (0, self.capacity):
+            self.values[:, slots + offset] = values.T
+            self.local_times[slots + offset] = local_times
+            self.real_times[slots + offset] = real_times
+
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+
+    def window(self, since):
+        """
+        Returns the samples received at or after the local time since, oldest first.
+
+        Returns:
+          A tuple (real_times, values) of array views into the store, where values has one
+          row per column. The views stay valid until the next append.
+        """
+        rows = self.rows()
+        start = rows.start + int(np.searchsorted(self.local_times[rows], since, side="left"))
+        return self.real_times[start:rows.stop], self.values[:, start:rows.stop]
+
+    def column(self, values, name):
+        """
+        Returns the row of the named column in values returned by window().
+        """
+        return values[self.column_index[name]]
@@ -10,12 +10,12 @@ because the real-time classifier expects identical column names when parsing.
 """
 from __future__ import annotations
 
+import asyncio
 import csv
 import datetime as dt
 import os
-import time
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence
+from typing import Callable, Dict, List, Optional, Sequence
 
 import numpy as np
 import pandas as pd
@@ -25,6 +25,9 @@ from joblib import dump, load
 from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import LabelEncoder
 
+from compiledForest import compile_model
+from deviceIO import BME688Device, DeviceError
+
 BASE_DIR = Path(__file__).resolve().parent
 MODEL_DIR = BASE_DIR / "models"
 MODEL_DIR.mkdir(parents=True, exist_ok=True)
@@ -167,6 +170,9 @@ def run_realtime_classification():
     encoder: LabelEncoder = artifact["label_encoder"]
     feature_columns: Sequence[str] = artifact["feature_columns"]
     source_columns: Sequence[str] = artifact["source_columns"]
+    # Forest classifiers predict through their flattened form, with identical results.
+    compiled = compile_model(model)
+    predict = compiled.predict if compiled is not None else model.predict
 
     ports = _list_serial_ports()
     if ports:
@@ -181,58 +187,55 @@ def run_realtime_classification():
         print("Serial port is required.")
         return
 
-    try:
-        ser = serial.Serial(port_name, SERIAL_BAUD_RATE, timeout=1)
-        time.sleep(2)
-    except serial.SerialException as exc:
-        print(f"Failed to open serial port: {exc}")
-        return
-
     send_start = input("Send 'START' command to device? [y/N]: ").strip().lower() == "y"
-    if send_start:
-        try:
-            ser.write(b"START\n")
-        except serial.SerialException as exc:
-            print(f"Unable to send START command: {exc}")
-
-    print("Streaming data. Press Ctrl+C to stop.")
-    try:
-        while True:
-            try:
-                raw_line = ser.readline().decode(errors="ignore").strip()
-            except serial.SerialException as exc:
-                print(f"Serial read error: {exc}")
-                break
 
-            if not raw_line:
-                continue
+    def classify(raw_line: str) -> None:
+        record = _parse_serial_line(raw_line, source_columns)
+        if not record:
+            return
 
-            record = _parse_serial_line(raw_line, source_columns)
-            if not record:
-                continue
+        feature_vector = _build_feature_row(record, feature_columns)
+        try:
+            pred_value = predict(feature_vector.values)[0]
+        except Exception as exc:
+            print(f"Prediction failed: {exc}")
+            return
+
+        pred_index = int(np.clip(np.rint(pred_value), 0, len(encoder.classes_) - 1))
+        pred_label = encoder.inverse_transform([pred_index])[0]
+        timestamp = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        actual_label = record.get(LABEL_COLUMN)
+        actual_display = f" | Actual: {actual_label}" if actual_label else ""
+        print(f"[{timestamp}] Prediction: {pred_label}{actual_display}")
 
-            feature_vector = _build_feature_row(record, feature_columns)
-            try:
-                pred_value = model.predict(feature_vector.values)[0]
-            except Exception as exc:
-                print(f"Prediction failed: {exc}")
-                continue
-
-            pred_index = int(np.clip(np.rint(pred_value), 0, len(encoder.classes_) - 1))
-            pred_label = encoder.inverse_transform([pred_index])[0]
-            timestamp = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            actual_label = record.get(LABEL_COLUMN)
-            actual_display = f" | Actual: {actual_label}" if actual_label else ""
-            print(f"[{timestamp}] Prediction: {pred_label}{actual_display}")
+    try:
+        asyncio.run(_stream_samples(port_name, send_start, classify))
     except KeyboardInterrupt:
         print("\nStopping real-time classification...")
-    finally:
+    except DeviceError as exc:
+        print(f"Serial error: {exc}")
+
+
+async def _stream_samples(port_name: str, send_start: bool, handle_line: Callable[[str], None]) -> None:
+    """Pass every data line received from the board to handle_line until interrupted."""
+    async with BME688Device(port_name, baudrate=SERIAL_BAUD_RATE) as device:
         if send_start:
             try:
-                ser.write(b"STOP\n")
-            except serial.SerialException:
-                pass
-        ser.close()
+                await device.start()
+            except DeviceError as exc:
+                print(f"Unable to send START command: {exc}")
+                send_start = False
+
+        print("Streaming data. Press Ctrl+C to stop.")
+        try:
+            async for sample in device.samples():
+                handle_line(",".join(sample.fields))
+        finally:
+            if send_start:
+                try:
+                    await device.stop()
+                except DeviceError:
+                    pass
 
 
 # ---------------------------------------------------------------------------
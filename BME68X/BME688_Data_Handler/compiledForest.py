@@ -0,0 +1,272 @@
+# Import necessary libraries for fast inference with trained tree ensembles
+import argparse
+import time
+import numpy as np
+
+# Version of the layout of saved compiled forests.
+COMPILED_FOREST_VERSION = 1
+
+class CompiledForest:
+    """
+    A trained RandomForestClassifier (or ExtraTreesClassifier) flattened into contiguous NumPy
+    arrays, with a vectorized traversal that moves all samples through all trees at once.
+
+    scikit-learn's predict validates its input, checks the DataFrame columns and dispatches
+    the trees through joblib on every call, which costs milliseconds even for a single window.
+    The compiled forest skips all of that. Its outputs are bit-identical to the estimator's,
+    because it repeats the estimator's arithmetic:
+      - inputs are cast to float32 and compared with the float64 thresholds;
+      - missing values (NaN) follow each node's missing_go_to_left;
+      - the trees' class fractions are summed in estimator order and divided by the number of
+        trees (scikit-learn 1.4 and later store fractions in tree_.value);
+      - the class with the highest mean fraction wins, the first one on ties.
+
+    The nodes of all trees are stored back to back. A leaf points to itself and compares
+    against +inf, so every sample can take max_depth steps without checking for leaves.
+    """
+    def __init__(self, feature, threshold, left, right, missing_left, values, roots, classes, max_depth, n_features, feature_names=None):
+        """
+        Parameters:
+          feature, threshold, left, right, missing_left: Per-node arrays of the split feature,
+            the threshold, the global indices of both children and the side taken by NaN.
+          values: Class fractions of every node, shape (nodes, classes).
+          roots: Global index of the root node of every tree.
+          classes: The estimator's classes_.
+          max_depth: Depth of the deepest tree.
+          n_features: Number of features the forest was trained with.
+          feature_names: Optional feature names the forest was trained with, in order.
+        """
+        self.feature = np.ascontiguousarray(feature, dtype=np.intp)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.left = np.ascontiguousarray(left, dtype=np.intp)
+        self.right = np.ascontiguousarray(right, dtype=np.intp)
+        self.missing_left = np.ascontiguousarray(missing_left, dtype=bool)
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        self.roots = np.ascontiguousarray(roots, dtype=np.intp)
+        self.classes_ = np.asarray(classes)
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.feature_names = None if feature_names is None else [str(name) for name in feature_names]
+
+    @classmethod
+    def from_estimator(cls, forest):
+        """
+        Flattens a fitted single-output forest classifier.
+
+        Raises:
+          TypeError: If the model is not a fitted forest of decision tree classifiers.
+        """
+        estimators = getattr(forest, "estimators_", None)
+        if not estimators or getattr(forest, "n_outputs_", None) != 1 or not hasattr(forest, "classes_"):
+            raise TypeError(f"{type(forest).__name__} is not a fitted single-output forest classifier.")
+        if not all(hasattr(estimator, "tree_") and hasattr(estimator, "predict_proba") for estimator in estimators):
+            raise TypeError(f"{type(forest).__name__} does not consist of decision tree classifiers.")
+
+        features, thresholds, lefts, rights, missing, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            leaf = tree.children_left < 0
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(np.where(leaf, np.inf, tree.threshold))
+            lefts.append(np.where(leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(leaf, nodes, tree.children_right) + offset)
+            missing_go_to_left = getattr(tree, "missing_go_to_left", None)
+            if missing_go_to_left is None:
+                missing_go_to_left = np.zeros(tree.node_count, dtype=bool)
+            missing.append(np.asarray(missing_go_to_left, dtype=bool) | leaf)
+            values.append(tree.value[:, 0, :estimator.n_classes_])
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+        return cls(
+            np.concatenate(features), np.concatenate(thresholds), np.concatenate(lefts), np.concatenate(rights),
+            np.concatenate(missing), np.concatenate(values), np.array(roots), forest.classes_, max_depth,
+            forest.n_features_in_, feature_names=getattr(forest, "feature_names_in_", None),
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def check_input(self, X):
+        """
+        Returns X as a float32 array of shape (samples, features), like scikit-learn's input
+        validation but without its checks of column names.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got input of shape {X.shape}.")
+        return X
+
+    def apply(self, X):
+        """
+        Returns the global index of the leaf reached in every tree, shape (samples, trees).
+        """
+        X = self.check_input(X)
+        flat_X = X.ravel()
+        row_offsets = (np.arange(len(X)) * X.shape[1])[:, None]
+        nodes = np.repeat(self.roots[None, :], len(X), axis=0)
+        for _ in range(self.max_depth):
+            x = flat_X.take(row_offsets + self.feature.take(nodes))
+            go_left = x <= self.threshold.take(nodes)
+            missing = np.isnan(x)
+            if missing.any():
+                go_left[missing] = self.missing_left.take(nodes[missing])
+            nodes = np.where(go_left, self.left.take(nodes), self.right.take(nodes))
+        return nodes
+
+    def predict_proba(self, X):
+        """
+        Returns the mean class fractions of the trees, shape (samples, classes).
+        """
+        leaf_values = self.values[self.apply(X)]
+        # Summed tree by tree, in estimator order, as the forest does.
+        proba = np.cumsum(leaf_values, axis=1)[:, -1]
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X):
+        """
+        Returns the predicted classes, as the estimator's predict would.
+        """
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+    def save(self, path):
+        """
+        Saves the node arrays to a NumPy .npz file.
+        """
+        arrays = {
+            "version": np.array(COMPILED_FOREST_VERSION), "feature": self.feature, "threshold": self.threshold,
+            "left": self.left, "right": self.right, "missing_left": self.missing_left, "values": self.values,
+            "roots": self.roots, "classes": self.classes_, "max_depth": np.array(self.max_depth),
+            "n_features": np.array(self.n_features),
+        }
+        if self.feature_names is not None:
+            arrays["feature_names"] = np.array(self.feature_names)
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a compiled forest saved with save().
+
+        Raises:
+          ValueError: If the file was written in another layout version.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != COMPILED_FOREST_VERSION:
+                raise ValueError(f"{path} has compiled forest version {int(data['version'])}, expected {COMPILED_FOREST_VERSION}.")
+            return cls(
+                data["feature"], data["threshold"], data["left"], data["right"], data["missing_left"], data["values"],
+                data["roots"], data["classes"], int(data["max_depth"]), int(data["n_features"]),
+                feature_names=data["feature_names"] if "feature_names" in data else None,
+            )
+
+def compile_model(model, feature_names=None):
+    """
+    Returns the CompiledForest of model, or None if the model cannot be compiled (e.g. a
+    linear model) or was trained on other columns than feature_names, in which case the
+    model's own predict has to be used.
+
+    Parameters:
+      model: A trained estimator.
+      feature_names: Optional feature names, in the order of the arrays passed to predict.
+    """
+    try:
+        compiled = CompiledForest.from_estimator(model)
+    except TypeError:
+        return None
+    if feature_names is not None and compiled.feature_names is not None and list(feature_names) != compiled.feature_names:
+        return None
+    return compiled
+
+def model_from_artifact(artifact):
+    """
+    Returns the estimator of a saved model: the Model Trainer GUI saves (model, label_encoder)
+    and cli_app.py a dict with a "model" entry.
+    """
+    if isinstance(artifact, dict):
+        return artifact["model"]
+    if isinstance(artifact, (tuple, list)):
+        return artifact[0]
+    return artifact
+
+def benchmark(model, compiled, X, repeats=200):
+    """
+    Compares the model's predict with the compiled forest on the rows of X.
+
+    Parameters:
+      model: The trained estimator.
+      compiled: Its CompiledForest.
+      X: DataFrame of feature rows, with the columns the model was trained on.
+      repeats: Number of single-row predictions timed per path.
+
+    Returns:
+      A dict with identical (True if the predicted classes and probabilities of all rows are
+      equal bit for bit) and the mean milliseconds per single-row prediction and per row of
+      a batch prediction, for both paths.
+    """
+    values = X.to_numpy(dtype=np.float64)
+    identical = (
+        np.array_equal(model.predict(X), compiled.predict(values))
+        and np.array_equal(model.predict_proba(X), compiled.predict_proba(values))
+    )
+    rows = [X.iloc[[i % len(X)]] for i in range(repeats)]
+    start = time.perf_counter()
+    for row in rows:
+        model.predict(row)
+    model_single = (time.perf_counter() - start) / repeats
+    start = time.perf_counter()
+    for i in range(repeats):
+        compiled.predict(values[i % len(values)])
+    compiled_single = (time.perf_counter() - start) / repeats
+    start = time.perf_counter()
+    model.predict(X)
+    model_batch = (time.perf_counter() - start) / len(X)
+    start = time.perf_counter()
+    compiled.predict(values)
+    compiled_batch = (time.perf_counter() - start) / len(X)
+    return {
+        "identical": identical,
+        "model_single_ms": model_single * 1000.0,
+        "compiled_single_ms": compiled_single * 1000.0,
+        "model_batch_ms": model_batch * 1000.0,
+        "compiled_batch_ms": compiled_batch * 1000.0,
+    }
+
+def main():
+    # Imported here so that the compiled forest itself only needs NumPy.
+    import pandas as pd
+    from joblib import load
+
+    parser = argparse.ArgumentParser(description="Compile a trained forest to flat arrays and benchmark it.")
+    parser.add_argument("model", help="Model file saved by the Model Trainer GUI or cli_app.py.")
+    parser.add_argument("--output", help="Save the compiled forest to this .npz file.")
+    parser.add_argument("--data", help="Feature file (CSV) to check the predictions and time both paths on.")
+    parser.add_argument("--repeats", type=int, default=200, help="Single-row predictions timed per path.")
+    args = parser.parse_args()
+
+    model = model_from_artifact(load(args.model))
+    compiled = compile_model(model)
+    if compiled is None:
+        parser.error(f"{type(model).__name__} cannot be compiled; only forests of decision tree classifiers can.")
+    print(f"Compiled {compiled.n_trees} trees, {len(compiled.feature)} nodes, depth {compiled.max_depth}, {compiled.n_features} features.")
+    if args.output:
+        compiled.save(args.output)
+        print(f"Saved to {args.output}")
+    if args.data:
+        df = pd.read_csv(args.data)
+        columns = compiled.feature_names or [c for c in df.columns if c not in ("Real_Time", "Label_Tag", "Predicted_Data")]
+        result = benchmark(model, compiled, df[columns], repeats=args.repeats)
+        print(f"Identical predictions and probabilities on {len(df)} rows: {result['identical']}")
+        print(f"Single row: {result['model_single_ms']:.3f} ms with predict, {result['compiled_single_ms']:.3f} ms compiled "
+              f"({result['model_single_ms'] / result['compiled_single_ms']:.0f}x).")
+        print(f"Batch, per row: {result['model_batch_ms']:.4f} ms with predict, {result['compiled_batch_ms']:.4f} ms compiled.")
+
+if __name__ == "__main__":
+    main()
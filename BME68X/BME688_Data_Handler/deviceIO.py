@@ -0,0 +1,582 @@
+# Import necessary libraries for asynchronous communication with BME688 boards
+import asyncio
+import collections
+import datetime
+import math
+import sys
+import time
+import serial
+from serialReader import LineSplitter
+from sampleFrames import FrameDecoder, frame_fields, frames_to_arrays
+
+# Serial settings of the firmware.
+BAUD_RATE = 115200
+
+# Seconds to wait after opening a port: most boards reset when the port is opened and ignore
+# commands until the firmware has started.
+SETTLE_SECONDS = 2.0
+
+# Default time (in seconds) allowed for the firmware to complete a command's response.
+COMMAND_TIMEOUT = 5.0
+
+# Maximum number of samples queued per device for samples(); when it is full, the oldest
+# sample is dropped and counted in BME688Device.dropped_samples.
+SAMPLE_QUEUE_SIZE = 10000
+
+# Number of recent non-sample lines (boot messages, warnings) kept in BME688Device.messages.
+MESSAGE_HISTORY = 200
+
+# Timeout of the blocking reads used on platforms without file-descriptor readiness events
+# (e.g. serial ports on Windows); reads then run in a worker thread.
+THREAD_READ_TIMEOUT = 0.2
+
+# Layout of a data line from the firmware: Timestamp_ms, Label_Tag and HeaterProfile_ID,
+# followed by six fields for each of the eight sensors.
+SAMPLE_METADATA_FIELDS = 3
+SENSOR_FIELDS = ("Temperature_deg_C", "Pressure_Pa", "Humidity_%", "GasResistance_ohm", "Status", "GasIndex")
+SENSOR_COUNT = 8
+SAMPLE_FIELD_COUNT = SAMPLE_METADATA_FIELDS + SENSOR_COUNT * len(SENSOR_FIELDS)
+
+# Columns of the CSV logs written by the Data Logger GUI: the host time of reception followed
+# by the fields of a data line.
+LOG_COLUMNS = ["Real_Time", "Timestamp_ms", "Label_Tag", "HeaterProfile_ID"] + [
+    f"Sensor{sensor_num}_{suffix}" for sensor_num in range(1, SENSOR_COUNT + 1) for suffix in SENSOR_FIELDS
+]
+
+# Format of the Real_Time column.
+REAL_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+class DeviceError(Exception):
+    """
+    Raised when the firmware rejects a command or the connection to a board is lost.
+    """
+
+def to_float(text):
+    """
+    Converts one field to float, returning NaN for fields that are not numbers (e.g. "N/A").
+    """
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
+
+class Sample(collections.namedtuple("Sample", ["device", "received", "monotonic", "fields"])):
+    """
+    One data line received from a board.
+
+    Fields:
+      device: Name of the BME688Device that received it.
+      received: Local datetime of reception.
+      monotonic: time.monotonic() at reception, for ordering samples of several boards.
+      fields: The comma-separated fields of the line, as strings.
+    """
+    __slots__ = ()
+
+    @property
+    def timestamp_ms(self):
+        return to_float(self.fields[0])
+
+    @property
+    def label_tag(self):
+        return self.fields[1]
+
+    @property
+    def heater_profile_id(self):
+        return self.fields[2]
+
+    @property
+    def sensor_values(self):
+        """
+        The sensor fields as floats (NaN where a sensor did not report), in LOG_COLUMNS order.
+        """
+        return [to_float(field) for field in self.fields[SAMPLE_METADATA_FIELDS:SAMPLE_FIELD_COUNT]]
+
+    def log_row(self):
+        """
+        Returns the row written to a CSV log: Real_Time followed by the line's fields.
+        """
+        return [self.received.strftime(REAL_TIME_FORMAT)] + list(self.fields)
+
+class FrameSample(collections.namedtuple("FrameSample", ["device", "received", "monotonic", "frame", "values"])):
+    """
+    One binary frame received from a board (after FORMAT_BINARY), with the same interface as
+    Sample. The readings come straight from the frame; the text fields are only formatted
+    when fields or log_row() are used.
+
+    Fields:
+      device, received, monotonic: As in Sample.
+      frame: The frame, a record of sampleFrames.FRAME_DTYPE.
+      values: The sensor fields as a float array in LOG_COLUMNS order (NaN where a sensor did
+        not report).
+    """
+    __slots__ = ()
+
+    @property
+    def fields(self):
+        return frame_fields(self.frame)
+
+    @property
+    def timestamp_ms(self):
+        return float(self.frame["timestamp_ms"])
+
+    @property
+    def label_tag(self):
+        return str(int(self.frame["label_tag"]))
+
+    @property
+    def heater_profile_id(self):
+        return str(int(self.frame["heater_profile_id"]))
+
+    @property
+    def sensor_values(self):
+        return self.values.tolist()
+
+    def log_row(self):
+        return [self.received.strftime(REAL_TIME_FORMAT)] + self.fields
+
+def parse_sample(line, device=None):
+    """
+    Returns the Sample for a firmware data line, or None if the line is not one (e.g. a
+    command response). Data lines have at least SAMPLE_FIELD_COUNT fields and start with the
+    numeric millisecond timestamp.
+    """
+    fields = line.split(',')
+    if len(fields) < SAMPLE_FIELD_COUNT or not fields[0].strip().isdigit():
+        return None
+    return Sample(device, datetime.datetime.now(), time.monotonic(), fields)
+
+def is_partial_sample(line):
+    """
+    Returns True for a line that starts like a data line (numeric timestamp followed by a
+    comma) but has too few fields to be one.
+    """
+    head, separator, _ = line.partition(',')
+    return bool(separator) and head.strip().isdigit() and line.count(',') < SAMPLE_FIELD_COUNT - 1
+
+class PendingResponse:
+    """
+    Collects the response lines of the command currently in flight. The firmware does not tag
+    its responses, so a device runs one command at a time, and the response is the non-sample
+    lines received until one matches an end or error marker.
+    """
+    def __init__(self, end_markers, error_markers, loop):
+        self.end_markers = tuple(marker.lower() for marker in end_markers)
+        self.error_markers = tuple(marker.lower() for marker in error_markers)
+        self.lines = []
+        self.future = loop.create_future()
+
+    def feed(self, line):
+        """
+        Adds a line to the response and completes it if the line ends it.
+        """
+        if self.future.done():
+            return
+        self.lines.append(line)
+        lowered = line.lower()
+        if any(marker in lowered for marker in self.error_markers):
+            self.future.set_exception(DeviceError(line))
+        elif any(marker in lowered for marker in self.end_markers):
+            self.future.set_result(list(self.lines))
+
+# End and error markers of the firmware's command responses, as written by main.cpp.
+UNKNOWN_COMMAND_MARKERS = ("WARNING: Unknown command",)
+HEATER_PROFILES_END = ("profiles retrieval complete",)
+DUTY_CYCLES_END = ("Duty cycle assignments retrieval complete",)
+STATUS_REPORT_END = ("---- End of Sensor Report ----",)
+INTERVAL_END = ("Data interval set to",)
+INTERVAL_ERRORS = ("ERROR: Invalid data interval",)
+CONFIG_PROMPT = ("Enter JSON config data",)
+CONFIG_UPLOAD_END = ("Config file updated successfully",)
+FORMAT_END = ("Output format set to",)
+CONFIG_UPLOAD_ERRORS = ("No config data received", "SD card not found", "Failed to open config file",
+                        "Error writing complete config data", "Failed to update config file")
+
+class BME688Device:
+    """
+    Asynchronous connection to one BME688 board running the project firmware. The firmware
+    commands are awaitable methods that return the board's response, and samples() is an
+    async iterator over the data lines. All boards are served by the event loop of the
+    calling thread, so one process can drive many boards without a thread per port.
+
+    Reads wait for the port's file descriptor to become readable, where the event loop
+    supports it (POSIX), and otherwise run as blocking reads with a short timeout in a worker
+    thread.
+
+    Usage:
+      async with BME688Device("/dev/ttyUSB0") as device:
+          await device.set_interval(1000)
+          await device.start()
+          async for sample in device.samples():
+              ...
+    """
+    def __init__(self, port, name=None, baudrate=BAUD_RATE, settle_time=SETTLE_SECONDS, command_timeout=COMMAND_TIMEOUT, sample_queue_size=SAMPLE_QUEUE_SIZE, on_message=None):
+        """
+        Parameters:
+          port: Serial port name (e.g. "COM3" or "/dev/ttyUSB0").
+          name: Name of the device in samples and errors; defaults to the port name.
+          baudrate: Baud rate of the port.
+          settle_time: Seconds to wait after opening the port before sending commands.
+          command_timeout: Default time (in seconds) allowed for a command's response.
+          sample_queue_size: Maximum number of queued samples.
+          on_message: Optional callback called with every line that is neither a sample nor
+            part of a command response.
+        """
+        self.port = port
+        self.name = name or port
+        self.baudrate = baudrate
+        self.settle_time = settle_time
+        self.command_timeout = command_timeout
+        self.on_message = on_message
+        self.serial_port = None
+        self.splitter = LineSplitter()
+        self.frame_decoder = FrameDecoder()
+        self.binary_output = False
+        self.sample_queue = None
+        self.sample_queue_size = sample_queue_size
+        self.messages = collections.deque(maxlen=MESSAGE_HISTORY)
+        self.pending = None
+        self.command_lock = None
+        self.read_task = None
+        self.error = None
+        self.received_lines = 0
+        self.received_samples = 0
+        self.dropped_samples = 0
+        self.malformed_lines = 0
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def is_open(self):
+        return self.serial_port is not None and self.serial_port.is_open
+
+    def uses_fd_events(self):
+        """
+        Returns True if reads can wait on the event loop for the port's file descriptor.
+        """
+        return sys.platform != "win32" and hasattr(self.serial_port, "fileno")
+
+    async def open(self):
+        """
+        Opens the port, waits settle_time seconds for the board to start and starts reading.
+
+        Raises:
+          DeviceError: If the port cannot be opened.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            self.serial_port = serial.Serial(self.port, self.baudrate, timeout=0, write_timeout=self.command_timeout)
+        except serial.SerialException as e:
+            raise DeviceError(f"{self.name}: failed to open port: {e}") from e
+        if not self.uses_fd_events():
+            self.serial_port.timeout = THREAD_READ_TIMEOUT
+        self.sample_queue = asyncio.Queue()
+        self.command_lock = asyncio.Lock()
+        self.error = None
+        self.splitter.clear()
+        self.frame_decoder.clear()
+        self.binary_output = False
+        if self.settle_time:
+            await asyncio.sleep(self.settle_time)
+            self.serial_port.reset_input_buffer()
+        self.read_task = loop.create_task(self.read_loop())
+
+    async def close(self):
+        """
+        Stops reading and closes the port. Iterations over samples() end.
+        """
+        if self.read_task is not None:
+            self.read_task.cancel()
+            try:
+                await self.read_task
+            except (asyncio.CancelledError, DeviceError):
+                pass
+            self.read_task = None
+        if self.serial_port is not None:
+            self.serial_port.close()
+        self.fail_pending(DeviceError(f"{self.name}: device closed"))
+        if self.sample_queue is not None:
+            self.sample_queue.put_nowait(None)
+
+    async def read_chunk(self):
+        """
+        Returns the next bytes received from the port, waiting until some arrive.
+        """
+        if not self.uses_fd_events():
+            loop = asyncio.get_running_loop()
+            while True:
+                data = await loop.run_in_executor(None, self.blocking_read)
+                if data:
+                    return data
+        while True:
+            data = self.serial_port.read(max(1, self.serial_port.in_waiting))
+            if data:
+                return data
+            await self.wait_readable()
+
+    def blocking_read(self):
+        """
+        Reads whatever is available, blocking up to the port's timeout; runs in a worker thread.
+        """
+        return self.serial_port.read(max(1, self.serial_port.in_waiting))
+
+    async def wait_readable(self):
+        """
+        Waits until the port's file descriptor is readable.
+        """
+        loop = asyncio.get_running_loop()
+        readable = loop.create_future()
+        fd = self.serial_port.fileno()
+        loop.add_reader(fd, lambda: readable.done() or readable.set_result(None))
+        try:
+            await readable
+        finally:
+            loop.remove_reader(fd)
+
+    async def read_loop(self):
+        """
+        Reads lines and binary frames until the device is closed and dispatches each line to
+        the sample queue, the pending command response, or the messages, and each frame to the
+        sample queue.
+        """
+        try:
+            while True:
+                data = await self.read_chunk()
+                crc_errors = self.frame_decoder.crc_errors
+                frames, text = self.frame_decoder.feed(data)
+                # Frames that failed their CRC were corrupted in transmission, like partial lines.
+                self.malformed_lines += self.frame_decoder.crc_errors - crc_errors
+                for line in self.splitter.feed(text):
+                    self.dispatch_line(line)
+                if len(frames):
+                    self.dispatch_frames(frames)
+        except (serial.SerialException, OSError, TypeError) as e:
+            # pyserial raises OSError or TypeError when the port disappears under a read.
+            self.error = DeviceError(f"{self.name}: connection lost: {e}")
+            self.fail_pending(self.error)
+            self.sample_queue.put_nowait(None)
+            raise self.error from e
+
+    def dispatch_line(self, line):
+        """
+        Routes one received line.
+        """
+        self.received_lines += 1
+        sample = parse_sample(line, self.name)
+        if sample is not None:
+            self.queue_sample(sample)
+        elif is_partial_sample(line):
+            # A data line that lost fields in transmission (e.g. after an input overrun).
+            self.malformed_lines += 1
+        elif self.pending is not None and not self.pending.future.done():
+            self.pending.feed(line)
+        else:
+            self.messages.append(line)
+            if self.on_message is not None:
+                self.on_message(self.name, line)
+
+    def dispatch_frames(self, frames):
+        """
+        Queues the samples of the frames decoded from one read; their readings are converted
+        together.
+        """
+        received = datetime.datetime.now()
+        monotonic = time.monotonic()
+        values = frames_to_arrays(frames).sensor_values
+        for frame, frame_values in zip(frames, values):
+            self.received_lines += 1
+            self.queue_sample(FrameSample(self.name, received, monotonic, frame, frame_values))
+
+    def queue_sample(self, sample):
+        """
+        Adds a sample to the sample queue, dropping the oldest one if the queue is full.
+        """
+        self.received_samples += 1
+        if self.sample_queue.qsize() >= self.sample_queue_size:
+            self.sample_queue.get_nowait()
+            self.dropped_samples += 1
+        self.sample_queue.put_nowait(sample)
+
+    def fail_pending(self, error):
+        if self.pending is not None and not self.pending.future.done():
+            self.pending.future.set_exception(error)
+
+    def check_open(self):
+        if self.error is not None:
+            raise self.error
+        if not self.is_open():
+            raise DeviceError(f"{self.name}: device is not open")
+
+    async def write_line(self, text):
+        """
+        Writes one line to the board.
+        """
+        self.check_open()
+        try:
+            self.serial_port.write(f"{text}\n".encode())
+        except serial.SerialException as e:
+            raise DeviceError(f"{self.name}: failed to send {text!r}: {e}") from e
+
+    async def command(self, text, end_markers=(), error_markers=(), timeout=None):
+        """
+        Sends a command and returns its response. Commands to one device run one at a time.
+
+        Parameters:
+          text: The command line to send.
+          end_markers: Text (case-insensitive) of the line that ends the response; with none,
+            the command completes once it is written.
+          error_markers: Text of lines that indicate failure. Unknown-command warnings always do.
+          timeout: Seconds allowed for the response; defaults to command_timeout.
+
+        Returns:
+          The list of response lines, ending with the line that matched an end marker.
+
+        Raises:
+          DeviceError: If the firmware reports an error or the connection fails.
+          asyncio.TimeoutError: If the response does not end in time.
+        """
+        async with self.command_lock:
+            return await self.exchange([text], end_markers, error_markers, timeout)
+
+    async def exchange(self, lines, end_markers, error_markers, timeout):
+        """
+        Writes lines and waits for the response ending in one of end_markers; the caller must
+        hold command_lock.
+        """
+        self.check_open()
+        if not end_markers:
+            for line in lines:
+                await self.write_line(line)
+            return []
+        self.pending = PendingResponse(end_markers, tuple(error_markers) + UNKNOWN_COMMAND_MARKERS, asyncio.get_running_loop())
+        try:
+            for line in lines:
+                await self.write_line(line)
+            return await asyncio.wait_for(self.pending.future, self.command_timeout if timeout is None else timeout)
+        finally:
+            self.pending = None
+
+    async def start(self):
+        """
+        Starts data collection (START). The firmware does not answer this command.
+        """
+        await self.command("START")
+
+    async def stop(self):
+        """
+        Stops data collection (STOP). The firmware does not answer this command.
+        """
+        await self.command("STOP")
+
+    async def set_interval(self, milliseconds):
+        """
+        Sets the interval between data lines (MS_<n>) and returns the interval confirmed by
+        the firmware, in milliseconds.
+        """
+        milliseconds = int(milliseconds)
+        if milliseconds <= 0:
+            raise ValueError("The data interval must be a positive number of milliseconds.")
+        response = await self.command(f"MS_{milliseconds}", INTERVAL_END, INTERVAL_ERRORS)
+        digits = "".join(ch for ch in response[-1] if ch.isdigit())
+        return int(digits) if digits else milliseconds
+
+    async def set_binary_output(self, enabled):
+        """
+        Switches the board between binary sample frames (FORMAT_BINARY) and CSV data lines
+        (FORMAT_CSV). Samples of both formats are received the same way. Firmware without the
+        frame format answers with an unknown-command warning and keeps sending CSV lines.
+
+        Returns:
+          True if the board now sends the requested format, False if it only supports CSV.
+        """
+        try:
+            await self.command("FORMAT_BINARY" if enabled else "FORMAT_CSV", FORMAT_END)
+        except DeviceError as e:
+            if self.error is not None or not any(marker.lower() in str(e).lower() for marker in UNKNOWN_COMMAND_MARKERS):
+                raise
+            self.binary_output = False
+            return not enabled
+        self.binary_output = enabled
+        return True
+
+    async def get_heater_profiles(self):
+        """
+        Returns the heater and duty cycle profile report of every sensor (GETHEAT) as lines.
+        """
+        return await self.command("GETHEAT", HEATER_PROFILES_END)
+
+    async def get_duty_cycles(self):
+        """
+        Returns the duty cycle assignment of every sensor (GETDUTY) as lines.
+        """
+        return await self.command("GETDUTY", DUTY_CYCLES_END)
+
+    async def status_report(self):
+        """
+        Returns the sensor status report (STATUS_REPORT) as lines.
+        """
+        return await self.command("STATUS_REPORT", STATUS_REPORT_END)
+
+    async def upload_config(self, config_text, timeout=None):
+        """
+        Uploads a JSON configuration to the board's SD card (START_CONFIG_UPLOAD) and returns
+        the firmware's confirmation. The board reloads its configuration afterwards; the lines
+        it prints while doing so go to the messages.
+
+        Raises:
+          DeviceError: If the firmware reports that the upload failed.
+        """
+        lines = [line.strip() for line in config_text.splitlines() if line.strip()]
+        async with self.command_lock:
+            await self.exchange(["START_CONFIG_UPLOAD"], CONFIG_PROMPT, (), timeout)
+            response = await self.exchange(lines + ["END_CONFIG_UPLOAD"], CONFIG_UPLOAD_END, CONFIG_UPLOAD_ERRORS, timeout)
+        return response[-1]
+
+    async def samples(self):
+        """
+        Async iterator over the samples received from the board, in order of arrival. It ends
+        when the device is closed and raises DeviceError if the connection is lost.
+        """
+        while True:
+            sample = await self.sample_queue.get()
+            if sample is None:
+                if self.error is not None:
+                    raise self.error
+                return
+            yield sample
+
+async def print_device_output(port, commands):
+    """
+    Sends the given commands to one board, printing each response, then prints its samples
+    until interrupted.
+    """
+    async with BME688Device(port, on_message=lambda name, line: print(f"[{name}] {line}")) as device:
+        for text in commands:
+            if text.upper().startswith("MS_"):
+                print(f"Interval: {await device.set_interval(text[3:])} ms")
+            elif text.upper() in ("FORMAT_BINARY", "FORMAT_CSV"):
+                binary = text.upper() == "FORMAT_BINARY"
+                if not await device.set_binary_output(binary):
+                    print("The board does not support binary frames; it sends CSV lines.")
+            elif text.upper() in ("START", "STOP"):
+                await device.command(text.upper())
+            else:
+                end_markers = {
+                    "GETHEAT": HEATER_PROFILES_END, "GETDUTY": DUTY_CYCLES_END, "STATUS_REPORT": STATUS_REPORT_END,
+                }.get(text.upper(), ())
+                for line in await device.command(text.upper(), end_markers):
+                    print(line)
+        async for sample in device.samples():
+            print(",".join(sample.log_row()))
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(f"Usage: python {sys.argv[0]} <port> [COMMAND ...]   e.g. MS_1000 START")
+        sys.exit(1)
+    try:
+        asyncio.run(print_device_output(sys.argv[1], sys.argv[2:]))
+    except KeyboardInterrupt:
+        pass
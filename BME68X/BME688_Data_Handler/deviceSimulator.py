@@ -0,0 +1,660 @@
+# Import necessary libraries for simulating a BME688 board on a pseudo-terminal
+import argparse
+import csv
+import json
+import math
+import os
+import queue
+import random
+import re
+import select
+import sys
+import threading
+import time
+from sampleFrames import FRAME_SIZE, frame_from_fields
+
+# Default interval (in milliseconds) between data lines, as in the firmware.
+DEFAULT_INTERVAL_MS = 3000
+
+# Number of sensors on a board.
+SENSOR_COUNT = 8
+
+# Maximum number of heater profile steps and of duty cycle profiles kept by the firmware.
+MAX_HEATER_PROFILE_LENGTH = 10
+DUTY_CYCLE_PROFILE_COUNT = 1
+
+# Path of the configuration file on the board's SD card, as printed by the firmware.
+CONFIG_FILE_NAME = "/config.json"
+
+# Hardcoded heater profiles of the firmware: (id, temperatures in deg C, durations in time base units).
+HARDCODED_HEATER_PROFILES = [
+    ("heater_354", [320, 100, 100, 100, 200, 200, 200, 320, 320, 320], [5, 2, 10, 30, 5, 5, 5, 5, 5, 5]),
+    ("heater_301", [100, 100, 200, 200, 200, 200, 320, 320, 320, 320], [2, 41, 2, 14, 14, 14, 2, 14, 14, 14]),
+    ("heater_411", [100, 320, 170, 320, 240, 240, 240, 320, 320, 320], [43, 2, 43, 2, 2, 20, 21, 2, 20, 21]),
+    ("heater_501", [210, 265, 265, 320, 320, 265, 210, 155, 100, 155], [24, 2, 22, 2, 22, 24, 24, 24, 24, 24]),
+]
+
+# Hardcoded duty cycle profile: (id, scanning cycles, sleeping cycles).
+HARDCODED_DUTY_CYCLE_PROFILE = ("duty_1", 1, 0)
+
+# Heater profile of each sensor when no sensor configuration is loaded.
+HARDCODED_HEATER_MAPPING = [0, 0, 1, 1, 2, 2, 3, 3]
+
+# Heater profile assignments cycled through by pressing both buttons of the board.
+HEATER_PROFILE_ASSIGNMENTS = [
+    [0, 0, 1, 1, 2, 2, 3, 3],
+    [3, 3, 0, 0, 1, 1, 2, 2],
+    [2, 2, 3, 3, 0, 0, 1, 1],
+    [1, 1, 2, 2, 3, 3, 0, 0],
+]
+
+AVAILABLE_COMMANDS = "Available commands: START, STOP, MS_num (e.g., MS_5000), GETHEAT, GETDUTY, START_CONFIG_UPLOAD, STATUS_REPORT, FORMAT_BINARY, FORMAT_CSV"
+
+# Lines that may be sent at once to catch up after a delay; when the simulator falls further
+# behind (the consumer does not read fast enough), the missed lines are skipped and counted.
+MAX_CATCH_UP_LINES = 1000
+
+# Seconds between checks of the stop flag while the simulator waits for input.
+POLL_SECONDS = 0.1
+
+def arduino_to_int(text):
+    """
+    Converts text like Arduino's String.toInt(): the leading (optionally signed) digits, or 0.
+    """
+    match = re.match(r'\s*([-+]?\d+)', text)
+    return int(match.group(1)) if match else 0
+
+class HeaterProfile:
+    def __init__(self, profile_id, temperatures, durations):
+        self.id = profile_id
+        self.temperatures = list(temperatures)
+        self.durations = list(durations)
+
+class DutyCycleProfile:
+    def __init__(self, profile_id, scanning_cycles, sleeping_cycles):
+        self.id = profile_id
+        self.scanning_cycles = scanning_cycles
+        self.sleeping_cycles = sleeping_cycles
+
+class SimulatedSensor:
+    """
+    State of one sensor: its heater profile, the current step of the profile, its duty cycle
+    and the baseline of its synthetic gas resistance.
+    """
+    def __init__(self, index, baseline):
+        self.index = index
+        self.heater_index = None
+        self.step = 0
+        self.duty_profile = None
+        self.scanning = True
+        self.cycles_left = 0
+        self.baseline = baseline
+
+class VirtualBME688:
+    """
+    Stand-in for a BME688 board running the firmware of BME688_CPP_Code/src/main.cpp, served
+    on a pseudo-terminal so that the Data Logger GUI, the Model Trainer GUI, cli_app.py and
+    deviceIO can connect to its port like to a real board (POSIX only).
+
+    It prints the firmware's boot messages and answers START, STOP, MS_<n>, GETHEAT, GETDUTY,
+    STATUS_REPORT, START_CONFIG_UPLOAD, FORMAT_BINARY and FORMAT_CSV with the firmware's
+    texts. Like the firmware, it handles one thing at a time: no data lines are sent while a
+    response or a configuration upload is in progress. Data lines have the firmware layout
+    (Timestamp_ms, Label_Tag, HeaterProfile_ID and six fields per sensor) and carry synthetic
+    readings, whose gas resistance follows each sensor's heater profile and depends on the
+    label. Alternatively, the sensor fields of a recorded raw log are replayed in a loop.
+    After FORMAT_BINARY, the same samples are sent as binary frames (see sampleFrames.py).
+
+    A pseudo-terminal has no baud rate, so lines can be sent far faster than the board's
+    115200 baud. The pace is set by MS_<n> or, for load tests, by a fixed rate in lines per
+    second. A serial line can optionally be emulated with baudrate. When the consumer reads too
+    slowly, writes block as on a full UART buffer, and the lines the simulator then cannot
+    send are counted in skipped_lines.
+    """
+    def __init__(self, interval_ms=DEFAULT_INTERVAL_MS, rate=None, baudrate=None, label=1, trace_file=None, sd_card=True, config_text=None, boot_messages=True, seed=None):
+        """
+        Parameters:
+          interval_ms: Initial data interval in milliseconds; changed by MS_<n>.
+          rate: Optional fixed data rate in lines per second that overrides the data interval.
+          baudrate: Optional baud rate of an emulated serial line (10 bits per byte).
+          label: Initial Label_Tag (set with the board's buttons).
+          trace_file: Optional raw log whose Label_Tag, HeaterProfile_ID and sensor fields are
+            replayed instead of synthetic readings.
+          sd_card: If False, the board behaves as if no SD card were inserted.
+          config_text: Optional JSON configuration stored on the SD card at start.
+          boot_messages: If True, the firmware's setup messages are sent when opened.
+          seed: Optional seed of the synthetic readings.
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be greater than zero.")
+        self.interval_ms = interval_ms
+        self.rate = rate
+        self.baudrate = baudrate
+        self.label = label
+        self.sd_card = sd_card
+        self.config_text = config_text
+        self.boot_messages = boot_messages
+        self.random = random.Random(seed)
+        self.trace = self.load_trace(trace_file) if trace_file else None
+        self.trace_position = 0
+
+        self.heater_profiles = [None] * len(HARDCODED_HEATER_PROFILES)
+        self.duty_profiles = []
+        self.sensor_configs = []
+        self.heater_assignment = 1
+        self.sensors = [SimulatedSensor(i, self.random.uniform(50e3, 200e3)) for i in range(SENSOR_COUNT)]
+
+        self.master_fd = None
+        self.slave_fd = None
+        self.port = None
+        self.commands = queue.Queue()
+        self.stop_event = threading.Event()
+        self.threads = []
+        self.collecting = False
+        self.binary_output = False
+        self.next_due = None
+        self.start_time = None
+        self.wire_free_at = 0.0
+
+        self.lines_sent = 0
+        self.bytes_sent = 0
+        self.skipped_lines = 0
+        self.commands_received = 0
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @staticmethod
+    def load_trace(path):
+        """
+        Reads the Label_Tag, HeaterProfile_ID and sensor fields of every row of a raw log.
+        """
+        with open(path, newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            first = header.index("Label_Tag")
+            rows = [",".join(row[first:]) for row in reader if len(row) == len(header)]
+        if not rows:
+            raise ValueError(f"{path} contains no data rows.")
+        return rows
+
+    def open(self):
+        """
+        Creates the pseudo-terminal, boots the simulated firmware and returns the port name to
+        connect to (e.g. /dev/pts/3).
+        """
+        import pty
+        import tty
+        self.master_fd, self.slave_fd = pty.openpty()
+        tty.setraw(self.slave_fd)
+        self.port = os.ttyname(self.slave_fd)
+        self.stop_event.clear()
+        self.start_time = time.monotonic()
+        self.threads = [
+            threading.Thread(target=self.receive_loop, name="VirtualBME688-rx", daemon=True),
+            threading.Thread(target=self.firmware_loop, name="VirtualBME688", daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+        return self.port
+
+    def close(self):
+        """
+        Stops the simulated firmware and closes the pseudo-terminal.
+        """
+        self.stop_event.set()
+        for fd in (self.master_fd, self.slave_fd):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        for thread in self.threads:
+            thread.join(timeout=2)
+        self.master_fd = self.slave_fd = None
+        self.threads = []
+
+    def millis(self):
+        return int((time.monotonic() - self.start_time) * 1000)
+
+    def period(self):
+        """
+        Returns the time between data lines in seconds.
+        """
+        return 1.0 / self.rate if self.rate else self.interval_ms / 1000.0
+
+    # ---- Board controls ----
+
+    def set_label(self, label):
+        """
+        Sets the Label_Tag of the following data lines, like pressing the board's buttons.
+        """
+        self.label = label
+
+    def cycle_heater_profile(self):
+        """
+        Moves all sensors to the next heater profile assignment, like pressing both buttons.
+        """
+        self.heater_assignment = (self.heater_assignment + 1) % len(HEATER_PROFILE_ASSIGNMENTS)
+        for sensor, profile_index in zip(self.sensors, HEATER_PROFILE_ASSIGNMENTS[self.heater_assignment]):
+            self.set_heater_profile(sensor, profile_index)
+
+    # ---- Serial I/O ----
+
+    def receive_loop(self):
+        """
+        Reads command lines from the pseudo-terminal into the command queue, like the board's
+        serial receive buffer.
+        """
+        buffer = b""
+        while not self.stop_event.is_set():
+            try:
+                readable, _, _ = select.select([self.master_fd], [], [], POLL_SECONDS)
+                if not readable:
+                    continue
+                data = os.read(self.master_fd, 4096)
+            except (OSError, ValueError, TypeError):
+                return
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                self.commands.put(line.decode(errors="ignore").strip())
+
+    def write(self, text):
+        """
+        Sends text (or bytes) to the consumer, blocking while its input buffer is full. With
+        baudrate, also waits as long as the bytes take on the emulated serial line.
+        """
+        data = text.encode() if isinstance(text, str) else text
+        view = memoryview(data)
+        while view:
+            written = os.write(self.master_fd, view)
+            view = view[written:]
+        self.bytes_sent += len(data)
+        if self.baudrate:
+            now = time.monotonic()
+            self.wire_free_at = max(self.wire_free_at, now) + len(data) * 10.0 / self.baudrate
+            if self.wire_free_at > now:
+                time.sleep(self.wire_free_at - now)
+
+    def println(self, text=""):
+        self.write(f"{text}\r\n")
+
+    def next_command(self, timeout):
+        """
+        Returns the next received command line, or None if none arrives within timeout seconds.
+        """
+        try:
+            return self.commands.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    # ---- Firmware ----
+
+    def firmware_loop(self):
+        """
+        Body of the simulated firmware: setup, then commands and data lines in turn.
+        """
+        try:
+            self.setup()
+            while not self.stop_event.is_set():
+                timeout = POLL_SECONDS
+                if self.collecting:
+                    timeout = min(timeout, max(0.0, self.next_due - time.monotonic()))
+                command = self.next_command(timeout)
+                if command is not None:
+                    self.handle_command(command)
+                    continue
+                if self.collecting and time.monotonic() >= self.next_due:
+                    self.send_due_samples()
+        except OSError:
+            # The pseudo-terminal was closed.
+            pass
+
+    def setup(self):
+        """
+        Loads the configuration and assigns the heater profiles, printing the firmware's
+        boot messages.
+        """
+        output = self.println if self.boot_messages else (lambda text="": None)
+        self.load_config(output)
+        if self.heater_profiles[0] is None:
+            for index, (profile_id, temperatures, durations) in enumerate(HARDCODED_HEATER_PROFILES):
+                self.heater_profiles[index] = HeaterProfile(profile_id, temperatures, durations)
+            output("Hardcoded heater configurations initialized.")
+        if not self.duty_profiles:
+            self.duty_profiles = [DutyCycleProfile(*HARDCODED_DUTY_CYCLE_PROFILE)]
+            output("Hardcoded duty cycle profiles initialized.")
+        for sensor in self.sensors:
+            self.set_duty_profile(sensor, self.duty_profiles[0])
+        output("Sensor duty cycles initialized (all use 'duty_1').")
+        for sensor in self.sensors:
+            output(f"Sensor {sensor.index}: BME68X: OK.")
+        if self.sensor_configs:
+            output("Assigning sensor configurations dynamically...")
+            for sensor_index, heater_id, duty_id in self.sensor_configs:
+                sensor = self.sensors[sensor_index] if sensor_index < SENSOR_COUNT else None
+                heater_index = next((i for i, profile in enumerate(self.heater_profiles) if profile and profile.id == heater_id), None)
+                if heater_index is None or sensor is None:
+                    output(f"Dynamic assignment: Heater profile {heater_id} not found for sensor {sensor_index}")
+                else:
+                    self.set_heater_profile(sensor, heater_index)
+                    output(f"Sensor {sensor_index} assigned heater profile {heater_id}")
+                duty = next((profile for profile in self.duty_profiles if profile.id == duty_id), None)
+                if duty is None or sensor is None:
+                    output(f"Dynamic assignment: Duty cycle profile {duty_id} not found for sensor {sensor_index}")
+                else:
+                    self.set_duty_profile(sensor, duty)
+                    output(f"Sensor {sensor_index} assigned duty cycle profile {duty_id}")
+        else:
+            output("Assigning sensor configurations using hardcoded mapping...")
+            for sensor, profile_index in zip(self.sensors, HARDCODED_HEATER_MAPPING):
+                self.set_heater_profile(sensor, profile_index)
+                output(f"Sensor {sensor.index} assigned hardcoded heater profile index {profile_index}")
+                self.set_duty_profile(sensor, self.duty_profiles[0])
+        output("All BME68X sensors initialized")
+
+    def set_heater_profile(self, sensor, profile_index):
+        sensor.heater_index = profile_index
+        sensor.step = 0
+
+    def set_duty_profile(self, sensor, profile):
+        sensor.duty_profile = profile
+        sensor.scanning = True
+        sensor.cycles_left = profile.scanning_cycles
+
+    def load_config(self, output):
+        """
+        Loads the configuration stored on the simulated SD card (loadDynamicConfig).
+        """
+        output("Attempting to load dynamic configuration from SD card...")
+        if not self.sd_card:
+            output("SD card not found. Using hardcoded configuration.")
+            return
+        if self.config_text is None:
+            output(f"Failed to open {CONFIG_FILE_NAME}. Using hardcoded configuration.")
+            return
+        if not self.config_text:
+            output("Config file empty. Using hardcoded configuration.")
+            return
+        try:
+            document = json.loads(self.config_text)
+        except ValueError:
+            output("Failed to parse config file: InvalidInput")
+            return
+        output("---- SD Card Config File Contents ----")
+        output(json.dumps(document, indent=2) + "\n---- End of Config File ----")
+        body = document.get("configBody") if isinstance(document, dict) else None
+        if not isinstance(body, dict):
+            output("configBody not found in JSON. Using hardcoded configuration.")
+            return
+
+        heater_profiles = body.get("heaterProfiles")
+        if isinstance(heater_profiles, list):
+            for index, profile in enumerate(heater_profiles[:len(self.heater_profiles)]):
+                vectors = profile.get("temperatureTimeVectors", [])[:MAX_HEATER_PROFILE_LENGTH]
+                self.heater_profiles[index] = HeaterProfile(
+                    str(profile.get("id")), [int(vector[0]) for vector in vectors], [int(vector[1]) for vector in vectors]
+                )
+                output(f"Loaded heater config: {self.heater_profiles[index].id}")
+        else:
+            output("No heaterProfiles found in config. Using hardcoded heater configuration.")
+
+        duty_profiles = body.get("dutyCycleProfiles")
+        if isinstance(duty_profiles, list):
+            loaded = []
+            for profile in duty_profiles[:DUTY_CYCLE_PROFILE_COUNT]:
+                loaded.append(DutyCycleProfile(
+                    str(profile.get("id")), int(profile.get("numberScanningCycles", 0)), int(profile.get("numberSleepingCycles", 0))
+                ))
+                output(f"Loaded duty cycle profile: {loaded[-1].id}")
+            if self.duty_profiles:
+                # Sensors keep pointing at the same profile slots, as in the firmware.
+                for slot, profile in zip(self.duty_profiles, loaded):
+                    slot.id, slot.scanning_cycles, slot.sleeping_cycles = profile.id, profile.scanning_cycles, profile.sleeping_cycles
+            else:
+                self.duty_profiles = loaded
+        else:
+            output("No dutyCycleProfiles found in config. Using hardcoded profiles.")
+
+        sensor_configs = body.get("sensorConfigurations")
+        if isinstance(sensor_configs, list):
+            self.sensor_configs = []
+            for config in sensor_configs[:SENSOR_COUNT]:
+                entry = (int(config.get("sensorIndex", 0)), str(config.get("heaterProfile")), str(config.get("dutyCycleProfile")))
+                self.sensor_configs.append(entry)
+                output(f"Sensor config loaded: Sensor {entry[0]}, Heater Profile: {entry[1]}, Duty Cycle: {entry[2]}")
+        else:
+            output("No sensorConfigurations found in config. Dynamic assignment not available.")
+        output("Dynamic configuration loaded from SD card.")
+
+    def handle_command(self, command):
+        """
+        Executes one command line (handleSerialCommands).
+        """
+        self.commands_received += 1
+        upper = command.upper()
+        if upper == "START":
+            if not self.collecting:
+                self.collecting = True
+                self.next_due = time.monotonic() + self.period()
+        elif upper == "STOP":
+            self.collecting = False
+        elif command.startswith("MS_") or command.startswith("ms_"):
+            # Like the firmware's unsigned long, negative values wrap around.
+            interval = arduino_to_int(command[3:]) % 2 ** 32
+            if interval > 0:
+                self.interval_ms = interval
+                self.println(f"Data interval set to {interval} ms")
+            else:
+                self.println("ERROR: Invalid data interval received.")
+        elif upper == "GETHEAT":
+            self.send_heater_profiles()
+        elif upper == "GETDUTY":
+            self.send_duty_cycles()
+        elif upper == "START_CONFIG_UPLOAD":
+            self.receive_config()
+        elif upper == "STATUS_REPORT":
+            self.println("---- Sensor Status Report ----")
+            for sensor in self.sensors:
+                self.println(f"Sensor {sensor.index}: OK.")
+            self.println("---- End of Sensor Report ----")
+        elif upper == "FORMAT_BINARY":
+            self.binary_output = True
+            self.println(f"Output format set to binary frames ({FRAME_SIZE} bytes).")
+        elif upper == "FORMAT_CSV":
+            self.binary_output = False
+            self.println("Output format set to CSV.")
+        else:
+            self.println(f"WARNING: Unknown command received - {command}")
+            self.println(AVAILABLE_COMMANDS)
+
+    def duty_cycle_text(self, sensor):
+        profile = sensor.duty_profile
+        if profile is None:
+            return "None assigned."
+        return f"{profile.id} (Scanning: {profile.scanning_cycles}, Sleeping: {profile.sleeping_cycles})"
+
+    def send_heater_profiles(self):
+        lines = ["Retrieving heater and duty cycle profiles for sensors..."]
+        for sensor in self.sensors:
+            profile = self.heater_profiles[sensor.heater_index]
+            lines.append(f"Sensor {sensor.index}: Heater Profile:")
+            for step, (temperature, duration) in enumerate(zip(profile.temperatures, profile.durations), start=1):
+                lines.append(f"  Step {step}: Temp = {temperature}°C, Duration = {duration} ms")
+            lines.append(f"Sensor {sensor.index}: Duty Cycle Profile: {self.duty_cycle_text(sensor)}")
+            lines.append("")
+        lines.append("Heater and duty cycle profiles retrieval complete.")
+        self.write("".join(f"{line}\r\n" for line in lines))
+
+    def send_duty_cycles(self):
+        lines = ["Retrieving duty cycle assignments for sensors..."]
+        lines += [f"Sensor {sensor.index}: Duty Cycle Profile: {self.duty_cycle_text(sensor)}" for sensor in self.sensors]
+        lines.append("Duty cycle assignments retrieval complete.")
+        self.write("".join(f"{line}\r\n" for line in lines))
+
+    def receive_config(self):
+        """
+        Receives a configuration upload (uploadConfigFromSerial); data lines pause meanwhile.
+        """
+        self.println("Enter JSON config data. End with a single line 'END_CONFIG_UPLOAD'.")
+        config = ""
+        while True:
+            line = self.next_command(POLL_SECONDS)
+            if line is None:
+                if self.stop_event.is_set():
+                    return
+                continue
+            if line.upper() == "END_CONFIG_UPLOAD":
+                break
+            config += line
+        if not config:
+            self.println("No config data received.")
+            return
+        if not self.sd_card:
+            self.println("SD card not found.")
+            self.println("Failed to update config file.")
+            return
+        self.config_text = config
+        self.println("Config file updated successfully.")
+        self.load_config(self.println)
+
+    # ---- Data lines ----
+
+    def update_duty_cycles(self):
+        """
+        Advances the scanning/sleeping state of every sensor (updateDutyCycleStates).
+        """
+        for sensor in self.sensors:
+            profile = sensor.duty_profile
+            if profile is None:
+                continue
+            if profile.sleeping_cycles == 0:
+                sensor.scanning = True
+                sensor.cycles_left = profile.scanning_cycles
+                continue
+            if sensor.cycles_left > 0:
+                sensor.cycles_left -= 1
+            if sensor.cycles_left == 0:
+                sensor.scanning = not sensor.scanning
+                sensor.cycles_left = profile.scanning_cycles if sensor.scanning else profile.sleeping_cycles
+
+    def synthetic_fields(self, sensor, seconds):
+        """
+        Returns the six data fields of one scanning sensor: temperature, pressure, humidity and
+        gas resistance drift slowly with noise, and the gas resistance falls with the heater
+        temperature of the current profile step and is scaled per label.
+        """
+        profile = self.heater_profiles[sensor.heater_index]
+        step = sensor.step % max(1, len(profile.temperatures))
+        heater_temperature = profile.temperatures[step] if profile.temperatures else 0
+        sensor.step = step + 1
+        gauss = self.random.gauss
+        temperature = 25.0 + 0.3 * sensor.index + 0.5 * math.sin(seconds / 600.0) + gauss(0, 0.02)
+        pressure = 101200.0 + 30.0 * math.sin(seconds / 3600.0) + gauss(0, 1.0)
+        humidity = 40.0 + 2.0 * math.sin(seconds / 900.0) + gauss(0, 0.1)
+        label_response = 1.0 + 0.5 * math.sin(1.7 * arduino_to_int(str(self.label)) + sensor.index)
+        gas_resistance = sensor.baseline * math.exp(-(heater_temperature - 100) / 150.0) * label_response * (1.0 + gauss(0, 0.01))
+        heater_resistance = int(20 + heater_temperature / 4)
+        # The firmware prints res_heat, a byte, in binary digits.
+        return f"{temperature:.2f},{pressure:.2f},{humidity:.2f},{gas_resistance:.2f},{heater_resistance:b},{step}"
+
+    def sample_line(self, timestamp_ms):
+        """
+        Returns the next data line, or None if every sensor is sleeping (the firmware then
+        sends nothing).
+        """
+        self.update_duty_cycles()
+        if not any(sensor.scanning for sensor in self.sensors):
+            return None
+        if self.trace is not None:
+            row = self.trace[self.trace_position]
+            self.trace_position = (self.trace_position + 1) % len(self.trace)
+            return f"{timestamp_ms},{row}\r\n"
+        seconds = timestamp_ms / 1000.0
+        fields = [
+            self.synthetic_fields(sensor, seconds) if sensor.scanning else "N/A,N/A,N/A,N/A,N/A,N/A"
+            for sensor in self.sensors
+        ]
+        return f"{timestamp_ms},{self.label},{self.heater_assignment}," + ",".join(fields) + "\r\n"
+
+    def send_due_samples(self):
+        """
+        Sends every data line (or frame, after FORMAT_BINARY) that is due, in one write.
+        Lines more than MAX_CATCH_UP_LINES behind schedule are skipped. On an emulated serial
+        line, only one line is sent and all others that are due are skipped, as the firmware
+        does when its output is slower than the data interval.
+        """
+        period = self.period()
+        now = time.monotonic()
+        due = int((now - self.next_due) / period) + 1
+        limit = 1 if self.baudrate else MAX_CATCH_UP_LINES
+        if due > limit:
+            self.skipped_lines += due - limit
+            self.next_due += (due - limit) * period
+            due = limit
+        lines = []
+        for _ in range(due):
+            line = self.sample_line(int((self.next_due - self.start_time) * 1000))
+            if line is not None:
+                lines.append(frame_from_fields(line.rstrip("\r\n").split(",")) if self.binary_output else line)
+            self.next_due += period
+        if lines:
+            self.write(b"".join(lines) if self.binary_output else "".join(lines))
+            self.lines_sent += len(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate BME688 boards on pseudo-terminals.")
+    parser.add_argument("--boards", type=int, default=1, help="Number of simulated boards.")
+    parser.add_argument("--interval", type=int, default=DEFAULT_INTERVAL_MS, help="Initial data interval in ms.")
+    parser.add_argument("--rate", type=float, help="Fixed data rate in lines/s (overrides MS_<n>).")
+    parser.add_argument("--baud", type=int, help="Emulate a serial line of this baud rate.")
+    parser.add_argument("--trace", help="Raw log whose sensor fields are replayed.")
+    parser.add_argument("--label", type=int, default=1, help="Label_Tag of the data lines.")
+    parser.add_argument("--config", help="JSON configuration stored on the simulated SD card.")
+    parser.add_argument("--no-sd", action="store_true", help="Simulate a board without an SD card.")
+    parser.add_argument("--start", action="store_true", help="Start sending data without waiting for START.")
+    args = parser.parse_args()
+    if sys.platform == "win32":
+        parser.error("The simulator needs pseudo-terminals, which are not available on Windows.")
+
+    config_text = None
+    if args.config:
+        with open(args.config) as f:
+            config_text = f.read()
+    boards = [
+        VirtualBME688(
+            interval_ms=args.interval, rate=args.rate, baudrate=args.baud, label=args.label,
+            trace_file=args.trace, sd_card=not args.no_sd, config_text=config_text,
+        )
+        for _ in range(args.boards)
+    ]
+    for board in boards:
+        print(f"Simulated board on {board.open()}")
+        if args.start:
+            board.commands.put("START")
+    try:
+        previous = [(time.monotonic(), 0, 0) for _ in boards]
+        while True:
+            time.sleep(5)
+            for i, board in enumerate(boards):
+                now = time.monotonic()
+                then, lines, sent = previous[i]
+                elapsed = now - then
+                print(
+                    f"{board.port}: {board.lines_sent} lines, {(board.lines_sent - lines) / elapsed:.1f} lines/s, "
+                    f"{(board.bytes_sent - sent) / elapsed / 1024:.1f} KiB/s, {board.skipped_lines} skipped"
+                )
+                previous[i] = (now, board.lines_sent, board.bytes_sent)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for board in boards:
+            board.close()
+
+if __name__ == "__main__":
+    main()
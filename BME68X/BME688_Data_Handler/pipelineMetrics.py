@@ -0,0 +1,188 @@
+# Import necessary libraries for measuring the stages of the real-time prediction path
+import bisect
+import csv
+import datetime
+import json
+import os
+import threading
+import time
+
+# Stages of the real-time path, in the order a sample passes through them:
+#   serial_read: Reading the bytes waiting at the port and splitting them into lines (per read).
+#   line_parse: Splitting a line into fields and checking its layout.
+#   buffer_append: Storing the fields in the sample ring buffer.
+#   feature_extraction: Completing windows and updating the running window statistics.
+#   predict: The classifier's predict call for completed windows.
+#   ui_update: Showing the queued lines, the vote and the countdown on the Tk thread (per drain).
+#   line_total: line_parse to predict for one line (LivePredictor.handle_line).
+PIPELINE_STAGES = ("serial_read", "line_parse", "buffer_append", "feature_extraction", "predict", "ui_update", "line_total")
+
+# Upper bounds (in seconds) of the histogram buckets: ten per decade from 1 us to 100 s. A
+# last bucket collects longer durations.
+HISTOGRAM_BOUNDS = [10 ** (exponent / 10.0) for exponent in range(-60, 21)]
+
+# Percentiles reported for every stage.
+REPORTED_PERCENTILES = (50, 90, 99)
+
+# Columns of the CSV metrics files, one row per stage and snapshot.
+METRICS_CSV_COLUMNS = ["Time", "Uptime_s", "Stage", "Count", "Per_Second", "Mean_ms", "P50_ms", "P90_ms", "P99_ms", "Max_ms", "Total_s", "Share"]
+
+class StageHistogram:
+    """
+    Count, total, maximum and log-spaced histogram of the durations of one stage. Percentiles
+    are interpolated within the histogram buckets, so they are accurate to the bucket width
+    (about 26%).
+    """
+    def __init__(self):
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, seconds):
+        self.buckets[bisect.bisect_left(HISTOGRAM_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def percentile(self, percent):
+        """
+        Returns the given percentile of the durations in seconds, interpolated within its
+        bucket and capped at the largest duration, or None without any durations.
+        """
+        if not self.count:
+            return None
+        rank = percent / 100.0 * self.count
+        cumulative = 0
+        for index, bucket in enumerate(self.buckets):
+            if bucket and cumulative + bucket >= rank:
+                lower = HISTOGRAM_BOUNDS[index - 1] if index > 0 else 0.0
+                upper = HISTOGRAM_BOUNDS[index] if index < len(HISTOGRAM_BOUNDS) else self.maximum
+                return min(lower + (upper - lower) * (rank - cumulative) / bucket, self.maximum)
+            cumulative += bucket
+        return self.maximum
+
+class PipelineMetrics:
+    """
+    Hot-path instrumentation of the real-time prediction path: a StageHistogram per stage
+    (see PIPELINE_STAGES) and event counters (e.g. lines, windows, predictions). Stages and
+    counters are recorded from the serial reader thread and read from the GUI thread, so
+    both go through a lock; recording costs about a microsecond.
+
+    Usage:
+      start = time.perf_counter()
+      ...
+      metrics.record("predict", time.perf_counter() - start)
+    """
+    def __init__(self, stages=PIPELINE_STAGES):
+        self.stages = tuple(stages)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Clears all durations and counters and restarts the uptime.
+        """
+        with self.lock:
+            self.histograms = {stage: StageHistogram() for stage in self.stages}
+            self.counters = {}
+            self.started = time.monotonic()
+
+    def record(self, stage, seconds):
+        """
+        Adds the duration (in seconds) of one pass through a stage.
+        """
+        with self.lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = StageHistogram()
+            histogram.add(seconds)
+
+    def count(self, counter, amount=1):
+        """
+        Increments an event counter.
+        """
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def snapshot(self):
+        """
+        Returns the current measurements as a JSON-serializable dict with the keys time,
+        uptime_s, counters, and stages. Each stage has count, per_second, mean_ms, p50_ms,
+        p90_ms, p99_ms, max_ms, total_s and share, its fraction of the time measured in all
+        stages except line_total.
+        """
+        with self.lock:
+            uptime = time.monotonic() - self.started
+            counters = dict(self.counters)
+            busy = sum(histogram.total for stage, histogram in self.histograms.items() if stage != "line_total")
+            stages = {}
+            for stage, histogram in self.histograms.items():
+                stats = {
+                    "count": histogram.count,
+                    "per_second": histogram.count / uptime if uptime > 0 else 0.0,
+                    "mean_ms": histogram.total / histogram.count * 1000.0 if histogram.count else None,
+                }
+                for percent in REPORTED_PERCENTILES:
+                    value = histogram.percentile(percent)
+                    stats[f"p{percent}_ms"] = value * 1000.0 if value is not None else None
+                stats["max_ms"] = histogram.maximum * 1000.0 if histogram.count else None
+                stats["total_s"] = histogram.total
+                stats["share"] = histogram.total / busy if busy > 0 and stage != "line_total" else None
+                stages[stage] = stats
+        return {
+            "time": datetime.datetime.now().isoformat(timespec="seconds"),
+            "uptime_s": uptime,
+            "counters": counters,
+            "stages": stages,
+        }
+
+def format_snapshot(snapshot):
+    """
+    Returns a snapshot as a fixed-width text table, one line per stage that has been measured,
+    followed by the counters.
+    """
+    lines = [f"{'Stage':<19}{'Count':>8}{'Mean ms':>10}{'p50':>9}{'p99':>9}{'Max':>9}{'Share':>7}"]
+    for stage, stats in snapshot["stages"].items():
+        if not stats["count"]:
+            continue
+        share = f"{stats['share'] * 100:.0f}%" if stats["share"] is not None else ""
+        lines.append(
+            f"{stage:<19}{stats['count']:>8}{stats['mean_ms']:>10.3f}{stats['p50_ms']:>9.3f}"
+            f"{stats['p99_ms']:>9.3f}{stats['max_ms']:>9.3f}{share:>7}"
+        )
+    uptime = snapshot["uptime_s"]
+    counters = ", ".join(
+        f"{name} {value} ({value / uptime:.1f}/s)" if uptime > 0 else f"{name} {value}"
+        for name, value in sorted(snapshot["counters"].items())
+    )
+    if counters:
+        lines.append(counters)
+    return "\n".join(lines)
+
+def write_metrics(path, snapshot):
+    """
+    Appends a snapshot to a metrics file: one row per measured stage to a CSV file (.csv), or
+    one JSON object per line (JSON Lines) to any other file. The CSV header is written when
+    the file is created.
+    """
+    if path.lower().endswith(".csv"):
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, "a", newline="") as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(METRICS_CSV_COLUMNS)
+            for stage, stats in snapshot["stages"].items():
+                if not stats["count"]:
+                    continue
+                writer.writerow([
+                    snapshot["time"], f"{snapshot['uptime_s']:.1f}", stage, stats["count"], f"{stats['per_second']:.3f}",
+                ] + [
+                    f"{stats[key]:.4f}" for key in ("mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms")
+                ] + [
+                    f"{stats['total_s']:.4f}", f"{stats['share']:.4f}" if stats["share"] is not None else "",
+                ])
+    else:
+        with open(path, "a") as f:
+            f.write(json.dumps(snapshot) + "\n")
@@ -0,0 +1,266 @@
+# Import necessary libraries for encoding and decoding binary sample frames
+import binascii
+import collections
+import numpy as np
+
+# Binary sample frames, sent by the firmware instead of CSV data lines after FORMAT_BINARY
+# (see SampleFrame in BME688_CPP_Code/include/main.h). A frame is FRAME_SIZE bytes, packed
+# little-endian, and starts with the sync word, the frame size and the format version. It ends
+# with the CRC-16/CCITT-FALSE of the bytes between the sync word and the CRC.
+FRAME_SYNC = b"\xA5\x5A"
+FRAME_VERSION = 1
+FRAME_SIZE = 126
+
+# Number of sensors in a frame.
+SENSOR_COUNT = 8
+
+# Readings of one sensor. Temperature, humidity and pressure are in hundredths of deg C, % and
+# Pa, like the two decimals of the CSV lines; res_heat is the CSV "Status" field.
+SENSOR_FRAME_DTYPE = np.dtype([
+    ("temperature", "<i2"),
+    ("humidity", "<u2"),
+    ("pressure", "<u4"),
+    ("gas_resistance", "<f4"),
+    ("res_heat", "u1"),
+    ("gas_index", "u1"),
+])
+
+# One frame. Bit i of valid_mask is set if sensor i reported data ("N/A" in a CSV line otherwise).
+FRAME_DTYPE = np.dtype([
+    ("sync", "u1", (2,)),
+    ("length", "u1"),
+    ("version", "u1"),
+    ("valid_mask", "u1"),
+    ("heater_profile_id", "u1"),
+    ("label_tag", "<i2"),
+    ("timestamp_ms", "<u4"),
+    ("sensors", SENSOR_FRAME_DTYPE, (SENSOR_COUNT,)),
+    ("crc", "<u2"),
+])
+assert FRAME_DTYPE.itemsize == FRAME_SIZE
+
+# Byte range of a frame covered by its CRC.
+CRC_START = len(FRAME_SYNC)
+CRC_END = FRAME_SIZE - 2
+
+def build_crc_table():
+    """
+    Returns the lookup table of CRC-16/CCITT-FALSE (polynomial 0x1021) for one byte.
+    """
+    table = np.zeros(256, dtype=np.uint16)
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else crc << 1
+        table[byte] = crc & 0xFFFF
+    return table
+
+CRC_TABLE = build_crc_table()
+
+def crc16_rows(rows):
+    """
+    Returns the CRC-16/CCITT-FALSE of every row of a 2D uint8 array. The rows are processed
+    together, one byte column at a time.
+    """
+    crc = np.full(len(rows), 0xFFFF, dtype=np.uint16)
+    for column in rows.T:
+        crc = (crc << 8) ^ CRC_TABLE[(crc >> 8) ^ column]
+    return crc
+
+# Result of decode_frames.
+#   frames: Structured array (FRAME_DTYPE) of the valid frames, in order.
+#   text: The bytes outside the frames (command responses and other text), in order.
+#   consumed: Number of bytes of the buffer that were decoded; the rest may be the start of a
+#     frame and must be decoded again once more bytes have arrived.
+#   crc_errors: Number of complete frames that were dropped because their CRC did not match.
+DecodedFrames = collections.namedtuple("DecodedFrames", ["frames", "text", "consumed", "crc_errors"])
+
+def decode_frames(buffer):
+    """
+    Decodes all frames in a byte buffer in one pass: sync words are located with numpy, the
+    candidate frames are gathered into one array, their CRCs are checked together and the
+    valid ones are returned as a structured array. Bytes outside the frames are returned as
+    text, so that command responses received between frames are not lost.
+
+    Parameters:
+      buffer: bytes, bytearray or memoryview received from the board.
+
+    Returns:
+      A DecodedFrames tuple.
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    size = len(data)
+    if size < 2:
+        starts = np.empty(0, dtype=np.intp)
+    else:
+        starts = np.flatnonzero((data[:-1] == FRAME_SYNC[0]) & (data[1:] == FRAME_SYNC[1]))
+    if size and data[-1] == FRAME_SYNC[0]:
+        # A sync word whose second byte has not arrived yet.
+        starts = np.append(starts, size - 1)
+
+    complete = starts[starts + FRAME_SIZE <= size]
+    complete = complete[(data[complete + 2] == FRAME_SIZE) & (data[complete + 3] == FRAME_VERSION)]
+    rows = data[complete[:, None] + np.arange(FRAME_SIZE)]
+    received_crc = rows[:, CRC_END].astype(np.uint16) | (rows[:, CRC_END + 1].astype(np.uint16) << 8)
+    valid = crc16_rows(rows[:, CRC_START:CRC_END]) == received_crc
+
+    good = complete[valid]
+    if len(good) > 1 and np.any(np.diff(good) < FRAME_SIZE):
+        # A sync word inside a frame's payload happened to pass the checks; keep the frames
+        # that do not overlap an earlier one.
+        keep = []
+        end = 0
+        for start in good:
+            if start >= end:
+                keep.append(start)
+                end = start + FRAME_SIZE
+        keep = np.array(keep, dtype=np.intp)
+        valid[valid] = np.isin(good, keep)
+        good = keep
+
+    boundaries = np.zeros(size + 1, dtype=np.int32)
+    np.add.at(boundaries, good, 1)
+    np.add.at(boundaries, good + FRAME_SIZE, -1)
+    covered = np.cumsum(boundaries[:size]) > 0
+
+    # A frame that may still be arriving starts at the first uncovered sync word too close to
+    # the end of the buffer, provided the header bytes received so far match.
+    consumed = size
+    for start in starts[starts + FRAME_SIZE > size]:
+        if covered[start]:
+            continue
+        if start + 2 < size and data[start + 2] != FRAME_SIZE:
+            continue
+        if start + 3 < size and data[start + 3] != FRAME_VERSION:
+            continue
+        consumed = int(start)
+        break
+
+    crc_errors = int(np.count_nonzero(~valid & ~covered[complete])) if len(complete) else 0
+    frames = np.ascontiguousarray(data[good[:, None] + np.arange(FRAME_SIZE)]).view(FRAME_DTYPE).reshape(-1)
+    text = data[:consumed][~covered[:consumed]].tobytes() if len(good) else bytes(data[:consumed])
+    return DecodedFrames(frames, text, consumed, crc_errors)
+
+class FrameDecoder:
+    """
+    Splits a byte stream from a board into binary frames and text. Bytes that may be the
+    start of a frame are kept until the rest arrives. Text passes through unchanged, so a
+    decoder can be used whether the board sends frames or CSV lines.
+    """
+    def __init__(self):
+        self.buffer = bytearray()
+        self.frames_decoded = 0
+        self.crc_errors = 0
+
+    def feed(self, data):
+        """
+        Adds received bytes and returns (frames, text): the structured array of the complete
+        frames and the bytes outside them.
+        """
+        if not self.buffer and FRAME_SYNC[:1] not in data:
+            # Only text (e.g. CSV lines): no frame can start in these bytes.
+            return np.empty(0, dtype=FRAME_DTYPE), bytes(data)
+        self.buffer += data
+        decoded = decode_frames(self.buffer)
+        del self.buffer[:decoded.consumed]
+        self.frames_decoded += len(decoded.frames)
+        self.crc_errors += decoded.crc_errors
+        return decoded.frames, decoded.text
+
+    def clear(self):
+        self.buffer.clear()
+
+# Sample arrays of decoded frames, as returned by frames_to_arrays.
+#   timestamp_ms, label_tag, heater_profile_id: One value per frame.
+#   sensor_values: Float array of shape (frames, SENSOR_COUNT * 6) with the sensor fields in
+#     the column order of the CSV logs (temperature, pressure, humidity, gas resistance,
+#     status, gas index per sensor), NaN where a sensor did not report.
+FrameSamples = collections.namedtuple("FrameSamples", ["timestamp_ms", "label_tag", "heater_profile_id", "sensor_values"])
+
+def frames_to_arrays(frames):
+    """
+    Converts a structured array of frames into a FrameSamples tuple of numeric arrays.
+    """
+    sensors = frames["sensors"]
+    values = np.stack([
+        sensors["temperature"] / 100.0,
+        sensors["pressure"] / 100.0,
+        sensors["humidity"] / 100.0,
+        sensors["gas_resistance"].astype(np.float64),
+        sensors["res_heat"].astype(np.float64),
+        sensors["gas_index"].astype(np.float64),
+    ], axis=-1)
+    valid = (frames["valid_mask"][:, None] >> np.arange(SENSOR_COUNT, dtype=np.uint8)) & 1
+    values[valid == 0] = np.nan
+    return FrameSamples(
+        frames["timestamp_ms"].astype(np.int64),
+        frames["label_tag"].astype(np.int64),
+        frames["heater_profile_id"].astype(np.int64),
+        values.reshape(len(frames), -1),
+    )
+
+def decode_samples(buffer):
+    """
+    Decodes a buffer of frames (e.g. a binary capture) straight into a FrameSamples tuple.
+    """
+    return frames_to_arrays(decode_frames(buffer).frames)
+
+def frame_fields(frame):
+    """
+    Returns the fields of the CSV data line the firmware would have sent instead of a frame,
+    as strings, e.g. for CSV logs.
+    """
+    fields = [str(int(frame["timestamp_ms"])), str(int(frame["label_tag"])), str(int(frame["heater_profile_id"]))]
+    mask = int(frame["valid_mask"])
+    for i, sensor in enumerate(frame["sensors"]):
+        if mask >> i & 1:
+            fields += [
+                f"{sensor['temperature'] / 100:.2f}",
+                f"{sensor['pressure'] / 100:.2f}",
+                f"{sensor['humidity'] / 100:.2f}",
+                f"{float(sensor['gas_resistance']):.2f}",
+                # The firmware prints res_heat (a byte) in binary digits.
+                f"{int(sensor['res_heat']):b}",
+                str(int(sensor["gas_index"])),
+            ]
+        else:
+            fields += ["N/A"] * 6
+    return fields
+
+def parse_status(text):
+    """
+    Converts the CSV "Status" field (res_heat in binary digits) back to its byte value.
+    """
+    if text and set(text) <= {"0", "1"}:
+        return int(text, 2)
+    return int(round(float(text)))
+
+def frame_from_fields(fields):
+    """
+    Encodes the fields of a CSV data line as a frame (bytes); the inverse of frame_fields.
+    Sensors with "N/A" fields are marked as not reporting.
+    """
+    frame = np.zeros(1, dtype=FRAME_DTYPE)[0]
+    frame["sync"] = np.frombuffer(FRAME_SYNC, dtype=np.uint8)
+    frame["length"] = FRAME_SIZE
+    frame["version"] = FRAME_VERSION
+    frame["timestamp_ms"] = int(fields[0]) % 2 ** 32
+    frame["label_tag"] = int(fields[1])
+    frame["heater_profile_id"] = int(fields[2])
+    mask = 0
+    for i in range(SENSOR_COUNT):
+        values = fields[3 + 6 * i:9 + 6 * i]
+        if len(values) < 6 or "N/A" in values:
+            continue
+        sensor = frame["sensors"][i]
+        sensor["temperature"] = round(float(values[0]) * 100)
+        sensor["pressure"] = round(float(values[1]) * 100)
+        sensor["humidity"] = round(float(values[2]) * 100)
+        sensor["gas_resistance"] = float(values[3])
+        sensor["res_heat"] = parse_status(values[4]) & 0xFF
+        sensor["gas_index"] = int(values[5]) & 0xFF
+        mask |= 1 << i
+    frame["valid_mask"] = mask
+    data = bytearray(frame.tobytes())
+    data[CRC_END:] = binascii.crc_hqx(bytes(data[CRC_START:CRC_END]), 0xFFFF).to_bytes(2, "little")
+    return bytes(data)
@@ -0,0 +1,167 @@
+# Import necessary libraries for reading lines from a serial device
+import threading
+import time
+import traceback
+import serial
+
+# Number of bytes requested per read when no more data is waiting; the read blocks until at
+# least one byte arrives or the port's timeout expires.
+READ_CHUNK_BYTES = 1
+
+# Upper bound on a partial line kept while waiting for its newline. Longer runs of data
+# without a newline (e.g. noise at the wrong baud rate) are discarded.
+MAX_LINE_BYTES = 65536
+
+class LineSplitter:
+    """
+    Splits a byte stream into stripped text lines. Received bytes are appended to a bytearray
+    and all complete lines are split off at once, so a partial line is never copied more than
+    once per read, unlike repeated `buffer.split('\\n', 1)` on a string.
+    """
+    def __init__(self, max_line_bytes=MAX_LINE_BYTES):
+        self.buffer = bytearray()
+        self.max_line_bytes = max_line_bytes
+
+    def feed(self, data):
+        """
+        Adds received bytes and returns the complete, non-empty lines they finish, decoded
+        with undecodable bytes ignored.
+        """
+        self.buffer += data
+        end = self.buffer.rfind(b'\n')
+        if end < 0:
+            if len(self.buffer) > self.max_line_bytes:
+                self.buffer.clear()
+            return []
+        complete = bytes(self.buffer[:end])
+        del self.buffer[:end + 1]
+        lines = []
+        for raw_line in complete.split(b'\n'):
+            line = raw_line.decode(errors='ignore').strip()
+            if line:
+                lines.append(line)
+        return lines
+
+    def clear(self):
+        """
+        Discards any partial line.
+        """
+        self.buffer.clear()
+
+class SerialLineReader:
+    """
+    Reads an open serial port in a background thread and publishes every complete line to
+    the subscribed callbacks. Reads block until data arrives or the port's timeout expires,
+    so an idle port uses next to no CPU, unlike polling `in_waiting` in a loop.
+
+    Subscribers are called on the reader thread, in the order they subscribed, with the line
+    as a string, or with the list of lines completed by one read if they subscribed with
+    batch=True; GUI code has to hand the lines over to the Tk thread itself (e.g. via a queue
+    or `after`). An exception raised by a subscriber is printed and does not stop the reader.
+    """
+    def __init__(self, serial_port, on_error=None, name="SerialLineReader", metrics=None):
+        """
+        Parameters:
+          serial_port: An open serial.Serial (or compatible) object. Its timeout bounds how
+            long stop() may take to be noticed when the port cannot cancel a pending read.
+          on_error: Optional callback called with the serial.SerialException when the
+            connection is lost, after which the reader stops.
+          name: Name of the reader thread.
+          metrics: Optional pipelineMetrics.PipelineMetrics that receives the duration of
+            every read of waiting bytes (stage serial_read) and the bytes_read counter.
+        """
+        self.serial_port = serial_port
+        self.on_error = on_error
+        self.name = name
+        self.metrics = metrics
+        self.splitter = LineSplitter()
+        self.subscribers = []
+        self.subscribers_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def subscribe(self, callback, batch=False):
+        """
+        Registers callback(line) to receive every complete line, or with batch=True,
+        callback(lines) to receive the non-empty list of lines completed by each read.
+        """
+        with self.subscribers_lock:
+            self.subscribers = self.subscribers + [(callback, batch)]
+
+    def unsubscribe(self, callback):
+        """
+        Removes a callback registered with subscribe.
+        """
+        with self.subscribers_lock:
+            self.subscribers = [subscriber for subscriber in self.subscribers if subscriber[0] != callback]
+
+    def is_running(self):
+        """
+        Returns True while the reader thread is alive.
+        """
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        """
+        Starts the reader thread. Data received before start is read by it as well.
+        """
+        if self.is_running():
+            return
+        self.stop_event.clear()
+        self.splitter.clear()
+        self.thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=2):
+        """
+        Stops the reader thread, interrupting a blocked read where the port supports it, and
+        waits up to timeout seconds for it to finish. Safe to call from a subscriber.
+        """
+        self.stop_event.set()
+        cancel_read = getattr(self.serial_port, 'cancel_read', None)
+        if cancel_read is not None:
+            try:
+                cancel_read()
+            except (serial.SerialException, OSError):
+                pass
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=timeout)
+
+    def publish(self, lines):
+        """
+        Passes the lines completed by one read to every subscriber: the whole list to batch
+        subscribers, one line at a time to the others.
+        """
+        for callback, batch in self.subscribers:
+            for item in ([lines] if batch else lines):
+                if self.stop_event.is_set():
+                    return
+                try:
+                    callback(item)
+                except Exception:
+                    traceback.print_exc()
+
+    def run(self):
+        """
+        Body of the reader thread: blocking reads of whatever is available, split into lines.
+        """
+        while not self.stop_event.is_set():
+            try:
+                waiting = self.serial_port.in_waiting
+                start = time.perf_counter()
+                data = self.serial_port.read(max(READ_CHUNK_BYTES, waiting))
+            except (serial.SerialException, OSError, TypeError) as e:
+                # pyserial raises TypeError or OSError when the port is closed under a read.
+                if not self.stop_event.is_set() and self.on_error is not None:
+                    self.on_error(e if isinstance(e, serial.SerialException) else serial.SerialException(str(e)))
+                break
+            if not data:
+                continue
+            lines = self.splitter.feed(data)
+            if self.metrics is not None:
+                # Reads that waited for data would measure idle time rather than work.
+                if waiting:
+                    self.metrics.record("serial_read", time.perf_counter() - start)
+                self.metrics.count("bytes_read", len(data))
+            if lines:
+                self.publish(lines)